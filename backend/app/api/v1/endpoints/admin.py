@@ -0,0 +1,40 @@
+# app/api/v1/endpoints/admin.py
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+
+from app.core import config, profiling
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    # 🔐 No token configured: the admin API doesn't exist
+    if not config.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not profiling.admin_token_ok(x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+
+@router.get("/profiles")
+def list_profiles():
+    """Stored request profiles, newest first."""
+    return {"profiles": profiling.list_profiles()}
+
+@router.get("/profiles/{profile_id}.pstats")
+def profile_pstats(profile_id: str):
+    """cProfile dump; load with pstats.Stats(path) or snakeviz."""
+    path = profiling.profile_path(profile_id, "pstats")
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found (sampled profiles have no pstats)")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"profile_{profile_id}.pstats")
+
+@router.get("/profiles/{profile_id}.collapsed")
+def profile_collapsed(profile_id: str):
+    """Sampled stacks in collapsed format, for flamegraph.pl / speedscope."""
+    path = profiling.profile_path(profile_id, "collapsed")
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain; charset=utf-8", filename=f"profile_{profile_id}.collapsed")
@@ -1,8 +1,7 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List
-from app.utils.bug_detector import detect_bugs
-from app.core.review_engine import analyze_python_code
+from app.core.findings import Finding, aggregate, render_all
 
 router = APIRouter()
 
@@ -12,10 +11,40 @@ class CodeInput(BaseModel):
 
 @router.post("/analyze/bugs")
 def analyze_bugs(input: CodeInput):
+    from app.utils.bug_detector import detect_bugs  # analyzers load on first use
     bugs = detect_bugs(input.code)
     return {"bugs": bugs}
 
 @router.post("/analyze/optimize")
 def analyze_optimizations(input: CodeInput):
+    from app.core.review_engine import analyze_python_code
     suggestions, warnings, optimizations = analyze_python_code(input.code)
-    return {"optimizations": optimizations}
+    return {"optimizations": render_all(aggregate(optimizations))}
+
+@router.post("/analyze/performance")
+def analyze_performance(input: CodeInput):
+    """Estimated complexity per function plus loop hot spots (sorting, list lookups, string building), with lines."""
+    if input.language.lower() != "python":
+        raise HTTPException(status_code=400, detail=f"Performance analysis for {input.language} not supported yet.")
+    from app.core.analysis_context import AnalysisContext
+    from app.core.incremental import performance_profile
+
+    # ♻️ Through the region cache: re-checking an edited file only re-walks what changed
+    report = performance_profile(AnalysisContext(input.code))
+    if report is None:
+        return {"complexity": None, "functions": [], "issues": [],
+                "optimizations": render_all([Finding("perf.syntax-error")])}
+
+    return {
+        "complexity": report["complexity"],
+        "functions": [
+            {"name": f.args["name"], "line": f.line, "end_line": f.end_line,
+             "complexity": f.args["complexity"], "severity": f.severity}
+            for f in report["functions"]
+        ],
+        "issues": [
+            {"rule": f.rule, "line": f.line, "end_line": f.end_line, "severity": f.severity, "message": f.render()}
+            for f in report["findings"]
+        ],
+        "optimizations": render_all(aggregate(report["findings"])),
+    }
@@ -0,0 +1,36 @@
+# app/api/v1/endpoints/live_review.py
+
+import json
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+router = APIRouter()
+
+@router.websocket("/review/live")
+async def live_review(websocket: WebSocket):
+    """
+    As-you-type reviews. The client sends edit messages:
+      {"version": 7, "language": "python", "code": "..."}        (whole document)
+      {"version": 8, "changes": [{"offset": 12, "length": 0, "text": "x"}]}
+    and gets {"type": "quick"} (style + syntax) shortly after typing stops,
+    then {"type": "review"} (the full /review result) once the user pauses.
+    Every result carries the version it was computed for; results for
+    superseded versions are never sent.
+    """
+    from app.core.live_review import LiveSession  # pulls in the whole pipeline
+
+    await websocket.accept()
+    session = LiveSession(websocket.send_json)
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+                if not isinstance(message, dict):
+                    raise ValueError("expected a JSON object")
+                session.update(message)
+            except ValueError as exc:  # includes bad JSON
+                await websocket.send_json({"type": "error", "version": session.version, "detail": str(exc)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        session.close()
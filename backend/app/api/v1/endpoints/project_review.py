@@ -0,0 +1,87 @@
+# app/api/v1/endpoints/project_review.py
+
+import json
+import os
+import re
+import secrets
+import tempfile
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.core import config
+
+# app.core.project_review (the whole review pipeline) is imported on first use
+
+router = APIRouter()
+
+# Archive projects are named by the server (?project=new): the id is the
+# only way to reach a stored symbol index, so nobody can pick another
+# caller's name and overwrite it
+_PROJECT_ID = re.compile(r"^[0-9a-f]{32}$")
+
+class DirectoryReviewRequest(BaseModel):
+    path: str
+
+def _ndjson(events):
+    for event in events:
+        yield json.dumps(event, ensure_ascii=False) + "\n"
+
+@router.post("/review/project/archive")
+async def review_archive(request: Request, project: Optional[str] = None):
+    """
+    Review a whole project sent as the raw request body (zip or tar.gz).
+    Results stream back as NDJSON: one line per file as it finishes, then
+    a final {"type": "project"} summary. ?project=new keeps the symbol
+    index and returns its id in X-Project-Id; passing that id back
+    (?project=<id>) on the next upload skips re-indexing unchanged files.
+    """
+    from app.core.project_review import is_supported_archive, iter_archive_sources, review_sources
+
+    if project == "new":
+        project = secrets.token_hex(16)
+    elif project is not None and not _PROJECT_ID.match(project):
+        raise HTTPException(status_code=400, detail="project must be 'new' or an id from X-Project-Id")
+
+    # Spool the upload: small archives stay in memory, big ones go to disk
+    upload = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > config.PROJECT_MAX_ARCHIVE_BYTES:
+            upload.close()
+            raise HTTPException(status_code=413, detail="Archive too large")
+        upload.write(chunk)
+
+    if not is_supported_archive(upload):
+        upload.close()
+        raise HTTPException(status_code=400, detail="Body must be a zip or tar(.gz) archive")
+
+    def events():
+        try:
+            yield from _ndjson(review_sources(iter_archive_sources(upload), f"archive:{project}" if project else None))
+        finally:
+            upload.close()
+
+    headers = {"X-Project-Id": project} if project else None
+    return StreamingResponse(events(), media_type="application/x-ndjson", headers=headers)
+
+@router.post("/review/project/directory")
+def review_directory(request: DirectoryReviewRequest):
+    from app.core.project_review import iter_directory_sources, review_sources
+
+    if not config.PROJECT_ROOT:
+        raise HTTPException(status_code=403, detail="Directory reviews are disabled (set PROJECT_ROOT)")
+
+    root = os.path.realpath(config.PROJECT_ROOT)
+    path = os.path.realpath(os.path.join(root, request.path))
+    if os.path.commonpath([root, path]) != root:
+        raise HTTPException(status_code=403, detail="Path is outside PROJECT_ROOT")
+    if not os.path.isdir(path):
+        raise HTTPException(status_code=404, detail="Directory not found")
+
+    # The directory is the project: its symbol index is kept between reviews
+    events = review_sources(iter_directory_sources(path), f"directory:{path}")
+    return StreamingResponse(_ndjson(events), media_type="application/x-ndjson")
@@ -0,0 +1,88 @@
+# app/api/v1/endpoints/reviews.py
+
+from datetime import date, datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response
+
+from app.api.v1.endpoints.submit_code import get_db
+from app.api.v1.schemas.review import ReviewPage, ReviewStats
+from app.core import config, metrics
+from app.core.report_store import get_report, report_digest, report_fields
+
+# review_history and review_writer (SQLAlchemy) are imported on first use
+
+router = APIRouter()
+
+# 📋 Listing and stats read committed rows only: a review still waiting in
+# the write-behind queue shows up here a few milliseconds later
+@router.get("/reviews", response_model=ReviewPage)
+def list_reviews(
+    language: Optional[str] = None,
+    min_score: Optional[int] = Query(None, ge=0, le=100),
+    max_score: Optional[int] = Query(None, ge=0, le=100),
+    remark: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=config.REVIEWS_MAX_PAGE_SIZE),
+    db=Depends(get_db),
+):
+    from app.core import review_history
+
+    try:
+        with metrics.timed("db"):
+            items, next_cursor = review_history.list_reviews(
+                db,
+                language=language,
+                min_score=min_score,
+                max_score=max_score,
+                remark=remark,
+                created_after=created_after,
+                created_before=created_before,
+                cursor=cursor,
+                limit=limit,
+            )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/reviews/stats", response_model=ReviewStats)
+def review_stats(
+    language: Optional[str] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    db=Depends(get_db),
+):
+    from app.core import review_history
+
+    with metrics.timed("db"):
+        return review_history.review_stats(db, language, since, until)
+
+
+@router.get("/reviews/{review_uid}/report.pdf")
+def review_report(review_uid: str, request: Request, db=Depends(get_db)):
+    from app.core.review_writer import find_review
+
+    review = find_review(db, review_uid)
+    if review is None:
+        raise HTTPException(status_code=404, detail="Review not found")
+
+    report = report_fields(review)
+    digest = report_digest(report)
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=0, must-revalidate"}
+
+    # 🔁 Client already has this exact report: skip rendering entirely
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+
+    path = get_report(digest, report)
+    return FileResponse(
+        path,
+        media_type="application/pdf",
+        filename=f"code_review_{review_uid}.pdf",
+        headers=headers,
+    )
@@ -1,7 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List
-import ast
 
 router = APIRouter()
 
@@ -13,20 +12,11 @@ class StyleCheckResponse(BaseModel):
 
 @router.post("/check-style", response_model=StyleCheckResponse)
 async def check_style(request: StyleCheckRequest):
-    code = request.code
+    from app.utils.style_checker import find_missing_docstrings  # analyzers load on first use
+
     try:
-        tree = ast.parse(code)
-    except SyntaxError as e:
+        issues = find_missing_docstrings(request.code)
+    except (SyntaxError, ValueError) as e:
         raise HTTPException(status_code=400, detail=f"Syntax error in code: {e}")
-    
-    issues = []
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):
-            if not ast.get_docstring(node):
-                issues.append(f"Function '{node.name}' is missing a docstring.")
-        elif isinstance(node, ast.ClassDef):
-            if not ast.get_docstring(node):
-                issues.append(f"Class '{node.name}' is missing a docstring.")
-    
     return StyleCheckResponse(issues=issues)
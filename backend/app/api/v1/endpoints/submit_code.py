@@ -1,19 +1,29 @@
 # app/api/v1/endpoints/submit_code.py
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 
-from app.api.v1.schemas.review import CodeReviewRequest, CodeReviewResponse
-from app.core.review_engine import analyze_code
-from app.core.pdf_generator import generate_review_pdf
-from app.core.database import SessionLocal
-from app.models.code_review import CodeReview
-from app.utils.bug_detector import detect_bugs
-from app.utils.gpt_logic_checker import detect_logic_flaws  # ✅ NEW: Logic flaw detector
+from app.api.v1.schemas.review import (
+    BatchReviewItem,
+    BatchReviewRequest,
+    BatchReviewResponse,
+    CodeReviewRequest,
+    CodeReviewResponse,
+    IncrementalReviewRequest,
+    IncrementalReviewResponse,
+)
+from app.core import config, metrics, profiling
+from app.core.findings import render_result
+
+# 🐢 The pipeline (every analyzer), the database layer and the review
+# writer are imported inside the handlers, so importing the app stays cheap
 
 router = APIRouter()
 
 def get_db():
+    from app.core.database import SessionLocal, ensure_db
+
+    ensure_db()
     db = SessionLocal()
     try:
         yield db
@@ -21,48 +31,123 @@ def get_db():
         db.close()
 
 @router.post("/review", response_model=CodeReviewResponse)
-def review_code(request: CodeReviewRequest, db: Session = Depends(get_db)):
-    # 🔍 Static + Style analysis
-    result = analyze_code(request.language, request.code)
-
-    # 🐞 Detect bugs
-    bugs = detect_bugs(request.code)
-
-    # 🤖 Detect logic flaws
-    logic_flaws = detect_logic_flaws(request.code)
-
-    # 📌 Keep bugs separate; merge logic flaws into warnings
-    result["bugs"] = bugs
-    result["warnings"].extend(logic_flaws)
-
-    # 📝 Generate PDF report with bugs
-    pdf_filename = generate_review_pdf(
-        code=request.code,
-        language=request.language,
-        suggestions=result["suggestions"],
-        warnings=result["warnings"],
-        optimizations=result["optimizations"],
-        bugs=result["bugs"],  # ✅ Include bug list in PDF
-        score=result["score"],
-        remark=result["remark"]
-    )
-
-    # 💾 Save to database
-    review_record = CodeReview(
-        code=request.code,
-        language=request.language,
-        suggestions="\n".join(result["suggestions"]),
-        warnings="\n".join(result["warnings"]),
-        optimizations="\n".join(result["optimizations"]),
-        score=result["score"],
-        remark=result["remark"]
-        # Optional: Add bugs/logic_flaws in DB if needed
-    )
-    db.add(review_record)
-    db.commit()
-
-    # 🌐 Set downloadable PDF link
-    result["report_url"] = f"/static/{pdf_filename}"
-
-    # ✅ Return response with all fields
-    return CodeReviewResponse(**result)
+def review_code(request: CodeReviewRequest, http_request: Request, response: Response):
+    from app.core.review_pipeline import build_review_record, report_url, run_review
+    from app.core.review_writer import review_writer
+
+    # 🔬 X-Profile / ?profile= runs the whole handler under a profiler (if enabled in config, admin token only)
+    mode = profiling.requested_mode(http_request.headers, http_request.query_params)
+    with profiling.profile(mode, "/review") as profile:
+        # 🔍 Style, bugs and logic flaws on the worker pool, under time/memory caps
+        # (cached per content + language + type)
+        result = run_review(request.code, request.language, request.review_type)
+
+        # 💾 Queued for the database (bulk-inserted in the background)
+        review_record = build_review_record(request.code, request.language, result)
+        result["report_url"] = report_url(review_record)
+        with metrics.timed("db"):
+            review_writer.submit([review_record])
+
+        # ✅ Return response with all fields (findings rendered to text only here)
+        review = CodeReviewResponse(**render_result(result))
+
+    if profile is not None:
+        response.headers["X-Profile-Id"] = profile["id"]
+    return review
+
+@router.post("/review/stream")
+async def review_stream(request: CodeReviewRequest, http_request: Request):
+    """
+    /review, streamed: each analyzer stage's findings as soon as it
+    finishes, then the full review. NDJSON by default, Server-Sent Events
+    when the client accepts text/event-stream.
+    """
+    from app.core.review_stream import ndjson, sse, stream_review
+
+    events = stream_review(request.code, request.language, request.review_type, http_request.is_disconnected)
+    if "text/event-stream" in http_request.headers.get("accept", ""):
+        frame, media_type = sse, "text/event-stream"
+    else:
+        frame, media_type = ndjson, "application/x-ndjson"
+
+    async def body():
+        async for event in events:
+            yield frame(event)
+
+    # No buffering proxies in between (nginx would otherwise hold the events back)
+    return StreamingResponse(body(), media_type=media_type, headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.post("/review/incremental", response_model=IncrementalReviewResponse)
+def review_incremental(request: IncrementalReviewRequest, db=Depends(get_db)):
+    from app.core.incremental import apply_unified_diff
+    from app.core.review_pipeline import build_review_record, report_url, run_incremental_review
+    from app.core.review_writer import find_review, review_writer
+
+    if (request.code is None) == (request.diff is None):
+        raise HTTPException(status_code=422, detail="Send either the new code or a diff, not both")
+
+    previous = find_review(db, request.previous_review_id)
+    if previous is None:
+        raise HTTPException(status_code=404, detail="Previous review not found")
+
+    code = request.code
+    if request.diff is not None:
+        try:
+            code = apply_unified_diff(previous.code, request.diff)
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=f"Diff does not apply: {exc}")
+
+    # 🧩 Only functions/classes that changed since the previous review are analyzed
+    result, stats = run_incremental_review(code, previous.code, previous.language, request.review_type)
+
+    review_record = build_review_record(code, previous.language, result)
+    result["report_url"] = report_url(review_record)
+    with metrics.timed("db"):
+        review_writer.submit([review_record])
+
+    return IncrementalReviewResponse(**render_result(result), review_id=review_record.uid, incremental=stats)
+
+@router.post("/review/batch", response_model=BatchReviewResponse)
+def review_batch(request: BatchReviewRequest):
+    from app.core.review_pipeline import build_review_record, finish_review, report_url, submit_review
+    from app.core.review_writer import review_writer
+
+    if len(request.items) > config.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(request.items)} items (max {config.BATCH_MAX_ITEMS})",
+        )
+
+    # 🚀 Fan out across the process pool; identical items are analyzed once
+    futures = {}
+    for item in request.items:
+        key = (item.code, item.language, item.review_type)
+        if key not in futures:
+            futures[key] = submit_review(*key)
+
+    items = []
+    records = []
+    for index, item in enumerate(request.items):
+        key = (item.code, item.language, item.review_type)
+        try:
+            result = dict(finish_review(*key, futures[key]))
+        except Exception as exc:
+            items.append((index, None, f"Analysis failed: {exc}"))
+            continue
+        record = build_review_record(item.code, item.language, result)
+        result["report_url"] = report_url(record)
+        records.append(record)
+        items.append((index, result, None))
+
+    # 💾 Queued together, so the whole batch lands in as few inserts as possible
+    with metrics.timed("db"):
+        review_writer.submit(records)
+
+    results = []
+    for index, result, error in items:
+        if result is None:
+            results.append(BatchReviewItem(index=index, error=error))
+        else:
+            results.append(BatchReviewItem(index=index, result=CodeReviewResponse(**render_result(result))))
+
+    return BatchReviewResponse(results=results)
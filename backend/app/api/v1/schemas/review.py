@@ -1,17 +1,99 @@
+from datetime import datetime
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 class CodeReviewRequest(BaseModel):
     code: str
     language: str = "python"
-    review_type: str = "basic"
+    review_type: str = "basic"  # "profile": also run the functions in a sandbox and time them
+
+class BugReport(BaseModel):
+    message: str
+    severity: str
+    tip: Optional[str] = None
+
+class ProfilePoint(BaseModel):
+    n: int  # input size (the int passed, or items/characters in the generated argument)
+    seconds: float  # best time per call
+    peak_bytes: int  # traced peak allocation during one call
+
+class ProfiledFunction(BaseModel):
+    name: str
+    line: int
+    status: str  # measured, timeout (ran out of time; points so far kept), error, skipped, not run
+    reason: Optional[str] = None  # why it errored or was skipped
+    params: List[str]  # what was generated for each required parameter: int, str, list, list[str], dict...
+    estimated: Optional[str] = None  # static complexity estimate, e.g. "O(n²)"
+    growth: Optional[str] = None  # fitted from the measurements
+    exponent: Optional[float] = None  # slope of log(time) over log(n) for the larger sizes
+    points: List[ProfilePoint]
+
+class ProfileReport(BaseModel):
+    functions: List[ProfiledFunction]
+    seconds: float  # wall time of the profiling run
+    error: Optional[str] = None  # why nothing (or not everything) was measured
 
 class CodeReviewResponse(BaseModel):
     suggestions: List[str]
     warnings: List[str]
     optimizations: List[str]
-    bugs: List[str]  # ✅ Added bug list to response schema
+    bugs: List[BugReport]  # ✅ Added bug list to response schema
     score: int
     remark: str
     report_url: str  # ✅ Link to download PDF report
+    profile: Optional[ProfileReport] = None  # review_type="profile" only
+
+class BatchReviewRequest(BaseModel):
+    items: List[CodeReviewRequest]
+
+class BatchReviewItem(BaseModel):
+    index: int  # position in the request's items
+    result: Optional[CodeReviewResponse] = None
+    error: Optional[str] = None
+
+class BatchReviewResponse(BaseModel):
+    results: List[BatchReviewItem]
+
+class IncrementalReviewRequest(BaseModel):
+    previous_review_id: str  # uid of the review being revised
+    code: Optional[str] = None  # the new version in full...
+    diff: Optional[str] = None  # ...or a unified diff against the previous review's code
+    review_type: str = "basic"
+
+class IncrementalStats(BaseModel):
+    regions: int  # top-level functions/classes plus the code between them
+    changed: int  # regions whose text differs from the previous review
+    reanalyzed: int  # regions that had to be analyzed (not found in the cache)
+    reused: int
+    shared: int = 0  # reanalyzed regions whose AST matched a fragment seen before (e.g. in another file)
+
+class IncrementalReviewResponse(CodeReviewResponse):
+    review_id: str  # pass as previous_review_id to chain the next revision
+    incremental: Optional[IncrementalStats] = None  # None: analyzed as a whole (e.g. syntax error)
+
+class ReviewSummary(BaseModel):
+    review_id: str
+    language: Optional[str] = None
+    score: Optional[int] = None
+    remark: Optional[str] = None
+    created_at: Optional[datetime] = None  # UTC
+    report_url: str
+
+class ReviewPage(BaseModel):
+    items: List[ReviewSummary]
+    next_cursor: Optional[str] = None  # pass as ?cursor= for the next page; None on the last one
+
+class LanguageStats(BaseModel):
+    language: str
+    reviews: int
+    average_score: float
+
+class ScoreBucket(BaseModel):
+    bucket: str  # "0-9" ... "90-100"
+    reviews: int
 
+class ReviewStats(BaseModel):
+    total: int
+    average_score: Optional[float] = None
+    languages: List[LanguageStats]
+    score_distribution: List[ScoreBucket]
@@ -0,0 +1,194 @@
+# app/core/analysis_context.py
+
+import ast
+import io
+import tokenize
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from app.core.metrics import timed
+
+RuleHandler = Callable[[ast.AST, List[ast.AST], "RuleState"], None]
+
+
+class RuleState:
+    """
+    Scratch space shared by the rules of one analyzer group during a walk.
+
+    Rules append to `findings` and may stash any extra bookkeeping they need
+    (counters, symbol maps, ...) as attributes.
+    """
+
+    def __init__(self, ctx: "AnalysisContext"):
+        self.ctx = ctx
+        self.findings: list = []
+
+
+class RuleRegistry:
+    """
+    Node-type → rule dispatch table shared by every analyzer.
+
+    Analyzers register their AST rules here under a group name; a single
+    depth-first walk of the tree then feeds each node to exactly the rules
+    that care about its type.
+    """
+
+    def __init__(self):
+        self._rules: Dict[type, List[Tuple[str, RuleHandler]]] = {}
+        self._initializers: Dict[str, Callable[[RuleState], None]] = {}
+        self._finalizers: Dict[str, Callable[[RuleState], None]] = {}
+        self._groups: List[str] = []
+        self.generation = 0
+
+    def _add_group(self, group: str):
+        if group not in self._groups:
+            self._groups.append(group)
+        self.generation += 1
+
+    def rule(self, group: str, *node_types: type):
+        def decorator(fn: RuleHandler) -> RuleHandler:
+            for node_type in node_types:
+                self._rules.setdefault(node_type, []).append((group, fn))
+            self._add_group(group)
+            return fn
+        return decorator
+
+    def initializer(self, group: str):
+        """Register a hook that seeds `group`'s state before the walk."""
+        def decorator(fn: Callable[[RuleState], None]):
+            self._initializers[group] = fn
+            self._add_group(group)
+            return fn
+        return decorator
+
+    def finalizer(self, group: str):
+        """Register a hook that runs once for `group` after the walk."""
+        def decorator(fn: Callable[[RuleState], None]):
+            self._finalizers[group] = fn
+            self._add_group(group)
+            return fn
+        return decorator
+
+    def walk(self, ctx: "AnalysisContext", groups: Optional[Tuple[str, ...]] = None) -> Dict[str, RuleState]:
+        """Run the rules of `groups` (default: all) over ctx.tree in one walk."""
+        groups = self._groups if groups is None else [group for group in self._groups if group in groups]
+        states = {group: RuleState(ctx) for group in groups}
+        for group, init in self._initializers.items():
+            if group in states:
+                init(states[group])
+        rules = self._rules
+        if len(groups) != len(self._groups):
+            rules = {
+                node_type: [(group, fn) for group, fn in handlers if group in states]
+                for node_type, handlers in rules.items()
+            }
+
+        # Iterative pre-order walk so deeply nested input can't blow the stack.
+        ancestors: List[ast.AST] = []
+        stack: List[Tuple[ast.AST, int]] = [(ctx.tree, 0)]
+        pop = stack.pop
+        push = stack.append
+        while stack:
+            node, depth = pop()
+            del ancestors[depth:]
+            node_type = type(node)
+            handlers = rules.get(node_type)
+            if handlers:
+                for group, handler in handlers:
+                    handler(node, ancestors, states[group])
+            ancestors.append(node)
+            # Children pushed last-first so they pop in source order
+            depth += 1
+            for field in reversed(_child_fields(node_type)):
+                value = getattr(node, field, None)
+                if isinstance(value, list):
+                    for child in reversed(value):
+                        if isinstance(child, ast.AST):
+                            push((child, depth))
+                elif isinstance(value, ast.AST):
+                    push((value, depth))
+
+        for group, finalize in self._finalizers.items():
+            if group in states:
+                finalize(states[group])
+        return states
+
+
+_FIELDS: Dict[type, Tuple[str, ...]] = {}
+
+
+def _child_fields(node_type: type) -> Tuple[str, ...]:
+    """Fields of `node_type` that can hold child nodes (not expression contexts: no rule wants Load/Store)."""
+    fields = _FIELDS.get(node_type)
+    if fields is None:
+        fields = _FIELDS[node_type] = tuple(field for field in node_type._fields if field != "ctx")
+    return fields
+
+
+registry = RuleRegistry()
+
+
+class AnalysisContext:
+    """
+    Parse-once view of a submission shared by every analyzer.
+
+    The AST, the line list and the token stream are computed on first use
+    and cached, and the registered rules run in one walk whose results are
+    kept per group.
+    """
+
+    def __init__(self, code: str, language: str = "python", tree: Optional[ast.AST] = None):
+        self.code = code
+        self.language = language.lower()
+        self.syntax_error: Optional[Exception] = None
+        self._states: Optional[Dict[str, RuleState]] = None
+        self._generation = -1
+        self._derived: Dict[str, Any] = {}
+        if tree is not None:
+            # Already parsed elsewhere (e.g. a region cut from a larger module)
+            self.__dict__["tree"] = tree
+
+    @classmethod
+    def of(cls, source: Union[str, "AnalysisContext"], language: str = "python") -> "AnalysisContext":
+        if isinstance(source, AnalysisContext):
+            return source
+        return cls(source, language)
+
+    @cached_property
+    def lines(self) -> List[str]:
+        return self.code.split("\n")
+
+    @cached_property
+    def tree(self) -> Optional[ast.AST]:
+        try:
+            with timed("parse"):
+                return ast.parse(self.code)
+        except (SyntaxError, ValueError) as exc:
+            self.syntax_error = exc
+            return None
+
+    @cached_property
+    def tokens(self) -> List[tokenize.TokenInfo]:
+        tokens = []
+        try:
+            for tok in tokenize.generate_tokens(io.StringIO(self.code).readline):
+                tokens.append(tok)
+        except (tokenize.TokenError, SyntaxError):
+            pass  # keep whatever was tokenized before the error
+        return tokens
+
+    def derived(self, name: str, compute: Callable[["AnalysisContext"], Any]) -> Any:
+        """compute(self), worked out once and shared by every analyzer that asks for `name`."""
+        if name not in self._derived:
+            self._derived[name] = compute(self)
+        return self._derived[name]
+
+    def rules(self, group: str) -> Optional[RuleState]:
+        """Results of `group`'s rules, walking the tree on first request."""
+        if self.tree is None:
+            return None
+        if self._states is None or self._generation != registry.generation:
+            self._generation = registry.generation
+            with timed("rules"):
+                self._states = registry.walk(self)
+        return self._states.get(group)
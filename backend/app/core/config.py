@@ -0,0 +1,81 @@
+# app/core/config.py
+
+import os
+
+
+def _int_env(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+# 🗄️ The one review database (sqlite URLs get WAL mode and tuned pragmas)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app/code_reviews.db")
+# ✍️ Write-behind queue: review rows are inserted in bulk by size or time
+DB_WRITE_BATCH_SIZE = _int_env("DB_WRITE_BATCH_SIZE", 200)
+DB_WRITE_FLUSH_MS = _int_env("DB_WRITE_FLUSH_MS", 50)
+DB_WRITE_QUEUE_MAX = _int_env("DB_WRITE_QUEUE_MAX", 10000)
+# 📋 Largest page GET /reviews returns
+REVIEWS_MAX_PAGE_SIZE = 500
+
+# ♻️ In-process result cache (LRU, bounded by entry count and bytes)
+RESULT_CACHE_MAX_ENTRIES = _int_env("RESULT_CACHE_MAX_ENTRIES", 1024)
+RESULT_CACHE_MAX_BYTES = _int_env("RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+
+# 💽 Persistent analysis cache shared by all workers (empty path disables it)
+ANALYSIS_CACHE_PATH = os.getenv("ANALYSIS_CACHE_PATH", os.path.join("app", "analysis_cache.db"))
+ANALYSIS_CACHE_MAX_BYTES = _int_env("ANALYSIS_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+
+# 📝 On-demand PDF rendering and the disk budget for rendered reports
+REPORT_DIR = os.getenv("REPORT_DIR", os.path.join("app", "static"))
+REPORT_WORKERS = _int_env("REPORT_WORKERS", 2)
+REPORT_CACHE_MAX_BYTES = _int_env("REPORT_CACHE_MAX_BYTES", 512 * 1024 * 1024)
+
+# ⚙️ Analysis process pool (-1 = one worker per CPU, 0 = run in-thread)
+ANALYSIS_WORKERS = _int_env("ANALYSIS_WORKERS", -1)
+ANALYSIS_TIMEOUT_SECONDS = _int_env("ANALYSIS_TIMEOUT_SECONDS", 10)
+ANALYSIS_MEMORY_LIMIT_MB = _int_env("ANALYSIS_MEMORY_LIMIT_MB", 1024)
+BATCH_MAX_ITEMS = _int_env("BATCH_MAX_ITEMS", 500)
+
+# 🔥 Startup warm-up: analyzers, ReportLab, SQLAlchemy and the schema check
+# are otherwise loaded by the first request that needs them, and worker
+# processes started on first use. Off by default so a cold start only pays
+# for the web framework; ANALYSIS_WARMUP is the older name of the switch.
+WARMUP = _int_env("WARMUP", _int_env("ANALYSIS_WARMUP", 0))
+
+# ⌨️ Live (as-you-type) reviews over /review/live: quiet time before the
+# quick text checks and before the full review, and the largest document
+LIVE_QUICK_DEBOUNCE_MS = _int_env("LIVE_QUICK_DEBOUNCE_MS", 150)
+LIVE_DEEP_DEBOUNCE_MS = _int_env("LIVE_DEEP_DEBOUNCE_MS", 1000)
+LIVE_MAX_CODE_BYTES = _int_env("LIVE_MAX_CODE_BYTES", 1024 * 1024)
+
+# 📦 Whole-project reviews (archives and local directories)
+PROJECT_MAX_ARCHIVE_BYTES = _int_env("PROJECT_MAX_ARCHIVE_BYTES", 200 * 1024 * 1024)
+PROJECT_MAX_FILE_BYTES = _int_env("PROJECT_MAX_FILE_BYTES", 1024 * 1024)
+PROJECT_MAX_FILES = _int_env("PROJECT_MAX_FILES", 20000)
+# Local directory reviews are only allowed below this root (empty = disabled)
+PROJECT_ROOT = os.getenv("PROJECT_ROOT", "")
+# 🗂️ Per-project symbol index (signatures, classes, imports) kept between
+# reviews of the same project, for cross-file checks (empty path: not kept)
+SYMBOL_INDEX_PATH = os.getenv("SYMBOL_INDEX_PATH", os.path.join("app", "symbol_index.db"))
+
+# 🔬 Opt-in per-request profiling (X-Profile header or ?profile= on /review, with X-Admin-Token)
+PROFILING_ENABLED = _int_env("PROFILING_ENABLED", 0)
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join("app", "profiles"))
+PROFILE_MAX_ENTRIES = _int_env("PROFILE_MAX_ENTRIES", 50)
+PROFILE_SAMPLE_INTERVAL_MS = _int_env("PROFILE_SAMPLE_INTERVAL_MS", 2)
+# Admin endpoints (stored profiles) require this token in X-Admin-Token; empty disables them
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# 🧪 review_type="profile": functions are run and timed in a sandboxed subprocess
+# (rlimits, no network, subprocesses or file access outside the interpreter's
+# own files). Off by default: it executes submitted code. Keep the wall-clock
+# limit under ANALYSIS_TIMEOUT_SECONDS: the sandbox runs inside the analysis job.
+SANDBOX_ENABLED = _int_env("SANDBOX_ENABLED", 0)
+# Started as root, the sandbox switches to this user before running anything submitted
+SANDBOX_USER = os.getenv("SANDBOX_USER", "nobody")
+SANDBOX_TIMEOUT_SECONDS = _int_env("SANDBOX_TIMEOUT_SECONDS", 8)
+SANDBOX_CPU_SECONDS = _int_env("SANDBOX_CPU_SECONDS", 8)
+SANDBOX_MEMORY_LIMIT_MB = _int_env("SANDBOX_MEMORY_LIMIT_MB", 256)
+SANDBOX_MAX_FUNCTIONS = _int_env("SANDBOX_MAX_FUNCTIONS", 8)
+SANDBOX_FUNCTION_BUDGET_MS = _int_env("SANDBOX_FUNCTION_BUDGET_MS", 600)  # per function, every input size included
+SANDBOX_MAX_N = _int_env("SANDBOX_MAX_N", 100000)  # largest input size tried
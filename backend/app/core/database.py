@@ -1,12 +1,74 @@
-from sqlalchemy import create_engine
+import threading
+
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker
+
+from app.core import config
+from app.core.review_history import backfill_rollups
 from app.models.code_review import Base
 
-DATABASE_URL = "sqlite:///./app/code_reviews.db"
+DATABASE_URL = config.DATABASE_URL
+
+# 🗄️ WAL lets readers run alongside the writer; synchronous=NORMAL is safe
+# with WAL and skips the fsync on every commit; busy_timeout makes a
+# briefly locked database wait instead of failing the request
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16384",  # KiB, per connection
+    "PRAGMA foreign_keys=ON",
+)
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+
 # Create DB tables
 def init_db():
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    with engine.begin() as conn:
+        backfill_rollups(conn)  # no-op once the rollups exist
+
+
+_initialized = False
+_init_lock = threading.Lock()
+
+
+def ensure_db():
+    """init_db() once per process, by whatever touches the database first (not at startup)."""
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if not _initialized:
+            init_db()
+            _initialized = True
+
+
+def _add_missing_columns():
+    """
+    create_all() never alters existing tables, so columns added to a model
+    after a database was created are appended here (nullable, no backfill).
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
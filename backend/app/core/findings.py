@@ -0,0 +1,123 @@
+# app/core/findings.py
+
+from typing import Dict, Iterable, List, Optional, Union
+
+from app.core.message_catalog import CATALOG
+
+KINDS = ("suggestions", "warnings", "optimizations", "bugs")  # result keys holding findings
+
+# Score deducted per occurrence, by result key
+WEIGHTS = {"warnings": 5, "suggestions": 2, "optimizations": 1, "bugs": 3}
+
+
+class Finding:
+    """
+    One analyzer finding: a catalog rule id plus whatever varies between
+    occurrences (line span, template arguments). Text only exists once
+    render() is called, when a result is serialized.
+    """
+
+    __slots__ = ("rule", "args", "line", "end_line", "severity", "count")
+
+    def __init__(self, rule: str, args: Optional[dict] = None, line: Optional[int] = None,
+                 end_line: Optional[int] = None, severity: Optional[str] = None, count: int = 1):
+        self.rule = rule
+        self.args = args or None
+        self.line = line
+        self.end_line = end_line
+        self.severity = severity or CATALOG[rule].severity
+        self.count = count
+
+    @property
+    def kind(self) -> str:
+        return CATALOG[self.rule].kind
+
+    def key(self) -> tuple:
+        """Occurrences with the same key are the same finding (see aggregate())."""
+        return self.rule, self.severity, tuple(sorted(self.args.items())) if self.args else ()
+
+    def shifted(self, offset: Optional[int]) -> "Finding":
+        """The same finding `offset` lines further down (None: line unknown)."""
+        if offset == 0 or self.line is None:
+            return self
+        if offset is None:
+            return Finding(self.rule, self.args, None, None, self.severity, self.count)
+        end_line = self.end_line + offset if self.end_line is not None else None
+        return Finding(self.rule, self.args, self.line + offset, end_line, self.severity, self.count)
+
+    def render(self, impact: bool = True) -> Union[str, dict]:
+        return render_message(self.rule, self.severity, self.args, self.count, impact=impact)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Finding):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        parts = [repr(self.rule)] + [f"{name}={getattr(self, name)!r}" for name in self.__slots__[1:] if getattr(self, name) is not None]
+        return f"Finding({', '.join(parts)})"
+
+
+def render_message(rule: str, severity: str, args: Optional[dict], count: int = 1, template: Optional[str] = None,
+                   impact: bool = True, kind: Optional[str] = None) -> Union[str, dict]:
+    """
+    Human text for a finding: a string, or a message/severity/tip dict for
+    bugs. `template` overrides the catalog's (stored findings keep the
+    wording they were written with).
+    """
+    entry = CATALOG.get(rule)
+    kind = kind or entry.kind
+    args = args or {}
+    template = template if template is not None else entry.template
+    text = template.format(severity=severity, **args)
+    if impact and kind != "bug" and entry is not None and entry.impact and "{severity}" not in template:
+        text += f" ({severity} impact)"
+    if count > 1:
+        text += f" (×{count})"
+    if kind == "bug":
+        return {"message": text, "severity": severity, "tip": entry.tip if entry is not None else args.get("tip")}
+    return text
+
+
+def aggregate(findings: Iterable[Finding]) -> List[Finding]:
+    """One Finding per distinct key, counting occurrences, in order of first appearance."""
+    merged: Dict[tuple, Finding] = {}
+    for finding in findings:
+        key = finding.key()
+        seen = merged.get(key)
+        if seen is None:
+            merged[key] = Finding(finding.rule, finding.args, finding.line, finding.end_line, finding.severity, finding.count)
+        else:
+            seen.count += finding.count
+    return list(merged.values())
+
+
+def occurrences(findings: Iterable[Finding]) -> int:
+    return sum(finding.count for finding in findings)
+
+
+def render_all(findings: Iterable[Finding], impact: bool = True) -> list:
+    return [finding.render(impact) for finding in findings]
+
+
+def render_result(result: dict) -> dict:
+    """`result` with its findings turned into text, ready for a response."""
+    rendered = dict(result)
+    for key in KINDS:
+        if key in rendered:
+            rendered[key] = render_all(rendered[key])
+    return rendered
+
+
+# 🗃️ JSON hooks, so results holding Findings go through the JSON result caches
+def to_json(value):
+    if isinstance(value, Finding):
+        return {"$f": [value.rule, value.args, value.line, value.end_line, value.severity, value.count]}
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def from_json(obj: dict):
+    data = obj.get("$f")
+    return Finding(*data) if data is not None and len(obj) == 1 else obj
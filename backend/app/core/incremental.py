@@ -0,0 +1,316 @@
+# app/core/incremental.py
+
+import ast
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app.core.analysis_context import AnalysisContext
+from app.core.findings import Finding, aggregate
+from app.core.result_cache import ResultCache, cache_key, review_cache
+from app.core.review_engine import python_findings, python_text_facts, python_tree_facts, summarize
+from app.utils.bug_detector import bug_findings
+from app.utils.gpt_logic_checker import logic_facts, logic_flaws
+from app.utils.performance_profiler import (
+    performance_facts, performance_findings, performance_report, seed_module_names,
+)
+from app.utils.style_checker import style_facts, style_result
+
+# 🧩 Per-region analysis, keyed by the region's text, and its AST-derived
+# part again by normalized-AST fingerprint so duplicated functions across
+# files are analyzed once. Shares the on-disk store with review_cache but
+# has its own memory budget, so the regions of one big module don't push
+# whole reviews out.
+region_cache = ResultCache(backing=review_cache.backing, name="region")
+
+_BLOCKS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+_HUNK = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_WORD = re.compile(r"\w+")
+
+# Module-level names bound to a list / a str by the regions before, that a
+# region's performance rules need (`x in ITEMS` is a list scan)
+ModuleNames = Tuple[Tuple[str, ...], Tuple[str, ...]]
+NO_NAMES: ModuleNames = ((), ())
+
+
+class Region(NamedTuple):
+    start: int  # first line, 0-based
+    end: int  # one past the last line
+    text: str
+    nodes: List[ast.stmt]
+
+
+def _first_line(node: ast.stmt) -> int:
+    decorators = getattr(node, "decorator_list", [])
+    return min([node.lineno] + [d.lineno for d in decorators]) - 1
+
+
+def split_regions(ctx: AnalysisContext) -> Optional[List[Region]]:
+    """
+    Cut a parsed module into contiguous line ranges: one per top-level
+    function or class (decorators included) and one per stretch of other
+    code between them. None if the code doesn't parse.
+    """
+    if ctx.tree is None:
+        return None
+    lines = ctx.lines
+    body = ctx.tree.body
+
+    cuts = {0, len(lines)}
+    for node in body:
+        if isinstance(node, _BLOCKS):
+            cuts.add(_first_line(node))
+            cuts.add(node.end_lineno)
+    cuts = sorted(cuts)
+
+    regions = []
+    i = 0
+    for start, end in zip(cuts, cuts[1:]):
+        nodes = []
+        while i < len(body) and _first_line(body[i]) < end:
+            if body[i].end_lineno > end:
+                return None  # statement straddles a cut; analyze as a whole
+            nodes.append(body[i])
+            i += 1
+        regions.append(Region(start, end, "\n".join(lines[start:end]), nodes))
+    return regions
+
+
+def fingerprint(nodes: List[ast.stmt]) -> str:
+    """
+    Normalized AST of a region: no line/column attributes, so the same
+    function vendored at another offset, or re-indented and re-commented,
+    fingerprints the same.
+    """
+    return "\n".join(ast.dump(node) for node in nodes)
+
+
+def text_facts(ctx: AnalysisContext) -> dict:
+    """Region findings read off the text (style, docstrings, import usage)."""
+    return {"python": python_text_facts(ctx), "style": style_facts(ctx)}
+
+
+def tree_facts(ctx: AnalysisContext) -> dict:
+    """Region findings from the AST; cached by fingerprint() rather than text."""
+    return {
+        "python": python_tree_facts(ctx),
+        "bugs": bug_findings(ctx),
+        "logic": logic_facts(ctx),
+        "performance": performance_facts(ctx),
+    }
+
+
+def relocate(facts, offset: Optional[int]):
+    """`facts` with every Finding in it moved `offset` lines (None: lines dropped)."""
+    if isinstance(facts, Finding):
+        return facts.shifted(offset)
+    if isinstance(facts, list):
+        return [relocate(item, offset) for item in facts]
+    if isinstance(facts, dict):
+        return {key: relocate(value, offset) for key, value in facts.items()}
+    return facts
+
+
+def _keyed(source: str, names: ModuleNames) -> str:
+    """Cache key text for `source` analyzed with module `names` from earlier regions (plain source without)."""
+    return source if names == NO_NAMES else f"{source}\0{names!r}"
+
+
+def region_facts(region: Region, fragments: Dict[str, dict], names: ModuleNames = NO_NAMES) -> Tuple[dict, bool]:
+    """
+    Every analyzer's region-local findings (cross-region checks are left
+    to assemble()), and whether the AST part came from a structurally
+    identical fragment seen before. New fragments are added to `fragments`
+    for the caller to store. `names` are the module-level list / str
+    bindings from earlier regions that the region mentions.
+
+    Line numbers are relative to the region (its first line is 1), so the
+    facts stay valid wherever the same text turns up again.
+    """
+    ctx = AnalysisContext(region.text, "python", tree=ast.Module(body=region.nodes, type_ignores=[]))
+    if names != NO_NAMES:
+        seed_module_names(ctx, *names)
+    text = text_facts(ctx)
+
+    key = cache_key(_keyed(fingerprint(region.nodes), names), "python", kind="fragment")
+    tree = fragments.get(key) or region_cache.get(key)
+    shared = tree is not None
+    if shared:
+        # Same AST, but blank lines and comments inside it may differ: its
+        # line numbers don't carry over
+        tree = relocate(tree, None)
+    else:
+        # The region's nodes keep their line numbers from the whole module
+        tree = fragments[key] = relocate(tree_facts(ctx), -region.start)
+
+    return {
+        "python": {**text["python"], **tree["python"]},
+        "style": text["style"],
+        "bugs": tree["bugs"],
+        "logic": tree["logic"],
+        "performance": tree["performance"],
+    }, shared
+
+
+def _collect(regions: List[Region]) -> Tuple[List[dict], dict]:
+    """Facts for every region, analyzing only those not cached; plus reuse counts."""
+    facts = []
+    fresh = {}
+    fragments = {}
+    reanalyzed = 0
+    shared = 0
+    # 🔗 Module-level list / str names carried from region to region, in
+    # source order as the whole-file walk sees them. A region is keyed on
+    # the ones it mentions, so most regions keep their plain-text key.
+    lists, strings = set(), set()
+    for region in regions:
+        used = set(_WORD.findall(region.text)) if lists or strings else set()
+        names = (tuple(sorted(lists & used)), tuple(sorted(strings & used)))
+        key = cache_key(_keyed(region.text, names), "python", kind="region")
+        found = fresh.get(key) or region_cache.get(key)
+        if found is None:
+            fresh[key], from_fragment = region_facts(region, fragments, names)
+            found = fresh[key]
+            reanalyzed += 1
+            shared += from_fragment
+        facts.append(found)
+        # Names a region doesn't mention can't change in it
+        lists = (lists - used) | set(found["performance"]["module_lists"])
+        strings = (strings - used) | set(found["performance"]["module_strings"])
+    if fresh:
+        region_cache.put_many({**fragments, **fresh})
+
+    return facts, {
+        "regions": len(regions),
+        "changed": len(regions),
+        "reanalyzed": reanalyzed,
+        "reused": len(regions) - reanalyzed,
+        "shared": shared,
+    }
+
+
+def assemble(code: str, regions: List[Region], facts: List[dict]) -> dict:
+    """The analyze_review() result for `code`, built from its regions' facts."""
+    # 📐 Findings were recorded relative to their region
+    style = style_result(code, [(region.start, f["style"]) for region, f in zip(regions, facts)])
+    facts = [relocate({**f, "style": None}, region.start) for region, f in zip(regions, facts)]
+    suggestions, warnings, optimizations = python_findings(code, [f["python"] for f in facts])
+    bugs = [bug for f in facts for bug in f["bugs"]]
+    result = summarize(suggestions, warnings, optimizations, bugs, style)
+    result["warnings"].extend(aggregate(logic_flaws(code, [f["logic"] for f in facts])))
+    return result
+
+
+def review_python(ctx: AnalysisContext, previous_code: Optional[str] = None) -> Optional[Tuple[dict, dict]]:
+    """
+    Review Python source region by region, analyzing only regions whose
+    text has not been seen before. Returns the result plus a summary of
+    how much was reused, or None if the code can't be split (syntax error).
+    """
+    regions = split_regions(ctx)
+    if regions is None:
+        return None
+
+    facts, stats = _collect(regions)
+    if previous_code is not None:
+        previous = split_regions(AnalysisContext(previous_code))
+        seen = {region.text for region in previous or ()}
+        stats["changed"] = sum(1 for region in regions if region.text not in seen)
+
+    return assemble(ctx.code, regions, facts), stats
+
+
+def _performance_facts(ctx: AnalysisContext) -> Optional[List[dict]]:
+    regions = split_regions(ctx)
+    if regions is None:
+        return None
+    facts, _ = _collect(regions)
+    return [relocate(f["performance"], region.start) for region, f in zip(regions, facts)]
+
+
+def performance_issues(ctx: AnalysisContext) -> Optional[List[Finding]]:
+    """find_performance_issues() from cached regions; None if the code can't be split."""
+    facts = _performance_facts(ctx)
+    return performance_findings(facts) if facts is not None else None
+
+
+def performance_profile(ctx: AnalysisContext) -> Optional[dict]:
+    """performance_report() (complexity per function + issues) from cached regions; None if the code can't be split."""
+    facts = _performance_facts(ctx)
+    return performance_report(facts) if facts is not None else None
+
+
+def _keep_newlines(text: str) -> List[str]:
+    # Like splitlines(keepends=True), but only "\n" ends a line (source may
+    # legitimately contain form feeds and other separators splitlines() honours)
+    lines = [line + "\n" for line in text.split("\n")]
+    lines[-1] = lines[-1][:-1]
+    return lines if lines[-1] else lines[:-1]
+
+
+def apply_unified_diff(original: str, diff: str) -> str:
+    """
+    Apply a single-file unified diff (as produced by `diff -u` or `git
+    diff`) to `original`. Raises ValueError if a hunk doesn't match.
+    """
+    source = _keep_newlines(original)
+    patch = _keep_newlines(diff)
+    out = []
+    pos = 0  # next unconsumed line of `source`
+    seen_target = False
+    i = 0
+    while i < len(patch):
+        line = patch[i]
+        if line.startswith("+++ "):
+            if seen_target:
+                raise ValueError("diff touches more than one file")
+            seen_target = True
+            i += 1
+            continue
+        match = _HUNK.match(line)
+        if match is None:
+            i += 1  # headers ("diff --git", "index", "---") and chatter
+            continue
+
+        old_start, old_count = int(match.group(1)), int(match.group(2) or 1)
+        new_count = int(match.group(4) or 1)
+        # A pure insertion ("-3,0") goes after line 3 rather than at it
+        start = old_start - 1 if old_count else old_start
+        if start < pos or start > len(source):
+            raise ValueError(f"hunk at line {old_start} is out of order or past the end of the file")
+        out.extend(source[pos:start])
+        pos = start
+
+        i += 1
+        ops = []
+        old_left, new_left = old_count, new_count
+        while i < len(patch) and (old_left or new_left or patch[i].startswith("\\")):
+            text = patch[i]
+            if text.startswith("\\"):  # "\ No newline at end of file"
+                if ops:
+                    ops[-1] = (ops[-1][0], ops[-1][1].rstrip("\r\n"))
+            elif text[:1] in (" ", "\n", "\r") and old_left and new_left:
+                ops.append((" ", text[1:] if text[:1] == " " else text))
+                old_left -= 1
+                new_left -= 1
+            elif text.startswith("-") and old_left:
+                ops.append(("-", text[1:]))
+                old_left -= 1
+            elif text.startswith("+") and new_left:
+                ops.append(("+", text[1:]))
+                new_left -= 1
+            else:
+                raise ValueError(f"malformed hunk at line {old_start}")
+            i += 1
+        if old_left or new_left:
+            raise ValueError(f"hunk at line {old_start} is truncated")
+
+        for op, text in ops:
+            if op in (" ", "-"):
+                if pos >= len(source) or source[pos] != text:
+                    raise ValueError(f"hunk does not match the previous code at line {pos + 1}")
+                pos += 1
+            if op in (" ", "+"):
+                out.append(text)
+
+    out.extend(source[pos:])
+    return "".join(out)
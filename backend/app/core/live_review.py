@@ -0,0 +1,154 @@
+# app/core/live_review.py
+
+import ast
+import asyncio
+import re
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core import config
+from app.core.findings import Finding, render_result
+from app.core.review_pipeline import finish_review, submit_review
+from app.utils.style_checker import style_facts, style_result
+
+# ⌨️ As-you-type reviews for one editor session. Edits restart a debounce
+# timer: after a short quiet spell the cheap text-level checks run, and
+# once the user pauses the full review runs on the worker pool.
+
+# Top-level lines that start a new block when the document is cut up
+# without parsing it (the document is often mid-edit and won't parse)
+_BLOCK_START = re.compile(r"(?:async\s+def|def|class)\s|@")
+
+
+def split_text(code: str) -> List[Tuple[int, str]]:
+    """
+    Cut source into (first line, text) chunks at top-level def/class lines
+    (decorators included), without parsing it. A cheap approximation of
+    incremental.split_regions() that also works on code that doesn't parse.
+    """
+    lines = code.split("\n")
+    starts = [0]
+    for i, line in enumerate(lines):
+        if i and _BLOCK_START.match(line) and not (lines[i - 1].startswith("@") and starts[-1] < i):
+            starts.append(i)
+    starts.append(len(lines))
+    return [(start, "\n".join(lines[start:end])) for start, end in zip(starts, starts[1:]) if start < end]
+
+
+def chunk_facts(text: str) -> dict:
+    """Quick-check facts for one chunk: its style facts and first syntax error."""
+    try:
+        ast.parse(text)
+        error = None
+    except SyntaxError as exc:
+        error = Finding("live.syntax-error", {"message": exc.msg}, exc.lineno or 1)
+    except (ValueError, RecursionError) as exc:  # null bytes, absurd nesting
+        error = Finding("live.syntax-error", {"message": str(exc)}, 1)
+    return {"style": style_facts(text), "error": error}
+
+
+def apply_changes(code: str, changes: List[dict]) -> str:
+    """
+    Apply editor changes, each {"offset", "length", "text"} against `code`
+    as it was before any of them (Monaco's onDidChangeModelContent shape).
+    Raises ValueError if they don't fit.
+    """
+    if not isinstance(changes, list) or not all(isinstance(change, dict) for change in changes):
+        raise ValueError("changes must be a list of {offset, length, text} objects")
+    spans = []
+    for change in changes:
+        try:
+            offset, length, text = int(change["offset"]), int(change.get("length", 0)), str(change.get("text", ""))
+        except (KeyError, TypeError, ValueError, OverflowError):  # OverflowError: int(1e400)
+            raise ValueError("each change needs an integer offset, a length and a text")
+        spans.append((offset, length, text))
+    previous_end = len(code)
+    for offset, length, text in sorted(spans, reverse=True):
+        if offset < 0 or length < 0 or offset + length > previous_end:
+            raise ValueError("change does not fit the document; send the full code")
+        code = code[:offset] + text + code[offset + length:]
+        previous_end = offset
+    return code
+
+
+class LiveSession:
+    """
+    One editor's document and its analysis. update() takes an edit message;
+    results go out through `send` tagged with the version they are for.
+
+    A session has at most one job (debounce, quick check, full review) and
+    an edit cancels it. A full review that is already running on the pool
+    can't be interrupted: its result is dropped, and the next one waits for
+    it, so one session never occupies more than one worker.
+    """
+
+    def __init__(self, send: Callable[[dict], Awaitable[None]], language: str = "python"):
+        self.send = send
+        self.language = language
+        self.code = ""
+        self.version = 0
+        self._job: Optional[asyncio.Task] = None
+        self._running: Optional[Future] = None  # the session's pool job, possibly superseded
+        self._chunks: Dict[str, dict] = {}  # chunk text -> chunk_facts(), for the latest quick check
+
+    def update(self, message: dict):
+        """Apply an edit message ({"version", "language", "code" or "changes"}) and reschedule analysis."""
+        if "code" in message:
+            code = message["code"]
+            if not isinstance(code, str):
+                raise ValueError("code must be a string")
+        elif "changes" in message:
+            code = apply_changes(self.code, message["changes"])
+        else:
+            raise ValueError("send the code or a list of changes")
+        if len(code.encode("utf-8", "surrogatepass")) > config.LIVE_MAX_CODE_BYTES:
+            raise ValueError(f"document larger than {config.LIVE_MAX_CODE_BYTES} bytes")
+
+        self.code = code
+        self.language = str(message.get("language") or self.language)
+        self.version = message.get("version", self.version + 1)
+        self.cancel()
+        self._job = asyncio.ensure_future(self._analyze(self.code, self.language, self.version))
+
+    def cancel(self):
+        if self._job is not None:
+            self._job.cancel()
+            self._job = None
+
+    def quick_check(self, code: str) -> dict:
+        """Style and syntax findings, re-checking only chunks that changed since the last call."""
+        chunks = split_text(code)
+        facts = {text: self._chunks.get(text) or chunk_facts(text) for _, text in chunks}
+        self._chunks = facts  # only the current document's chunks are kept
+        result = style_result(code, [(start, facts[text]["style"]) for start, text in chunks])
+        errors = [facts[text]["error"].shifted(start) for start, text in chunks if facts[text]["error"] is not None]
+        return {"suggestions": result["suggestions"], "warnings": errors + result["warnings"]}
+
+    async def _analyze(self, code: str, language: str, version):
+        quick = config.LIVE_QUICK_DEBOUNCE_MS / 1000
+        await asyncio.sleep(quick)
+        if language.lower() == "python":
+            found = await run_in_threadpool(self.quick_check, code)
+            await self.send({"type": "quick", "version": version, **render_result(found)})
+        # 💤 The full review waits until the user has paused, whatever the language
+        await asyncio.sleep(max(0.0, config.LIVE_DEEP_DEBOUNCE_MS / 1000 - quick))
+        result = await self._review(code, language)
+        await self.send({"type": "review", "version": version, **render_result(result)})
+
+    async def _review(self, code: str, language: str) -> dict:
+        if self._running is not None and not self._running.done():
+            # A superseded review is still on the pool: let it finish first
+            await asyncio.wait([asyncio.wrap_future(self._running)])
+        future = self._running = await run_in_threadpool(submit_review, code, language, "basic")
+        try:
+            return await run_in_threadpool(finish_review, code, language, "basic", future)
+        except asyncio.CancelledError:
+            future.cancel()  # still queued: never runs
+            raise
+
+    def close(self):
+        self.cancel()
+        if self._running is not None:
+            self._running.cancel()
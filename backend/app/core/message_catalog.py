@@ -0,0 +1,86 @@
+# app/core/message_catalog.py
+
+from typing import Dict, NamedTuple, Optional
+
+# 📚 Every message the analyzers emit, by stable rule id. Analyzers only
+# produce Findings (rule id + arguments, see app/core/findings.py); the text
+# below is filled in when a result is serialized. A stored finding keeps the
+# id of the exact template it was rendered from, so rewording an entry here
+# never changes how old reviews read.
+
+
+class Rule(NamedTuple):
+    kind: str  # suggestion, warning, optimization or bug
+    severity: str  # default; a Finding may override it
+    template: str
+    tip: Optional[str] = None  # bugs only
+    impact: bool = True  # rendered with a "(<severity> impact)" suffix in reviews
+
+
+CATALOG: Dict[str, Rule] = {
+    # --- suggestions ---
+    "docstring.missing-function": Rule("suggestion", "low", "✅ Add a docstring to function: `{header}`"),
+    "js.no-var": Rule("suggestion", "medium", "✅ Consider using 'let' or 'const' instead of 'var'"),
+    "review.unsupported-language": Rule("suggestion", "high", "❌ Language not supported yet.", impact=False),
+    "style.comment-space": Rule("suggestion", "low", "💡 Consider adding a space after '#' to improve comment readability."),
+    "style.final-newline": Rule("suggestion", "low", "📄 Add a newline at the end of the file to follow POSIX standards."),
+    "style.snake-case": Rule("suggestion", "low", "🔧 Rename '{name}' to snake_case for consistency."),
+    "docstring.missing": Rule("suggestion", "low", "{what} '{name}' is missing a docstring.", impact=False),
+    # --- warnings ---
+    "style.line-too-long": Rule("warning", "medium", "📏 Line too long: Try keeping lines under 79 characters for better readability."),
+    "style.tab-indent": Rule("warning", "medium", "🔧 Replace tab characters with 4 spaces for consistent indentation."),
+    "style.indent-width": Rule("warning", "medium", "⚠️ Use consistent indentation of 4 spaces."),
+    "style.unsupported-language": Rule("warning", "medium", "Style check for {language} not supported yet."),
+    "imports.unused": Rule("warning", "low", "⚠️ Unused import detected: {name}"),
+    "review.partial-parse": Rule("warning", "low", "⚠️ Unable to parse code fully for deep optimization suggestions."),
+    "js.strict-equality": Rule("warning", "medium", "⚠️ Use '{strict}' for strict equality in JavaScript"),
+    "logic.arg-count": Rule("warning", "high", "🤖 Logic flaw: function '{name}' called with {actual} args (expected {expected}).", impact=False),
+    "logic.unknown-keyword": Rule("warning", "high", "🤖 Logic flaw: function '{name}' has no parameter '{keyword}'.", impact=False),
+    "logic.missing-argument": Rule("warning", "high", "🤖 Logic flaw: call to '{name}' is missing argument '{param}'.", impact=False),
+    "logic.unreachable": Rule("warning", "medium", "🤖 Unreachable code detected after `return` in function '{name}'.", impact=False),
+    "logic.unreachable-after-call": Rule("warning", "medium", "🤖 Unreachable code detected after calling '{name}', which never returns.", impact=False),
+    "logic.assign-in-if": Rule("warning", "medium", "🤖 Possible assignment in `if` statement (did you mean '==' instead of '='?).", impact=False),
+    "logic.syntax-error": Rule("warning", "high", "❌ Syntax error in code; unable to analyze logic.", impact=False),
+    "live.syntax-error": Rule("warning", "high", "❌ Syntax error: {message}", impact=False),
+    "review.aborted": Rule("warning", "high", "⛔ Analysis aborted: {reason}. Try submitting a smaller or simpler file.", impact=False),
+    # --- optimizations ---
+    "perf.nested-loops": Rule("optimization", "high", "💡 Nested loops detected — consider optimizing or using vectorized operations"),
+    "perf.loop-invariant": Rule("optimization", "medium", "💡 Repeated computation inside loop — move invariant code outside loop if possible"),
+    "perf.magic-number": Rule("optimization", "low", "💡 Magic number `{value}` found — define as constant or config"),
+    "perf.append-in-loop": Rule("optimization", "medium", "💡 Use list comprehension instead of .append() — improves performance"),
+    "js.console-log": Rule("optimization", "low", "💡 Remove console.{method} statements in production code"),
+    "perf.deep-nesting": Rule("optimization", "high", "⚠️ Deeply nested loops detected. Consider refactoring for better performance.", impact=False),
+    "perf.loop-append": Rule("optimization", "medium", "💡 Consider using list comprehension instead of append inside a loop.", impact=False),
+    "perf.sort-in-loop": Rule("optimization", "medium", "⚠️ Avoid sorting inside loops unless necessary.", impact=False),
+    "perf.list-membership": Rule("optimization", "medium", "💡 Membership test on a list inside a loop scans the list every time — use a set.", impact=False),
+    "perf.string-concat-in-loop": Rule("optimization", "medium", "💡 String built with + inside a loop copies it every time — collect parts and ''.join() them.", impact=False),
+    "perf.complexity": Rule("optimization", "medium", "⏱️ '{name}' is estimated at {complexity} — nested loops over the same data grow fast.", impact=False),
+    "profile.measured": Rule("optimization", "low", "⏱️ Measured '{name}': grows like {growth} (static estimate {estimated}) — {time} per call at n={n}, peak memory {memory}.", impact=False),
+    "profile.too-slow": Rule("optimization", "high", "⏱️ '{name}' didn't finish within {budget} at n={n} — look for exponential or deeply nested work.", impact=False),
+    "perf.syntax-error": Rule("optimization", "high", "❌ Unable to analyze performance due to syntax errors.", impact=False),
+    # --- bugs ---
+    "bug.shadowed-sum": Rule(
+        "bug", "medium", "Avoid using 'sum' as a variable (shadows built-in).",
+        "Using 'sum' as a variable name overrides Python’s built-in sum() function, which can cause unexpected behavior.",
+    ),
+    "bug.unused-pass": Rule(
+        "bug", "low", "Consider removing unused 'pass' statement (possible dead code).",
+        "'pass' can be removed unless you're using it as a placeholder for future code.",
+    ),
+    "js.shadowed-global": Rule(
+        "bug", "medium", "Avoid declaring '{name}' (shadows the global of the same name).",
+        "Code in this scope that expects the built-in gets your variable instead; pick another name.",
+    ),
+    "js.unreachable": Rule(
+        "bug", "medium", "Unreachable code after `{keyword}` (possible dead code).",
+        "Statements after return, throw, break or continue in the same block never run; remove or move them.",
+    ),
+    "js.duplicate-key": Rule(
+        "bug", "high", "Duplicate key '{name}' in object literal.",
+        "Only the last value for a repeated key is kept; the earlier ones are silently overwritten.",
+    ),
+    "bug.syntax-error": Rule(
+        "bug", "high", "Syntax Error in code. Unable to parse.",
+        "Check for typos or indentation issues in your code.",
+    ),
+}
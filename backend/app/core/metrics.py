@@ -0,0 +1,275 @@
+# app/core/metrics.py
+
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# 📈 Minimal Prometheus-style metrics (text exposition format 0.0.4) plus
+# per-request stage timings. Stdlib only; every update is a dict lookup and
+# an add under a lock.
+
+_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_BYTE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+_LINE_BUCKETS = (10, 50, 100, 500, 1000, 5000, 10000, 50000)
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = _TIME_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [count per bucket (non-cumulative, last is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(tuple(str(labels[name]) for name in self.labelnames))
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = 'le="+Inf"' if bound == float("inf") else f'le="{_number(bound)}"'
+                    lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list = []
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        metric = Counter(name, help, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = _TIME_BUCKETS) -> Histogram:
+        metric = Histogram(name, help, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUESTS = registry.counter("http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+REQUEST_SECONDS = registry.histogram("http_request_duration_seconds", "HTTP request latency.", ("method", "route"))
+STAGE_SECONDS = registry.histogram("review_stage_seconds", "Time per review stage, per request (exclusive of nested stages).", ("stage",))
+CACHE_LOOKUPS = registry.counter("cache_lookups_total", "Result cache lookups by cache and outcome (hit, disk_hit, miss).", ("cache", "result"))
+INPUT_BYTES = registry.histogram("review_input_bytes", "Size of submitted code.", ("language",), _BYTE_BUCKETS)
+INPUT_LINES = registry.histogram("review_input_lines", "Line count of submitted code.", ("language",), _LINE_BUCKETS)
+DB_ROWS_WRITTEN = registry.counter("db_rows_written_total", "Review rows inserted by the write-behind queue.")
+DB_FLUSH_SECONDS = registry.histogram("db_flush_seconds", "Time per write-behind batch insert and commit.")
+DB_WRITE_FAILURES = registry.counter("db_write_failures_total", "Failed write-behind batch inserts (the rows stay queued).")
+
+
+class Timings:
+    """
+    Stage times and cache lookups of one request (or one worker job).
+
+    Stages nest: a stage's time excludes the stages run inside it, so the
+    parts add up to at most the wall time and nothing is counted twice.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.lookups: Dict[str, int] = {}  # "cache:result" -> count
+        self._nested: List[float] = []  # time spent in child stages, per open stage
+        self.published = False
+
+    def add(self, stage: str, seconds: float):
+        if self.published:
+            STAGE_SECONDS.observe(seconds, stage=stage)  # e.g. a streamed body, after the headers went out
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def count(self, lookup: str, n: int = 1):
+        if self.published:
+            cache, result = lookup.split(":")
+            CACHE_LOOKUPS.inc(n, cache=cache, result=result)
+        self.lookups[lookup] = self.lookups.get(lookup, 0) + n
+
+    def export(self) -> dict:
+        return {"stages": self.stages, "lookups": self.lookups}
+
+    def publish(self):
+        """Record everything so far into the process-wide metrics (once)."""
+        if self.published:
+            return
+        self.published = True
+        for stage, seconds in self.stages.items():
+            STAGE_SECONDS.observe(seconds, stage=stage)
+        for lookup, n in self.lookups.items():
+            cache, result = lookup.split(":")
+            CACHE_LOOKUPS.inc(n, cache=cache, result=result)
+
+    def server_timing(self, total: Optional[float] = None) -> str:
+        """Server-Timing header value (durations in milliseconds)."""
+        parts = [f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in self.stages.items()]
+        if total is not None:
+            parts.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[Timings]] = ContextVar("review_timings", default=None)
+
+
+@contextmanager
+def collect():
+    """Collect the stage timings of everything run in this context."""
+    timings = Timings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timed(stage: str):
+    """Time the block as `stage` of the current collection (no-op outside one)."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    timings._nested.append(0.0)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        inner = timings._nested.pop()
+        timings.add(stage, max(0.0, elapsed - inner))
+        if timings._nested:
+            timings._nested[-1] += elapsed
+
+
+def stage(name: str) -> Callable:
+    """Decorator form of timed()."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return fn(*args, **kwargs)
+            with timed(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count_lookup(cache: str, result: str):
+    timings = _current.get()
+    if timings is not None:
+        timings.count(f"{cache}:{result}")
+    else:
+        CACHE_LOOKUPS.inc(cache=cache, result=result)
+
+
+def measured(fn, *args) -> Tuple[object, dict]:
+    """
+    fn(*args) plus its exported timings. Runs in analysis workers, whose
+    metrics would otherwise stay in the worker process; merge() the
+    timings back in the parent.
+    """
+    with collect() as timings:
+        with timed("analysis"):
+            result = fn(*args)
+    return result, timings.export()
+
+
+def merge(exported: Optional[dict], waited: float = 0.0):
+    """
+    Add a measured() job's timings to the current collection. Wall time
+    spent waiting on the job beyond its own stages is recorded as "queue"
+    (pool queueing and transfer between processes).
+    """
+    timings = _current.get()
+    if timings is None:
+        timings = Timings()
+        timings.published = True  # nobody to hand it to: record directly
+    busy = 0.0
+    for name, seconds in (exported or {}).get("stages", {}).items():
+        timings.add(name, seconds)
+        busy += seconds
+    for lookup, n in (exported or {}).get("lookups", {}).items():
+        timings.count(lookup, n)
+    if exported is not None and waited > busy:
+        timings.add("queue", waited - busy)
+    if timings._nested:
+        timings._nested[-1] += waited
+
+
+# The language is request text: anything unknown shares one series
+INPUT_LANGUAGES = ("python", "javascript")
+
+
+def observe_input(code: str, language: str):
+    language = language.lower()
+    if language not in INPUT_LANGUAGES:
+        language = "other"
+    INPUT_BYTES.observe(len(code.encode("utf-8", "surrogatepass")), language=language)
+    INPUT_LINES.observe(code.count("\n") + 1, language=language)
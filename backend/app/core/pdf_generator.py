@@ -1,8 +1,12 @@
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 import os
-import time
-from typing import List
+import uuid
+from typing import List, Optional
+
+from app.core.config import REPORT_DIR
+from app.core.report_store import report_filename
+
 
 def generate_review_pdf(
     code: str,
@@ -12,14 +16,18 @@ def generate_review_pdf(
     optimizations: List[str],
     bugs: List[str],
     score: int,
-    remark: str
+    remark: str,
+    filename: Optional[str] = None
 ) -> str:
-    # ✅ Generate unique filename using timestamp
-    timestamp = int(time.time())
-    filename = f"code_review_report_{timestamp}.pdf"
-    filepath = os.path.join("app", "static", filename)
+    # ✅ Generate collision-free filename (timestamps clash within a second)
+    if filename is None:
+        filename = report_filename(uuid.uuid4().hex)
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    filepath = os.path.join(REPORT_DIR, filename)
+    # Render to a temporary name so a download never sees a half-written file
+    partial_path = f"{filepath}.{uuid.uuid4().hex}.part"
 
-    c = canvas.Canvas(filepath, pagesize=letter)
+    c = canvas.Canvas(partial_path, pagesize=letter)
     width, height = letter
 
     c.setFont("Helvetica-Bold", 16)
@@ -40,6 +48,8 @@ def generate_review_pdf(
         y -= 20
         c.setFont("Helvetica", 12)
         for item in items:
+            if isinstance(item, dict):  # bug entries carry severity + message
+                item = f"[{item.get('severity', '')}] {item.get('message', '')}"
             c.drawString(60, y, f"- {item}")
             y -= 20
             if y < 50:
@@ -64,4 +74,5 @@ def generate_review_pdf(
             y = height - 50
 
     c.save()
+    os.replace(partial_path, filepath)
     return filename  # ✅ Return unique filename
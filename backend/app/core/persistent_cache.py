@@ -0,0 +1,155 @@
+# app/core/persistent_cache.py
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Touching last_access on every read would turn reads into writes; once a
+# minute is plenty for LRU ordering.
+_TOUCH_INTERVAL = 60.0
+# Size-based eviction is checked every N writes rather than on each one.
+_EVICT_EVERY = 32
+
+
+class PersistentCache:
+    """
+    Content-addressed result store in a local SQLite file.
+
+    Every uvicorn worker opens the same file, so a result computed by one
+    worker (or before a restart) is reused by all of them. Rows written by
+    a different analyzer version are dropped on open, and the least
+    recently used rows are evicted once the store exceeds `max_bytes`.
+    Any SQLite error is logged and treated as a cache miss.
+    """
+
+    def __init__(self, path: str, analyzer_version: str, max_bytes: int):
+        self.path = path
+        self.analyzer_version = analyzer_version
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            conn = self._conn()
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    key TEXT PRIMARY KEY,
+                    analyzer_version TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_analysis_cache_last_access "
+                "ON analysis_cache (last_access)"
+            )
+            # 🧹 Rules changed since these rows were written: they are stale
+            conn.execute(
+                "DELETE FROM analysis_cache WHERE analyzer_version != ?",
+                (analyzer_version,),
+            )
+            conn.commit()
+        except sqlite3.Error:
+            logger.exception("Could not initialize analysis cache at %s", path)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        # A forked child must never reuse its parent's connection
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT value, last_access FROM analysis_cache WHERE key = ? AND analyzer_version = ?",
+                (key, self.analyzer_version),
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[1] > _TOUCH_INTERVAL:
+                conn.execute("UPDATE analysis_cache SET last_access = ? WHERE key = ?", (now, key))
+                conn.commit()
+            return bytes(row[0])
+        except sqlite3.Error:
+            logger.exception("Analysis cache read failed")
+            return None
+
+    def put(self, key: str, blob: bytes) -> None:
+        self.put_many([(key, blob)])
+
+    def put_many(self, items: List[Tuple[str, bytes]]) -> None:
+        """Write several entries in one transaction."""
+        now = time.time()
+        rows = [
+            (key, self.analyzer_version, blob, len(blob), now)
+            for key, blob in items
+            if len(blob) <= self.max_bytes
+        ]
+        if not rows:
+            return
+        try:
+            conn = self._conn()
+            conn.executemany(
+                "INSERT OR REPLACE INTO analysis_cache (key, analyzer_version, value, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.commit()
+        except sqlite3.Error:
+            logger.exception("Analysis cache write failed")
+            return
+
+        with self._lock:
+            before = self._writes // _EVICT_EVERY
+            self._writes += len(rows)
+            due = self._writes // _EVICT_EVERY != before
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently used rows until the store fits `max_bytes`."""
+        try:
+            conn = self._conn()
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM analysis_cache").fetchone()[0]
+            excess = total - self.max_bytes
+            if excess <= 0:
+                return 0
+            doomed = []
+            for key, size in conn.execute("SELECT key, size FROM analysis_cache ORDER BY last_access"):
+                doomed.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            conn.executemany("DELETE FROM analysis_cache WHERE key = ?", doomed)
+            conn.commit()
+            return len(doomed)
+        except sqlite3.Error:
+            logger.exception("Analysis cache eviction failed")
+            return 0
+
+    def clear(self) -> None:
+        try:
+            conn = self._conn()
+            conn.execute("DELETE FROM analysis_cache")
+            conn.commit()
+        except sqlite3.Error:
+            logger.exception("Analysis cache clear failed")
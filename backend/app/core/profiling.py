@@ -0,0 +1,174 @@
+# app/core/profiling.py
+
+import cProfile
+import hmac
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Mapping, Optional
+
+from app.core import config
+
+logger = logging.getLogger(__name__)
+
+# 🔬 Opt-in profiling of single requests. "cprofile" records a full
+# deterministic profile (pstats) plus stack samples; "sample" only takes
+# stack samples, which costs far less and still gives a flamegraph.
+MODES = ("cprofile", "sample")
+FORMATS = ("pstats", "collapsed")
+
+_ID = re.compile(r"^[0-9a-f]{32}$")
+_store_lock = threading.Lock()
+_active: ContextVar[bool] = ContextVar("profiling_active", default=False)
+
+
+def admin_token_ok(token: Optional[str]) -> bool:
+    """True if `token` is the configured ADMIN_TOKEN (never when none is configured)."""
+    if not config.ADMIN_TOKEN or token is None:
+        return False
+    return hmac.compare_digest(token.encode("utf-8", "surrogateescape"), config.ADMIN_TOKEN.encode("utf-8"))
+
+
+def requested_mode(headers: Mapping[str, str], query: Mapping[str, str]) -> Optional[str]:
+    """
+    Mode asked for via X-Profile or ?profile= (None when absent, off, or
+    profiling is disabled). Only honoured with the admin token in
+    X-Admin-Token: a profiled request runs inline, uncached and uncapped.
+    """
+    if not config.PROFILING_ENABLED or not admin_token_ok(headers.get("x-admin-token")):
+        return None
+    value = (headers.get("x-profile") or query.get("profile") or "").strip().lower()
+    if value in ("", "0", "false", "off"):
+        return None
+    return value if value in MODES else "cprofile"
+
+
+def active() -> bool:
+    """True inside a profiled block; analysis then runs in-thread so the profiler sees it."""
+    return _active.get()
+
+
+class _Sampler(threading.Thread):
+    """Samples one thread's Python stack every `interval` seconds into collapsed-stack counts."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+@contextmanager
+def profile(mode: Optional[str], label: str) -> Iterator[Optional[dict]]:
+    """
+    Run the block under the profiler for `mode` and store the result.
+    Yields the profile's metadata (its "id" is known up front), or None
+    when `mode` is None and nothing is profiled.
+    """
+    if mode is None:
+        yield None
+        return
+
+    info = {"id": uuid.uuid4().hex, "label": label, "mode": mode}
+    sampler = _Sampler(threading.get_ident(), config.PROFILE_SAMPLE_INTERVAL_MS / 1000)
+    profiler = cProfile.Profile() if mode == "cprofile" else None
+    token = _active.set(True)
+    started = time.perf_counter()
+    sampler.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield info
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        sampler.stop()
+        _active.reset(token)
+        info["seconds"] = round(time.perf_counter() - started, 6)
+        info["created"] = time.time()
+        info["samples"] = sum(sampler.stacks.values())
+        info["formats"] = ["pstats", "collapsed"] if profiler is not None else ["collapsed"]
+        try:
+            _save(info, profiler, sampler.stacks)
+        except OSError:
+            logger.exception("Could not store profile %s", info["id"])
+
+
+def _path(profile_id: str, ext: str) -> str:
+    return os.path.join(config.PROFILE_DIR, f"{profile_id}.{ext}")
+
+
+def _save(info: dict, profiler: Optional[cProfile.Profile], stacks: Dict[str, int]):
+    os.makedirs(config.PROFILE_DIR, exist_ok=True)
+    with _store_lock:
+        if profiler is not None:
+            profiler.dump_stats(_path(info["id"], "pstats"))
+        with open(_path(info["id"], "collapsed"), "w", encoding="utf-8") as f:
+            for stack, count in sorted(stacks.items()):
+                f.write(f"{stack} {count}\n")
+        # Metadata goes last: a profile is only listed once it is complete
+        with open(_path(info["id"], "json"), "w", encoding="utf-8") as f:
+            json.dump(info, f)
+        _enforce_limit()
+
+
+def _enforce_limit():
+    """Drop the oldest profiles beyond PROFILE_MAX_ENTRIES."""
+    entries = sorted(list_profiles(), key=lambda p: p["created"], reverse=True)
+    for old in entries[max(0, config.PROFILE_MAX_ENTRIES):]:
+        for ext in ("json",) + FORMATS:
+            try:
+                os.remove(_path(old["id"], ext))
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles() -> List[dict]:
+    """Metadata of every stored profile, newest first."""
+    profiles = []
+    try:
+        names = os.listdir(config.PROFILE_DIR)
+    except FileNotFoundError:
+        return []
+    for name in names:
+        profile_id, _, ext = name.partition(".")
+        if ext != "json" or not _ID.match(profile_id):
+            continue
+        try:
+            with open(_path(profile_id, "json"), encoding="utf-8") as f:
+                profiles.append(json.load(f))
+        except (OSError, ValueError):
+            continue  # removed or half-written meanwhile
+    return sorted(profiles, key=lambda p: p["created"], reverse=True)
+
+
+def profile_path(profile_id: str, fmt: str) -> Optional[str]:
+    """Path of a stored profile in `fmt` ("pstats" or "collapsed"), or None."""
+    if fmt not in FORMATS or not _ID.match(profile_id):
+        return None
+    path = _path(profile_id, fmt)
+    return path if os.path.exists(path) else None
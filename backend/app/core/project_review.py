@@ -0,0 +1,233 @@
+# app/core/project_review.py
+
+import os
+import tarfile
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import IO, Iterable, Iterator, NamedTuple, Optional
+
+from app.core import config, workers
+from app.core.findings import aggregate, render_all, render_result
+from app.core.review_engine import score_remark
+from app.core.review_pipeline import finish_review, submit_review
+from app.core.symbol_index import SymbolIndex
+
+# 📂 File extensions routed to analyze_code
+LANGUAGES = {
+    ".py": "python",
+    ".js": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    ".jsx": "javascript",
+}
+
+# Directories never worth reviewing in a project tree
+SKIPPED_DIRS = {".git", ".hg", ".svn", "__pycache__", "node_modules", ".venv", "venv", ".tox", "dist", "build"}
+
+
+class SourceFile(NamedTuple):
+    path: str
+    language: str
+    code: Optional[str] = None
+    error: Optional[str] = None
+
+
+def language_for(path: str) -> Optional[str]:
+    return LANGUAGES.get(os.path.splitext(path)[1].lower())
+
+
+def _skipped(path: str) -> bool:
+    parts = path.replace("\\", "/").split("/")
+    return any(part in SKIPPED_DIRS for part in parts[:-1])
+
+
+def _decode(path: str, language: str, data: bytes) -> SourceFile:
+    if len(data) > config.PROJECT_MAX_FILE_BYTES:
+        return SourceFile(path, language, error=f"Skipped: larger than {config.PROJECT_MAX_FILE_BYTES} bytes")
+    try:
+        return SourceFile(path, language, code=data.decode("utf-8"))
+    except UnicodeDecodeError:
+        return SourceFile(path, language, error="Skipped: not valid UTF-8")
+
+
+def is_supported_archive(fileobj: IO[bytes]) -> bool:
+    """Sniff zip / gzip / bzip2 / xz / plain tar magic bytes."""
+    fileobj.seek(0)
+    head = fileobj.read(262)
+    fileobj.seek(0)
+    return (
+        head.startswith((b"PK\x03\x04", b"PK\x05\x06", b"\x1f\x8b", b"BZh", b"\xfd7zXZ\x00"))
+        or head[257:262] == b"ustar"
+    )
+
+
+def iter_archive_sources(fileobj: IO[bytes]) -> Iterator[SourceFile]:
+    """
+    Yield source files from a zip or tar(.gz/.bz2/.xz) archive one member
+    at a time; nothing is extracted to disk and only the current member is
+    held in memory.
+    """
+    if zipfile.is_zipfile(fileobj):
+        fileobj.seek(0)
+        with zipfile.ZipFile(fileobj) as archive:
+            for info in archive.infolist():
+                language = language_for(info.filename)
+                if info.is_dir() or language is None or _skipped(info.filename):
+                    continue
+                if info.file_size > config.PROJECT_MAX_FILE_BYTES:
+                    yield SourceFile(info.filename, language, error=f"Skipped: larger than {config.PROJECT_MAX_FILE_BYTES} bytes")
+                    continue
+                with archive.open(info) as member:
+                    # read one byte past the limit so lying headers are caught too
+                    yield _decode(info.filename, language, member.read(config.PROJECT_MAX_FILE_BYTES + 1))
+        return
+
+    fileobj.seek(0)
+    try:
+        # "r|*" streams through the archive sequentially (no seeking)
+        with tarfile.open(fileobj=fileobj, mode="r|*") as archive:
+            for member in archive:
+                language = language_for(member.name)
+                if not member.isfile() or language is None or _skipped(member.name):
+                    continue
+                if member.size > config.PROJECT_MAX_FILE_BYTES:
+                    yield SourceFile(member.name, language, error=f"Skipped: larger than {config.PROJECT_MAX_FILE_BYTES} bytes")
+                    continue
+                yield _decode(member.name, language, archive.extractfile(member).read())
+    except tarfile.TarError as exc:
+        raise ValueError(f"Unsupported or corrupt archive: {exc}") from exc
+
+
+def iter_directory_sources(root: str) -> Iterator[SourceFile]:
+    """Yield source files below `root`, skipping VCS, cache and dependency dirs."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIPPED_DIRS)
+        for name in sorted(filenames):
+            language = language_for(name)
+            if language is None:
+                continue
+            path = os.path.join(dirpath, name)
+            rel_path = os.path.relpath(path, root).replace(os.sep, "/")
+            try:
+                with open(path, "rb") as f:
+                    data = f.read(config.PROJECT_MAX_FILE_BYTES + 1)
+            except OSError as exc:
+                yield SourceFile(rel_path, language, error=f"Skipped: {exc.strerror}")
+                continue
+            yield _decode(rel_path, language, data)
+
+
+def review_sources(sources: Iterable[SourceFile], project: Optional[str] = None) -> Iterator[dict]:
+    """
+    Review every source on the worker pool and yield one event per file as
+    soon as it finishes, then one "cross-file" event per Python file with
+    calls that don't fit what another file defines, then a final project
+    summary.
+
+    Only a bounded number of files is in flight at once, so a huge archive
+    is never fully buffered while the pool catches up. Python files also go
+    into the project's symbol index (kept between reviews when `project`
+    names the project), which only re-parses files that changed.
+    """
+    in_flight_limit = max(2, 2 * workers.pool_size())
+    pending = {}
+    sources = iter(sources)
+    exhausted = False
+    complete = True  # every file of the project was seen
+    index = SymbolIndex(project)
+
+    files = 0
+    skipped = 0
+    weighted_score = 0
+    total_lines = 0
+    languages = {}
+
+    try:
+        while True:
+            while not exhausted and len(pending) < in_flight_limit:
+                try:
+                    source = next(sources, None)
+                except (ValueError, OSError, zipfile.BadZipFile) as exc:
+                    exhausted = True
+                    complete = False
+                    yield {"type": "error", "error": str(exc)}
+                    break
+                if source is None:
+                    exhausted = True
+                    break
+                if len(pending) + files + skipped >= config.PROJECT_MAX_FILES:
+                    exhausted = True
+                    complete = False
+                    yield {"type": "error", "error": f"Stopped after {config.PROJECT_MAX_FILES} files"}
+                    break
+                if source.error:
+                    skipped += 1
+                    yield {"type": "file", "path": source.path, "language": source.language, "error": source.error}
+                    continue
+                future = submit_review(source.code, source.language, "basic")
+                pending[future] = (source, source.code.count("\n") + 1)
+                if source.language == "python":
+                    index.update(source.path, source.code)
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, timeout=config.ANALYSIS_TIMEOUT_SECONDS, return_when=FIRST_COMPLETED)
+            if not done:
+                # Nothing finished within a full time limit: collect the oldest
+                # job, which aborts (and replaces the pool) if it is stuck
+                done = [next(iter(pending))]
+            for future in done:
+                source, lines = pending.pop(future)
+                try:
+                    result = finish_review(source.code, source.language, "basic", future)
+                except Exception as exc:
+                    skipped += 1
+                    yield {"type": "file", "path": source.path, "language": source.language, "error": f"Analysis failed: {exc}"}
+                    continue
+
+                files += 1
+                weighted_score += result["score"] * lines
+                total_lines += lines
+                stats = languages.setdefault(source.language, {"files": 0, "lines": 0, "score_sum": 0})
+                stats["files"] += 1
+                stats["lines"] += lines
+                stats["score_sum"] += result["score"]
+                yield {"type": "file", "path": source.path, "language": source.language, "lines": lines, **render_result(result)}
+    finally:
+        # Client went away mid-stream: drop work that hasn't started yet
+        for future in pending:
+            future.cancel()
+        if pending:
+            complete = False
+        index.save(complete)
+
+    # 🗂️ Calls into other files, checked against the whole project's index
+    cross_file = index.check()
+    for path in sorted(cross_file):
+        yield {"type": "cross-file", "path": path, "language": "python", "warnings": render_all(aggregate(cross_file[path]))}
+
+    # 📊 Project score: per-file scores weighted by file length
+    score = round(weighted_score / total_lines) if total_lines else 0
+    yield {
+        "type": "project",
+        "files": files,
+        "skipped": skipped,
+        "lines": total_lines,
+        "score": score,
+        "remark": score_remark(score) if files else "No reviewable files",
+        "languages": {
+            language: {
+                "files": stats["files"],
+                "lines": stats["lines"],
+                "average_score": round(stats["score_sum"] / stats["files"]),
+            }
+            for language, stats in languages.items()
+        },
+        "symbols": {
+            "files": len(index.files),
+            "indexed": index.indexed,
+            "reused": index.reused,
+            "cross_file_issues": sum(len(findings) for findings in cross_file.values()),
+        },
+    }
@@ -0,0 +1,135 @@
+# app/core/report_store.py
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List
+
+from app.core import config, metrics
+from app.core.config import REPORT_DIR
+
+logger = logging.getLogger(__name__)
+
+# 🔖 Bump when the PDF layout changes so old renders are not reused
+REPORT_LAYOUT_VERSION = "1"
+
+# Only content-addressed renders are ever evicted (never favicon.ico or
+# reports written by older releases).
+_RENDERED = re.compile(r"^code_review_report_[0-9a-f]{64}\.pdf$")
+
+_executor = ThreadPoolExecutor(max_workers=config.REPORT_WORKERS, thread_name_prefix="pdf-report")
+_in_flight: Dict[str, Future] = {}
+_in_flight_lock = threading.Lock()
+
+
+def report_filename(report_id: str) -> str:
+    return f"code_review_report_{report_id}.pdf"
+
+
+def report_digest(report: dict) -> str:
+    """sha256 over everything that ends up in the PDF; doubles as the ETag."""
+    payload = json.dumps(
+        [REPORT_LAYOUT_VERSION, report],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def report_fields(review) -> dict:
+    """generate_review_pdf keyword arguments rebuilt from a CodeReview row."""
+    def split(text):
+        return text.split("\n") if text else []
+
+    return {
+        "code": review.code,
+        "language": review.language,
+        "suggestions": split(review.suggestions),
+        "warnings": split(review.warnings),
+        "optimizations": split(review.optimizations),
+        "bugs": json.loads(review.bugs) if review.bugs else [],
+        "score": review.score,
+        "remark": review.remark,
+    }
+
+
+def _render(digest: str, report: dict) -> str:
+    # 🐢 ReportLab is only loaded once a report actually has to be drawn
+    from app.core.pdf_generator import generate_review_pdf
+
+    filename = generate_review_pdf(filename=report_filename(digest), **report)
+    enforce_budget(keep=filename)
+    return filename
+
+
+def get_report(digest: str, report: dict) -> str:
+    """
+    Path of the rendered PDF for `report`, rendering it on first use.
+
+    Renders run on a bounded pool, and concurrent requests for the same
+    report wait on a single render instead of starting their own.
+    """
+    path = os.path.join(REPORT_DIR, report_filename(digest))
+    if os.path.exists(path):
+        try:
+            os.utime(path)  # mark as recently used for LRU eviction
+        except OSError:
+            pass  # evicted between the check and the touch: render below
+        else:
+            metrics.count_lookup("report", "hit")
+            return path
+    metrics.count_lookup("report", "miss")
+
+    with _in_flight_lock:
+        future = _in_flight.get(digest)
+        owner = future is None
+        if owner:
+            future = _executor.submit(_render, digest, report)
+            _in_flight[digest] = future
+    try:
+        with metrics.timed("pdf"):
+            future.result()
+    finally:
+        if owner:
+            with _in_flight_lock:
+                _in_flight.pop(digest, None)
+    return path
+
+
+def enforce_budget(max_bytes: int = None, keep: str = None) -> List[str]:
+    """Delete least recently used renders (except `keep`) until the directory fits the budget."""
+    budget = config.REPORT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    entries = []
+    total = 0
+    try:
+        with os.scandir(REPORT_DIR) as it:
+            for entry in it:
+                if _RENDERED.match(entry.name):
+                    stat = entry.stat()
+                    total += stat.st_size
+                    if entry.name != keep:
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        logger.exception("Could not scan report directory")
+        return []
+
+    removed = []
+    for _, size, path in sorted(entries):
+        if total <= budget:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue  # another worker got there first
+        total -= size
+        removed.append(path)
+    return removed
+
+
+def shutdown(wait: bool = True):
+    """Let in-progress renders finish (or not) and stop the pool."""
+    _executor.shutdown(wait=wait)
@@ -0,0 +1,161 @@
+# app/core/result_cache.py
+
+import hashlib
+import importlib.util
+import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from app.core import config
+from app.core.findings import from_json, to_json
+from app.core.metrics import count_lookup
+from app.core.persistent_cache import PersistentCache
+
+# 🔖 Bump whenever analyzer rules or message formats change so cached
+# results from older rule sets are never served.
+RULESET_VERSION = "2"
+
+# Modules whose source determines analysis output; editing any of them
+# changes analyzer_version() and so invalidates every cached result.
+ANALYZER_MODULES = (
+    "app.core.analysis_context",
+    "app.core.findings",
+    "app.core.message_catalog",
+    "app.core.review_engine",
+    "app.utils.style_checker",
+    "app.utils.bug_detector",
+    "app.utils.gpt_logic_checker",
+    "app.utils.performance_profiler",
+    "app.core.incremental",
+    "app.utils.source_scanner",
+    "app.utils.js_lexer",
+    "app.utils.js_analyzer",
+    "app.core.sandbox",
+    "app.core.sandbox_harness",
+)
+
+
+@lru_cache(maxsize=None)
+def analyzer_version() -> str:
+    """RULESET_VERSION plus a fingerprint of the analyzer sources."""
+    digest = hashlib.sha256(RULESET_VERSION.encode())
+    for name in ANALYZER_MODULES:
+        spec = importlib.util.find_spec(name)
+        if spec is not None and spec.origin:
+            with open(spec.origin, "rb") as f:
+                digest.update(f.read())
+    return f"{RULESET_VERSION}-{digest.hexdigest()[:12]}"
+
+
+def cache_key(code: str, language: str, review_type: str = "basic", kind: str = "review") -> str:
+    """Content-addressed key: sha256 of the source plus everything that changes the result."""
+    digest = hashlib.sha256(code.encode("utf-8", "surrogatepass")).hexdigest()
+    return f"{kind}:{digest}:{language.lower()}:{review_type}:{analyzer_version()}"
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache for JSON-serializable analysis results (Findings
+    included, see app/core/findings.py).
+
+    Values are stored serialized, which keeps the byte budget exact and
+    hands every caller a fresh copy it is free to mutate. An optional
+    `backing` store is consulted on a memory miss and written through on
+    every put, so results survive restarts and are shared across workers.
+    """
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None, backing: Optional[PersistentCache] = None,
+                 name: str = "result"):
+        self.name = name  # label for the cache lookup metrics
+        self.max_entries = config.RESULT_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.max_bytes = config.RESULT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.backing = backing
+        self.bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if blob is not None:
+            count_lookup(self.name, "hit")
+        elif self.backing is not None:
+            blob = self.backing.get(key)
+            if blob is not None:
+                self._remember(key, blob)
+                with self._lock:
+                    self.disk_hits += 1
+                count_lookup(self.name, "disk_hit")
+        if blob is None:
+            with self._lock:
+                self.misses += 1
+            count_lookup(self.name, "miss")
+            return None
+        return json.loads(blob, object_hook=from_json)
+
+    def put(self, key: str, value: Any) -> None:
+        self.put_many({key: value})
+
+    def put_many(self, values: Dict[str, Any]) -> None:
+        """put() for several entries, written to the backing store in one transaction."""
+        blobs = [(key, json.dumps(value, ensure_ascii=False, default=to_json).encode("utf-8")) for key, value in values.items()]
+        for key, blob in blobs:
+            self._remember(key, blob)
+        if self.backing is not None:
+            self.backing.put_many(blobs)
+
+    def _remember(self, key: str, blob: bytes) -> None:
+        if len(blob) > self.max_bytes or self.max_entries <= 0:
+            return  # would evict everything else; not worth caching
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= len(old)
+            self._entries[key] = blob
+            self.bytes += len(blob)
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# 🧠 Shared cache for analyze_code results and complete /review responses,
+# backed by the on-disk store all workers share
+review_cache = ResultCache(
+    name="review",
+    backing=PersistentCache(
+        config.ANALYSIS_CACHE_PATH,
+        analyzer_version(),
+        config.ANALYSIS_CACHE_MAX_BYTES,
+    ) if config.ANALYSIS_CACHE_PATH else None
+)
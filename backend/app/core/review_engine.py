@@ -1,105 +1,166 @@
-import re
 import ast
-from typing import List, Dict, Union
+from typing import List, Dict, Tuple, Union
+
+from app.core.analysis_context import AnalysisContext, registry
+from app.core.findings import WEIGHTS, Finding, aggregate, occurrences
+from app.core.metrics import stage
+from app.core.result_cache import cache_key, review_cache
+from app.utils.style_checker import style_findings
+from app.utils.bug_detector import bug_findings
+from app.utils.js_analyzer import javascript_facts
+from app.utils.source_scanner import scan_source
+
+
+@registry.initializer("review_engine")
+def _init(state):
+    state.magic_number = None
+
+
+# ✅ Nested loops
+@registry.rule("review_engine", ast.For)
+def _loop_rules(node, ancestors, state):
+    for inner in ast.iter_child_nodes(node):
+        if isinstance(inner, ast.For):
+            state.findings.append(Finding("perf.nested-loops", line=inner.lineno, end_line=inner.end_lineno))
+
+    # ✅ Repeated computations inside loops
+    for stmt in node.body:
+        if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.BinOp):
+            state.findings.append(Finding("perf.loop-invariant", line=stmt.lineno))
+            break
+
+
+# ✅ Magic numbers (only the first one is reported). Kept with its position
+# among the findings so regions analyzed separately can still agree on
+# which one is first.
+@registry.rule("review_engine", ast.Constant)
+def _magic_number(node, ancestors, state):
+    if state.magic_number is not None:
+        return
+    if isinstance(node.value, (int, float)) and node.value not in (0, 1):
+        state.magic_number = [len(state.findings), Finding("perf.magic-number", {"value": str(node.value)}, node.lineno)]
+
+
+def python_facts(code: Union[str, AnalysisContext]) -> dict:
+    """
+    Everything analyze_python_code() needs from one piece of source. Checks
+    that look across the whole file (unused imports, the first magic number)
+    keep their raw inputs here and are decided in python_findings().
+    """
+    ctx = AnalysisContext.of(code)
+    return {**python_text_facts(ctx), **python_tree_facts(ctx)}
+
+
+@stage("review")
+def python_text_facts(ctx: AnalysisContext) -> dict:
+    """The python_facts() read straight off the source text."""
+    scan = scan_source(ctx)
+    return {
+        "imports": scan["imports"],  # [reported name, name it binds]
+        "used_names": sorted(scan["used_names"]),
+        "list_comprehension": scan["list_comprehension"],
+        "docstrings": scan["docstrings"],
+    }
 
-from app.utils.formatter import format_issues
-from app.utils.style_checker import check_code_style
-from app.utils.bug_detector import detect_bugs
+
+@stage("review")
+def python_tree_facts(ctx: AnalysisContext) -> dict:
+    """The python_facts() that come from the AST (and so don't depend on layout)."""
+    state = ctx.rules("review_engine")
+    return {
+        "parsed": state is not None,
+        "optimizations": list(state.findings) if state is not None else [],
+        "magic_number": state.magic_number if state is not None else None,
+    }
 
 
-def analyze_python_code(code: str) -> Dict[str, List[str]]:
+@stage("review")
+def python_findings(code: str, regions: List[dict]) -> Tuple[List[Finding], List[Finding], List[Finding]]:
+    """Suggestions, warnings and optimizations for `code` from the python_facts() of its regions, in source order."""
     suggestions = []
     warnings = []
     optimizations = []
 
     # --- Unused imports ---
-    if "import " in code:
-        lines = code.split("\n")
-        used_names = set()
-        imports = {}
-        for line in lines:
-            if line.strip().startswith("import ") or line.strip().startswith("from "):
-                import_name = line.split()[1]
-                imports[import_name] = line
-            else:
-                for word in line.split():
-                    used_names.add(word)
-        for imp in list(imports.keys()):
-            if imp not in used_names:
-                warnings.append(f"⚠️ Unused import detected: {imp} (low impact)")
-
-    # --- List comprehension suggestion ---
-    if re.search(r"for\s+\w+\s+in\s+\w+:\s+\n+\s+\w+\.append\(", code):
-        optimizations.append("💡 Use list comprehension instead of .append() — improves performance (medium impact)")
-
-    # --- Missing docstrings ---
-    functions = re.findall(r"def\s+\w+\(.*\):", code)
-    for fn in functions:
-        fn_line_index = code.splitlines().index(fn)
-        if fn_line_index + 1 < len(code.splitlines()):
-            if not code.splitlines()[fn_line_index + 1].strip().startswith('"""'):
-                suggestions.append(f"✅ Add a docstring to function: `{fn.strip()}` (low impact)")
+    used_names = set()
+    imports = {}
+    for facts in regions:
+        used_names.update(facts["used_names"])
+        for reported, bound in facts["imports"]:
+            imports.setdefault(reported, bound)
+    for imp, bound in imports.items():
+        if bound not in used_names:
+            warnings.append(Finding("imports.unused", {"name": imp}))
+
+    if any(facts["list_comprehension"] for facts in regions):
+        optimizations.append(Finding("perf.append-in-loop"))
+
+    for facts in regions:
+        suggestions += facts["docstrings"]
 
     # --- AST-based performance issues ---
-    try:
-        tree = ast.parse(code)
-        for node in ast.walk(tree):
-            # ✅ Nested loops
-            if isinstance(node, ast.For):
-                for inner in ast.iter_child_nodes(node):
-                    if isinstance(inner, ast.For):
-                        optimizations.append(
-                            "💡 Nested loops detected — consider optimizing or using vectorized operations (high impact)"
-                        )
-
-            # ✅ Repeated computations inside loops
-            if isinstance(node, ast.For):
-                for stmt in node.body:
-                    if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.BinOp):
-                        optimizations.append(
-                            "💡 Repeated computation inside loop — move invariant code outside loop if possible (medium impact)"
-                        )
-                        break
-
-            # ✅ Magic numbers
-            if isinstance(node, ast.Constant):
-                if isinstance(node.value, (int, float)) and node.value not in (0, 1):
-                    optimizations.append(
-                        f"💡 Magic number `{node.value}` found — define as constant or config (low impact)"
-                    )
-                    break
-
-    except Exception:
-        warnings.append("⚠️ Unable to parse code fully for deep optimization suggestions. (low impact)")
+    if not all(facts["parsed"] for facts in regions):
+        warnings.append(Finding("review.partial-parse"))
+    else:
+        found = []
+        magic_number = None
+        for facts in regions:
+            if magic_number is None and facts["magic_number"] is not None:
+                position, finding = facts["magic_number"]
+                magic_number = (len(found) + position, finding)
+            found += facts["optimizations"]
+        if magic_number is not None:
+            found.insert(*magic_number)
+        optimizations.extend(found)
 
     return suggestions, warnings, optimizations
 
 
-def analyze_javascript_code(code: str) -> Dict[str, List[str]]:
-    suggestions = []
-    warnings = []
-    optimizations = []
+def analyze_python_code(code: Union[str, AnalysisContext]) -> Tuple[List[Finding], List[Finding], List[Finding]]:
+    ctx = AnalysisContext.of(code)
+    return python_findings(ctx.code, [python_facts(ctx)])
 
-    if "var " in code:
-        suggestions.append("✅ Consider using 'let' or 'const' instead of 'var' (medium impact)")
-    if re.search(r"==[^=]", code):
-        warnings.append("⚠️ Use '===' for strict equality in JavaScript (medium impact)")
-    if "console.log(" in code:
-        optimizations.append("💡 Remove console.log statements in production code (low impact)")
 
-    return suggestions, warnings, optimizations
+@stage("review")
+def analyze_javascript_code(code: Union[str, AnalysisContext]) -> Tuple[List[Finding], List[Finding], List[Finding]]:
+    # 🟨 From the one token pass shared with the JS style and bug checks
+    facts = javascript_facts(code)
+    return facts["suggestions"], facts["warnings"], facts["optimizations"]
+
+
+def score_remark(score: int) -> str:
+    return (
+        "Excellent" if score >= 90 else
+        "Good" if score >= 75 else
+        "Average" if score >= 60 else
+        "Needs Improvement"
+    )
+
+
+def analyze_code(language: str, code: Union[str, AnalysisContext]) -> Dict[str, Union[List[Finding], int, str]]:
+    ctx = AnalysisContext.of(code, language)
+
+    # ♻️ Identical source + language was analyzed before: skip the work
+    key = cache_key(ctx.code, language, kind="analysis")
+    cached = review_cache.get(key)
+    if cached is not None:
+        return cached
 
+    result = _analyze_code(language, ctx)
+    review_cache.put(key, result)
+    return result
 
-def analyze_code(language: str, code: str) -> Dict[str, Union[List[str], int, str]]:
+
+def _analyze_code(language: str, ctx: AnalysisContext) -> Dict[str, Union[List[Finding], int, str]]:
     if language.lower() == "python":
-        suggestions, warnings, optimizations = analyze_python_code(code)
-        bugs = detect_bugs(code)
+        suggestions, warnings, optimizations = analyze_python_code(ctx)
+        bugs = bug_findings(ctx)
     elif language.lower() == "javascript":
-        suggestions, warnings, optimizations = analyze_javascript_code(code)
-        bugs = []  # JS bug detection not implemented
+        suggestions, warnings, optimizations = analyze_javascript_code(ctx)
+        bugs = javascript_facts(ctx)["bugs"]
     else:
         return {
-            "suggestions": ["❌ Language not supported yet."],
+            "suggestions": [Finding("review.unsupported-language")],
             "warnings": [],
             "optimizations": [],
             "bugs": [],
@@ -107,39 +168,27 @@ def analyze_code(language: str, code: str) -> Dict[str, Union[List[str], int, st
             "remark": "Unsupported"
         }
 
-    # ✅ Style check
-    style_result = check_code_style(code, language)
-    suggestions += [s + " (low impact)" for s in style_result["suggestions"]]
-    warnings += [w + " (medium impact)" for w in style_result["warnings"]]
-    optimizations += [o + " (low impact)" for o in style_result["optimizations"]]
-
-    # ✅ Format all
-    formatted_suggestions = format_issues(suggestions)
-    formatted_warnings = format_issues(warnings)
-    formatted_optimizations = format_issues(optimizations)
-    formatted_bugs = format_issues(bugs)
-
-    # ✅ Score calculation
-    deductions = (
-        len(formatted_warnings) * 5 +
-        len(formatted_suggestions) * 2 +
-        len(formatted_optimizations) * 1 +
-        len(formatted_bugs) * 3
-    )
-    score = max(0, 100 - deductions)
+    return summarize(suggestions, warnings, optimizations, bugs, style_findings(ctx, language))
+
+
+def summarize(suggestions: List[Finding], warnings: List[Finding], optimizations: List[Finding], bugs: List[Finding],
+              style_result: dict) -> dict:
+    """
+    Merge in the style result, fold repeated findings into one with a count
+    and score the review. Findings stay unrendered until the response is
+    built (see findings.render_result()).
+    """
+    result = {
+        "suggestions": aggregate(suggestions + style_result["suggestions"]),
+        "warnings": aggregate(warnings + style_result["warnings"]),
+        "optimizations": aggregate(optimizations + style_result["optimizations"]),
+        "bugs": aggregate(bugs),
+    }
 
-    remark = (
-        "Excellent" if score >= 90 else
-        "Good" if score >= 75 else
-        "Average" if score >= 60 else
-        "Needs Improvement"
-    )
+    # ✅ Score: every occurrence counts, however many were folded together
+    deductions = sum(occurrences(result[key]) * weight for key, weight in WEIGHTS.items())
+    score = max(0, 100 - deductions)
 
-    return {
-        "suggestions": formatted_suggestions,
-        "warnings": formatted_warnings,
-        "optimizations": formatted_optimizations,
-        "bugs": formatted_bugs,
-        "score": score,
-        "remark": remark
-    }
+    result["score"] = score
+    result["remark"] = score_remark(score)
+    return result
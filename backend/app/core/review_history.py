@@ -0,0 +1,203 @@
+# app/core/review_history.py
+
+import base64
+import binascii
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.config import REVIEWS_MAX_PAGE_SIZE as MAX_PAGE_SIZE
+from app.core.review_storage import dialect_insert
+from app.models.code_review import CodeReview, ReviewRollup
+
+BUCKET_LABELS = [f"{b * 10}-{b * 10 + 9}" for b in range(9)] + ["90-100"]
+
+_SUMMARY_COLUMNS = (
+    CodeReview.id,
+    CodeReview.uid,
+    CodeReview.language,
+    CodeReview.score,
+    CodeReview.remark,
+    CodeReview.created_at,
+)
+
+
+def score_bucket(score: int) -> int:
+    return min(max(score // 10, 0), 9)
+
+
+def _naive_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    # created_at is stored as naive UTC; compare like with like
+    if moment is not None and moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{_naive_utc(created_at).isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """(created_at, id) of the last row of the previous page; ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("invalid cursor") from exc
+
+
+def list_reviews(
+    db: Session,
+    language: Optional[str] = None,
+    min_score: Optional[int] = None,
+    max_score: Optional[int] = None,
+    remark: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    One page of review summaries, newest first, plus the cursor for the
+    next page (None on the last one).
+
+    Keyset pagination: the cursor is the (created_at, id) of the last row
+    served, so every page is an index range scan no matter how deep it is,
+    and rows inserted meanwhile never shift or repeat entries.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = select(*_SUMMARY_COLUMNS)
+    if language is not None:
+        query = query.where(CodeReview.language == language)
+    if remark is not None:
+        query = query.where(CodeReview.remark == remark)
+    if min_score is not None:
+        query = query.where(CodeReview.score >= min_score)
+    if max_score is not None:
+        query = query.where(CodeReview.score <= max_score)
+    if created_after is not None:
+        query = query.where(CodeReview.created_at >= _naive_utc(created_after))
+    if created_before is not None:
+        query = query.where(CodeReview.created_at < _naive_utc(created_before))
+    if cursor is not None:
+        last_created, last_id = decode_cursor(cursor)
+        query = query.where(tuple_(CodeReview.created_at, CodeReview.id) < tuple_(last_created, last_id))
+
+    query = query.order_by(CodeReview.created_at.desc(), CodeReview.id.desc()).limit(limit + 1)
+    rows = db.execute(query).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    items = [
+        {
+            "review_id": row.uid,
+            "language": row.language,
+            "score": row.score,
+            "remark": row.remark,
+            "created_at": row.created_at,
+            "report_url": f"/api/v1/reviews/{row.uid}/report.pdf",
+        }
+        for row in rows
+    ]
+    return items, next_cursor
+
+
+def _rollup_rows(rows) -> List[dict]:
+    """Aggregate review rows (dicts or row objects) into rollup increments."""
+    totals: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0])
+    for row in rows:
+        get = row.get if isinstance(row, dict) else row._mapping.get
+        score = get("score")
+        if score is None:
+            continue
+        created_at = get("created_at")
+        day = created_at.date() if created_at is not None else datetime.now(timezone.utc).date()
+        key = (day, get("language") or "unknown", score_bucket(score))
+        totals[key][0] += 1
+        totals[key][1] += score
+    return [
+        {"day": day, "language": language, "score_bucket": bucket, "reviews": n, "score_sum": total}
+        for (day, language, bucket), (n, total) in totals.items()
+    ]
+
+
+def _upsert_rollups(conn: Connection, increments: List[dict]):
+    if not increments:
+        return
+    table = ReviewRollup.__table__
+    statement = dialect_insert(conn)(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.day, table.c.language, table.c.score_bucket],
+        set_={
+            "reviews": table.c.reviews + statement.excluded.reviews,
+            "score_sum": table.c.score_sum + statement.excluded.score_sum,
+        },
+    )
+    conn.execute(statement, increments)
+
+
+def apply_rollups(conn: Connection, rows: List[dict]):
+    """Add freshly inserted review rows to the rollups (call inside the inserting transaction)."""
+    _upsert_rollups(conn, _rollup_rows(rows))
+
+
+def backfill_rollups(conn: Connection) -> bool:
+    """
+    Build the rollups from code_reviews if they are empty but reviews exist
+    (a database from before rollups existed). One full scan, once.
+    """
+    if conn.execute(select(ReviewRollup.day).limit(1)).first() is not None:
+        return False
+    if conn.execute(select(CodeReview.id).limit(1)).first() is None:
+        return False
+    conn.execute(delete(ReviewRollup))
+    result = conn.execution_options(yield_per=5000).execute(
+        select(CodeReview.language, CodeReview.score, CodeReview.created_at)
+    )
+    _upsert_rollups(conn, _rollup_rows(result))
+    return True
+
+
+def review_stats(db: Session, language: Optional[str] = None, since: Optional[date] = None, until: Optional[date] = None) -> dict:
+    """Score distribution and per-language averages, read from the rollups only."""
+    query = select(
+        ReviewRollup.language,
+        ReviewRollup.score_bucket,
+        func.sum(ReviewRollup.reviews),
+        func.sum(ReviewRollup.score_sum),
+    ).group_by(ReviewRollup.language, ReviewRollup.score_bucket)
+    if language is not None:
+        query = query.where(ReviewRollup.language == language)
+    if since is not None:
+        query = query.where(ReviewRollup.day >= since)
+    if until is not None:
+        query = query.where(ReviewRollup.day <= until)
+
+    distribution = [0] * len(BUCKET_LABELS)
+    languages: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    for lang, bucket, reviews, score_sum in db.execute(query):
+        distribution[bucket] += reviews
+        languages[lang][0] += reviews
+        languages[lang][1] += score_sum
+
+    total = sum(n for n, _ in languages.values())
+    score_total = sum(s for _, s in languages.values())
+    return {
+        "total": total,
+        "average_score": round(score_total / total, 2) if total else None,
+        "languages": [
+            {"language": lang, "reviews": n, "average_score": round(s / n, 2)}
+            for lang, (n, s) in sorted(languages.items(), key=lambda item: (-item[1][0], item[0]))
+        ],
+        "score_distribution": [
+            {"bucket": label, "reviews": count} for label, count in zip(BUCKET_LABELS, distribution)
+        ],
+    }
@@ -0,0 +1,210 @@
+# app/core/review_pipeline.py
+
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from concurrent.futures import Future
+from typing import Optional, Tuple
+
+from app.core import metrics, profiling, workers
+from app.core.analysis_context import AnalysisContext
+from app.core.findings import KINDS, Finding, aggregate, render_result
+from app.core.incremental import review_python
+from app.core.result_cache import cache_key, review_cache
+from app.core.review_engine import analyze_code, analyze_javascript_code, analyze_python_code, summarize
+from app.core.sandbox import profile_code, profile_findings
+from app.core.workers import AnalysisAborted
+from app.models.code_review import CodeReview
+from app.utils.bug_detector import bug_findings
+from app.utils.gpt_logic_checker import logic_findings  # ✅ Logic flaw detector
+from app.utils.js_analyzer import javascript_facts
+from app.utils.style_checker import style_findings
+
+
+def analyze_review(code: str, language: str, review_type: str = "basic") -> dict:
+    """
+    Full analysis behind /review (style, bugs, logic flaws, score).
+
+    Plain arguments and a JSON-style result, so it can run in a worker
+    process as well as in the request thread.
+    """
+    # 🌳 Parse once; every analyzer below shares this context
+    ctx = AnalysisContext(code, language)
+
+    # 🧩 Python is reviewed function by function, so regions that come back
+    # unchanged in a later submission are not analyzed again
+    if ctx.language == "python":
+        reviewed = review_python(ctx)
+        if reviewed is not None:
+            return with_profile(reviewed[0], ctx, review_type)
+
+    # 🔍 Static + Style analysis (includes bug detection)
+    result = analyze_code(language, ctx)
+
+    # 🤖 Detect logic flaws; keep bugs separate and merge flaws into warnings
+    result["warnings"].extend(aggregate(logic_findings(ctx)))
+    return with_profile(result, ctx, review_type)
+
+
+def with_profile(result: dict, ctx: AnalysisContext, review_type: str) -> dict:
+    """
+    review_type="profile": the code's functions are also run in the
+    sandbox (app/core/sandbox.py). Measured timings join the optimization
+    hints (they don't change the score) and the details go under "profile".
+    """
+    if review_type != "profile":
+        return result
+    report = profile_code(ctx)
+    result["optimizations"].extend(profile_findings(report))
+    result["profile"] = report
+    return result
+
+
+def analyze_incremental(code: str, previous_code: str, language: str, review_type: str = "basic") -> dict:
+    """
+    analyze_review() for a new version of previously reviewed code, plus an
+    "incremental" summary of how many regions changed and were reanalyzed
+    (None when the code had to be analyzed as a whole).
+    """
+    ctx = AnalysisContext(code, language)
+    if ctx.language == "python":
+        reviewed = review_python(ctx, previous_code)
+        if reviewed is not None:
+            result, stats = reviewed
+            result["incremental"] = stats
+            return with_profile(result, ctx, review_type)
+    result = analyze_review(code, language, review_type)
+    result["incremental"] = None
+    return result
+
+
+# 📡 analyze_review() cut into independent stages, for streamed reviews:
+# each runs as its own worker job and is reported as soon as it's done
+STREAM_STAGES = ("style", "bugs", "logic", "optimizations")
+STREAM_LANGUAGES = ("python", "javascript")
+PROFILE_STAGE = "profile"  # one more, for review_type="profile"
+
+
+def analyze_stage(stage: str, code: str, language: str) -> dict:
+    """
+    One of STREAM_STAGES for `code` (a STREAM_LANGUAGES language), as
+    findings by result key. "optimizations" is the rest of the static
+    review: performance, unused imports and docstrings. PROFILE_STAGE
+    runs the code in the sandbox (see with_profile()).
+    """
+    ctx = AnalysisContext(code, language)
+    python = ctx.language == "python"
+    if stage == "style":
+        style = style_findings(ctx, language)
+        return {key: style[key] for key in ("suggestions", "warnings", "optimizations")}
+    if stage == "bugs":
+        return {"bugs": aggregate(bug_findings(ctx) if python else javascript_facts(ctx)["bugs"])}
+    if stage == "logic":
+        return {"warnings": aggregate(logic_findings(ctx))}
+    if stage == "optimizations":
+        suggestions, warnings, optimizations = analyze_python_code(ctx) if python else analyze_javascript_code(ctx)
+        return {"suggestions": suggestions, "warnings": warnings, "optimizations": optimizations}
+    if stage == PROFILE_STAGE:
+        return with_profile({"optimizations": []}, ctx, "profile")
+    raise ValueError(f"unknown stage: {stage}")
+
+
+def combine_stages(parts: dict) -> dict:
+    """The analyze_review() result from every analyze_stage() part, by stage name."""
+    static = parts["optimizations"]
+    result = summarize(static["suggestions"], static["warnings"], static["optimizations"], parts["bugs"]["bugs"], parts["style"])
+    result["warnings"].extend(parts["logic"]["warnings"])
+    if PROFILE_STAGE in parts:
+        result["optimizations"].extend(parts[PROFILE_STAGE]["optimizations"])
+        result["profile"] = parts[PROFILE_STAGE]["profile"]
+    return result
+
+
+def aborted_result(reason: str) -> dict:
+    """Stand-in result when analysis hit its time or memory cap."""
+    return {
+        "suggestions": [],
+        "warnings": [Finding("review.aborted", {"reason": reason})],
+        "optimizations": [],
+        "bugs": [],
+        "score": 0,
+        "remark": "Analysis aborted"
+    }
+
+
+def submit_review(code: str, language: str, review_type: str = "basic") -> Future:
+    """
+    Start a review on the worker pool. Cached results resolve immediately
+    without touching the pool; pass the future to finish_review().
+    """
+    metrics.observe_input(code, language)
+    # 🔬 Profiled request: analyze fresh and in this thread, where the profiler runs
+    if profiling.active():
+        return workers.submit(metrics.measured, analyze_review, code, language, review_type, inline=True)
+
+    # ♻️ Same file resubmitted (e.g. from CI): reuse the complete result
+    cached = review_cache.get(cache_key(code, language, review_type))
+    if cached is not None:
+        future = Future()
+        future.set_result((cached, None))
+        future.from_cache = True
+        return future
+    # ⏱️ Stage timings are measured in the worker and come back with the result
+    return workers.submit(metrics.measured, analyze_review, code, language, review_type)
+
+
+def finish_review(code: str, language: str, review_type: str, future: Future) -> dict:
+    """Wait for a submit_review() future; cap violations become an aborted result."""
+    started = time.perf_counter()
+    try:
+        result, timings = workers.collect(future)
+    except AnalysisAborted as exc:
+        return aborted_result(str(exc))  # never cached: may succeed under less load
+    metrics.merge(timings, time.perf_counter() - started)
+    if not getattr(future, "from_cache", False):
+        review_cache.put(cache_key(code, language, review_type), result)
+    return result
+
+
+def run_review(code: str, language: str, review_type: str = "basic") -> dict:
+    return finish_review(code, language, review_type, submit_review(code, language, review_type))
+
+
+def run_incremental_review(code: str, previous_code: str, language: str, review_type: str = "basic") -> Tuple[dict, Optional[dict]]:
+    """Review `code` as a revision of `previous_code` on the worker pool; returns (result, incremental summary)."""
+    metrics.observe_input(code, language)
+    started = time.perf_counter()
+    try:
+        result, timings = workers.run(metrics.measured, analyze_incremental, code, previous_code, language, review_type)
+    except AnalysisAborted as exc:
+        return aborted_result(str(exc)), None
+    metrics.merge(timings, time.perf_counter() - started)
+    stats = result.pop("incremental")
+    review_cache.put(cache_key(code, language, review_type), result)
+    return result, stats
+
+
+def build_review_record(code: str, language: str, result: dict) -> CodeReview:
+    rendered = render_result(result)
+    record = CodeReview(
+        uid=uuid.uuid4().hex,  # known before commit, so no refresh is needed to link it
+        code=code,
+        language=language,
+        suggestions="\n".join(rendered["suggestions"]),
+        warnings="\n".join(rendered["warnings"]),
+        optimizations="\n".join(rendered["optimizations"]),
+        bugs=json.dumps(rendered["bugs"], ensure_ascii=False),
+        score=result["score"],
+        remark=result["remark"],
+        created_at=datetime.now(timezone.utc),  # submission time, not when the write-behind queue flushes
+    )
+    # Structured findings for review_storage; the text above is only for
+    # reading the review back while it waits in the write queue
+    record.findings = {key: list(result[key]) for key in KINDS}
+    return record
+
+
+def report_url(record: CodeReview) -> str:
+    # 🌐 PDF is rendered from the stored row the first time it is downloaded
+    return f"/api/v1/reviews/{record.uid}/report.pdf"
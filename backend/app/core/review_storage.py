@@ -0,0 +1,164 @@
+# app/core/review_storage.py
+
+import functools
+import hashlib
+import json
+import zlib
+from typing import Dict, List
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.findings import render_message
+from app.core.message_catalog import CATALOG
+from app.models.code_review import CodeBlob, CodeReview, MessageTemplate, ReviewFinding
+
+# CodeReview text column / result key -> finding kind
+KINDS = (
+    ("suggestions", "suggestion"),
+    ("warnings", "warning"),
+    ("optimizations", "optimization"),
+    ("bugs", "bug"),
+)
+
+_templates: Dict[str, str] = {}  # template id -> text; templates never change once stored
+
+
+def dialect_insert(conn: Connection):
+    """insert() with on_conflict_do_* for the connection's dialect."""
+    if conn.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_specific
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_specific
+    return dialect_specific
+
+
+def code_sha256(code: str) -> str:
+    return hashlib.sha256(code.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def template_id(template: str) -> str:
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:16]
+
+
+def write_reviews(conn: Connection, rows: List[dict]):
+    """
+    Insert review rows (CodeReview column dicts plus a "findings" dict of
+    Finding lists by result key) in their compact form: the source goes to
+    code_blobs (once per sha256) and every finding becomes a review_findings
+    row pointing at its message template. Rows without findings are stored
+    inline, the old way.
+    """
+    blobs: Dict[str, dict] = {}
+    templates: Dict[str, dict] = {}
+    findings = []
+    reviews = []
+    for row in rows:
+        structured = row.get("findings")
+        review = {name: value for name, value in row.items() if name != "findings"}
+        if structured is None:
+            reviews.append(review)
+            continue
+
+        sha = code_sha256(row["code"])
+        if sha not in blobs:
+            data = row["code"].encode("utf-8", "surrogatepass")
+            blobs[sha] = {"sha256": sha, "size": len(data), "data": zlib.compress(data, 6)}
+
+        position = 0
+        for key, kind in KINDS:
+            for finding in structured.get(key, ()):
+                template = CATALOG[finding.rule].template
+                tid = template_id(template)
+                if tid not in templates:
+                    templates[tid] = {"id": tid, "rule_id": finding.rule, "template": template}
+                findings.append({
+                    "review_uid": row["uid"],
+                    "position": position,
+                    "kind": kind,
+                    "rule_id": finding.rule,
+                    "severity": finding.severity,
+                    "line": finding.line,
+                    "end_line": finding.end_line,
+                    "count": finding.count,
+                    "template_id": tid,
+                    "args": json.dumps(finding.args, ensure_ascii=False) if finding.args else None,
+                })
+                position += 1
+
+        reviews.append({
+            **review,
+            "code_sha256": sha,
+            "code": "",
+            "suggestions": None,
+            "warnings": None,
+            "optimizations": None,
+            "bugs": None,
+        })
+
+    dialect_specific = dialect_insert(conn)
+    if blobs:
+        conn.execute(dialect_specific(CodeBlob.__table__).on_conflict_do_nothing(), list(blobs.values()))
+    if templates:
+        conn.execute(dialect_specific(MessageTemplate.__table__).on_conflict_do_nothing(), list(templates.values()))
+    conn.execute(insert(CodeReview.__table__), reviews)
+    if findings:
+        conn.execute(insert(ReviewFinding.__table__), findings)
+
+
+def _template_texts(db: Session, ids) -> Dict[str, str]:
+    missing = [tid for tid in ids if tid not in _templates]
+    if missing:
+        for tid, text in db.execute(select(MessageTemplate.id, MessageTemplate.template).where(MessageTemplate.id.in_(missing))):
+            _templates[tid] = text
+    return _templates
+
+
+def load_review(db: Session, review: CodeReview) -> CodeReview:
+    """
+    `review` with its code and findings filled back in, as a transient
+    CodeReview (rows stored inline come back as they are).
+    """
+    if review.code_sha256 is None:
+        return review
+
+    blob = db.get(CodeBlob, review.code_sha256)
+    code = zlib.decompress(blob.data).decode("utf-8", "surrogatepass") if blob is not None else ""
+
+    rows = db.execute(
+        select(ReviewFinding.kind, ReviewFinding.rule_id, ReviewFinding.severity, ReviewFinding.count,
+               ReviewFinding.template_id, ReviewFinding.args)
+        .where(ReviewFinding.review_uid == review.uid)
+        .order_by(ReviewFinding.position)
+    ).all()
+    templates = _template_texts(db, {row.template_id for row in rows})
+
+    found: Dict[str, list] = {kind: [] for _, kind in KINDS}
+    for row in rows:
+        found[row.kind].append(render_message(
+            row.rule_id, row.severity, json.loads(row.args) if row.args else None, row.count or 1,
+            template=templates[row.template_id], kind=row.kind,
+        ))
+
+    return CodeReview(
+        id=review.id,
+        uid=review.uid,
+        code_sha256=review.code_sha256,
+        code=code,
+        language=review.language,
+        suggestions="\n".join(found["suggestion"]),
+        warnings="\n".join(found["warning"]),
+        optimizations="\n".join(found["optimization"]),
+        bugs=json.dumps(found["bug"], ensure_ascii=False),
+        score=review.score,
+        remark=review.remark,
+        created_at=review.created_at,
+    )
+
+
+def rule_counts(db: Session) -> Dict[str, int]:
+    """How often each rule fired across all stored reviews."""
+    total = func.sum(func.coalesce(ReviewFinding.count, 1))
+    return dict(db.execute(select(ReviewFinding.rule_id, total).group_by(ReviewFinding.rule_id)).all())
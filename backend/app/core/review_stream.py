@@ -0,0 +1,102 @@
+# app/core/review_stream.py
+
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core import metrics, workers
+from app.core.findings import render_result
+from app.core.result_cache import cache_key, review_cache
+from app.core.review_pipeline import (
+    PROFILE_STAGE,
+    STREAM_LANGUAGES,
+    STREAM_STAGES,
+    aborted_result,
+    analyze_stage,
+    build_review_record,
+    combine_stages,
+    finish_review,
+    report_url,
+    submit_review,
+)
+from app.core.review_writer import review_writer
+from app.core.workers import AnalysisAborted
+
+
+async def _run_stage(stage: str, code: str, language: str, futures: list):
+    # Submitting may run the analysis right here (pool disabled), so it
+    # happens off the event loop too
+    future = await run_in_threadpool(workers.submit, metrics.measured, analyze_stage, stage, code, language)
+    futures.append(future)
+    started = time.perf_counter()
+    found, timings = await run_in_threadpool(workers.collect, future)
+    metrics.merge(timings, time.perf_counter() - started)
+    return stage, found
+
+
+async def _whole_review(code: str, language: str, review_type: str) -> dict:
+    future = await run_in_threadpool(submit_review, code, language, review_type)
+    return await run_in_threadpool(finish_review, code, language, review_type, future)
+
+
+async def stream_review(code: str, language: str, review_type: str = "basic",
+                        disconnected: Optional[Callable[[], Awaitable[bool]]] = None) -> AsyncIterator[dict]:
+    """
+    The /review analysis as events: {"type": "stage"} with each stage's
+    findings the moment that stage finishes, then {"type": "review"} with
+    the complete result exactly as /review returns it (plus review_id).
+
+    Stages run side by side on the worker pool. Nothing is read ahead of
+    the consumer: at most the STREAM_STAGES results wait here. If the
+    client goes away (the generator is closed or `disconnected()` turns
+    true) queued stages are cancelled and nothing is stored.
+    """
+    metrics.observe_input(code, language)
+    key = cache_key(code, language, review_type)
+    result = review_cache.get(key)
+
+    if result is None and language.lower() not in STREAM_LANGUAGES:
+        # Nothing to stream stage by stage: one job, one event
+        result = await _whole_review(code, language, review_type)
+    elif result is None:
+        futures = []
+        stages = STREAM_STAGES + (PROFILE_STAGE,) if review_type == "profile" else STREAM_STAGES
+        tasks = [asyncio.ensure_future(_run_stage(stage, code, language, futures)) for stage in stages]
+        parts = {}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    stage, found = await next_done
+                except AnalysisAborted as exc:
+                    result = aborted_result(str(exc))  # never cached, like finish_review()
+                    break
+                parts[stage] = found
+                yield {"type": "stage", "stage": stage, **render_result(found)}
+                if disconnected is not None and await disconnected():
+                    return
+        finally:
+            for task in tasks:
+                task.cancel()
+            for future in futures:
+                future.cancel()
+        if result is None:
+            result = combine_stages(parts)
+            review_cache.put(key, result)
+
+    # 💾 Queued for the database like any other review
+    record = build_review_record(code, language, result)
+    review_writer.submit([record])
+    yield {"type": "review", **render_result(result), "review_id": record.uid, "report_url": report_url(record)}
+
+
+def ndjson(event: dict) -> str:
+    return json.dumps(event, ensure_ascii=False) + "\n"
+
+
+def sse(event: dict) -> str:
+    """A Server-Sent Events frame, named after the event type (or stage)."""
+    name = event.get("stage") or event["type"]
+    return f"event: {name}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
@@ -0,0 +1,178 @@
+# app/core/review_writer.py
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core import config, metrics
+from app.core.database import engine, ensure_db
+from app.core.review_history import apply_rollups
+from app.core.review_storage import load_review, write_reviews
+from app.models.code_review import CodeReview
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = [column.name for column in CodeReview.__table__.columns if column.name != "id"]
+_WRITE_ATTEMPTS = 3
+_MAX_RETRY_SECONDS = 30.0  # longest wait between retries of a batch that keeps failing
+
+
+def _row(record: CodeReview) -> dict:
+    row = {name: getattr(record, name) for name in _COLUMNS}
+    row["findings"] = getattr(record, "findings", None)  # see build_review_record()
+    return row
+
+
+class ReviewWriter:
+    """
+    Write-behind queue for review records.
+
+    submit() returns immediately; a background thread inserts waiting rows
+    in one transaction per batch, as soon as `batch_size` rows are waiting
+    or `flush_ms` after the oldest one arrived. Until then a row is still
+    visible through pending(), so a review can be read back (e.g. its
+    report downloaded) right after it was submitted.
+
+    A batch the database keeps refusing stays queued (and readable) and is
+    retried with growing pauses; rows are only given up on at shutdown.
+    While it fails, the queue fills and submit() applies back-pressure.
+    """
+
+    def __init__(self, bind: Engine, batch_size: int = None, flush_ms: int = None, max_pending: int = None):
+        self.bind = bind
+        self.batch_size = config.DB_WRITE_BATCH_SIZE if batch_size is None else batch_size
+        self.flush_ms = config.DB_WRITE_FLUSH_MS if flush_ms is None else flush_ms
+        self.max_pending = config.DB_WRITE_QUEUE_MAX if max_pending is None else max_pending
+        self._pending: "OrderedDict[str, tuple]" = OrderedDict()  # uid -> (row, arrival time)
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._force = False  # flush() is waiting: don't wait for a full batch
+        self._submitted = 0
+        self._done = 0  # rows written (or given up on)
+        self._failures = 0  # failed writes of the batch at the head of the queue, in a row
+
+    def submit(self, records: Iterable[CodeReview]):
+        rows = [_row(record) for record in records]
+        if not rows:
+            return
+        with self._cond:
+            if not self._closed:
+                # 🧱 Bounded: under sustained overload requests wait here instead of growing memory
+                while self._pending and len(self._pending) + len(rows) > self.max_pending:
+                    self._cond.wait()
+                now = time.monotonic()
+                for row in rows:
+                    self._pending[row["uid"]] = (row, now)
+                self._submitted += len(rows)
+                self._start()
+                self._cond.notify_all()
+                return
+        # Shut down already: write through, and let the caller know if that fails
+        if not self._write(rows):
+            raise RuntimeError(f"could not write {len(rows)} review rows")
+
+    def pending(self, uid: str) -> Optional[CodeReview]:
+        """A submitted review that is not in the database yet, as a transient CodeReview."""
+        with self._cond:
+            entry = self._pending.get(uid)
+        return CodeReview(**{name: entry[0][name] for name in _COLUMNS}) if entry is not None else None
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every row submitted so far is written; False on timeout."""
+        with self._cond:
+            target = self._submitted
+            self._force = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._done >= target, timeout)
+
+    def shutdown(self, timeout: Optional[float] = None):
+        """Write everything still queued and stop the thread; later submits write through."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="review-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return  # closed and drained
+                # Wait for a full batch, the oldest row's deadline, a flush() or shutdown
+                while len(self._pending) < self.batch_size and not (self._force or self._closed):
+                    oldest = next(iter(self._pending.values()))[1]
+                    remaining = oldest + self.flush_ms / 1000 - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = [row for row, _ in list(self._pending.values())[:self.batch_size]]
+
+            written = self._write(batch)
+
+            with self._cond:
+                if not written and not self._closed:
+                    # ♻️ Keep the rows (their report URLs are out already) and try again later
+                    self._failures += 1
+                    self._cond.wait_for(lambda: self._closed, min(_MAX_RETRY_SECONDS, 0.5 * 2 ** self._failures))
+                    continue
+                if not written:
+                    logger.error("Dropping %d review rows at shutdown after failed writes: %s",
+                                 len(batch), ", ".join(row["uid"] for row in batch))
+                self._failures = 0
+                for row in batch:
+                    self._pending.pop(row["uid"], None)
+                self._done += len(batch)
+                if not self._pending:
+                    self._force = False
+                self._cond.notify_all()
+
+    def _write(self, rows: List[dict]) -> bool:
+        """Insert `rows` in one transaction, retrying a few times; False if every attempt failed."""
+        if self.bind is engine:
+            ensure_db()  # the first write of the process may come before any request read
+        for attempt in range(_WRITE_ATTEMPTS):
+            started = time.perf_counter()
+            try:
+                # 💾 Bulk INSERTs (executemany) and one commit for the whole batch;
+                # the stats rollups are updated in the same transaction
+                with self.bind.begin() as conn:
+                    write_reviews(conn, rows)
+                    apply_rollups(conn, rows)
+            except Exception:
+                logger.exception("Writing %d review rows failed (attempt %d)", len(rows), attempt + 1)
+                metrics.DB_WRITE_FAILURES.inc()
+                if attempt + 1 < _WRITE_ATTEMPTS:
+                    time.sleep(0.1 * 2 ** attempt)
+                continue
+            metrics.DB_FLUSH_SECONDS.observe(time.perf_counter() - started)
+            metrics.DB_ROWS_WRITTEN.inc(len(rows))
+            return True
+        return False
+
+
+review_writer = ReviewWriter(engine)
+
+
+def find_review(db: Session, uid: str) -> Optional[CodeReview]:
+    """Review by uid, including one still waiting in the write-behind queue."""
+    # Queue first: a row leaves it only after its insert committed
+    pending = review_writer.pending(uid)
+    if pending is not None:
+        return pending
+    with metrics.timed("db"):
+        review = db.query(CodeReview).filter(CodeReview.uid == uid).first()
+        return load_review(db, review) if review is not None else None
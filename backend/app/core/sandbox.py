@@ -0,0 +1,410 @@
+# app/core/sandbox.py
+
+import ast
+import builtins
+import json
+import logging
+import math
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional, Tuple, Union
+
+try:
+    import resource  # POSIX only
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+from app.core import config
+from app.core.analysis_context import AnalysisContext
+from app.core.findings import Finding
+from app.core.sandbox_harness import MEMORY_ERROR, RECURSION_ERROR, RESULT_PREFIX, UNDEFINED
+from app.utils.performance_profiler import complexity, performance_facts
+
+logger = logging.getLogger(__name__)
+
+# 🧪 review_type="profile": top-level functions of a Python submission are
+# called on generated input of growing size in a throwaway interpreter
+# (app/core/sandbox_harness.py) under CPU, memory and wall-clock limits,
+# with network, subprocesses and file writes refused. The timings are fit
+# to a growth curve and reported next to the static estimate.
+HARNESS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sandbox_harness.py")
+
+# Input sizes tried, smallest first, until a function's budget runs out
+SIZES = tuple(2 ** k for k in range(2, 18))
+MIN_POINTS = 3  # needed before a growth curve is fit
+
+_ANNOTATIONS = {
+    "int": "int", "float": "float", "bool": "bool", "str": "str",
+    "list": "list", "List": "list", "Sequence": "list", "Iterable": "list", "Collection": "list",
+    "dict": "dict", "Dict": "dict", "Mapping": "dict",
+    "set": "set", "Set": "set", "frozenset": "set", "FrozenSet": "set",
+    "tuple": "tuple", "Tuple": "tuple",
+}
+# Unannotated parameters: a few names say what they hold
+_INT_NAMES = {"n", "m", "k", "size", "count", "num", "number", "limit", "length", "depth", "steps", "times", "total"}
+_STR_NAMES = {"s", "text", "string", "word", "line", "sentence", "name", "pattern", "source"}
+_LIST_NAMES = {"arr", "array", "lst", "seq", "sequence", "data", "xs", "ys", "items", "values", "nums", "numbers",
+               "elements", "rows", "scores", "points"}
+_STR_LIST_NAMES = {"words", "names", "lines", "strings", "texts", "tokens", "keys"}
+
+# (label, f(n)) for t ≈ a + b·f(n), simplest first
+_MODELS = (
+    ("O(log n)", lambda n: math.log(n)),
+    ("O(n)", lambda n: n),
+    ("O(n log n)", lambda n: n * math.log(n)),
+    ("O(n²)", lambda n: n ** 2),
+    ("O(n³)", lambda n: n ** 3),
+)
+_SEVERITY = {"O(n²)": "medium", "O(n³)": "high", "O(2ⁿ)": "high"}  # anything else: low
+
+# 🔒 Every error the harness can report. The submission runs in the child, so
+# it could print anything; only these strings are passed on to the client.
+_EXCEPTIONS = [name for name, value in vars(builtins).items() if isinstance(value, type) and issubclass(value, BaseException)]
+_ERRORS = frozenset(
+    [MEMORY_ERROR, RECURSION_ERROR, UNDEFINED, "module-level code ran out of time", *_EXCEPTIONS]
+    + [f"module-level code raised {name}" for name in _EXCEPTIONS]
+    + [f"couldn't switch to the sandbox user ({name})" for name in _EXCEPTIONS]
+)
+
+
+def _known_error(text) -> Optional[str]:
+    if text is None:
+        return None
+    return text if text in _ERRORS else "the sandbox sent an unexpected error"
+
+
+def _result(message) -> Optional[dict]:
+    """A function result from the harness, rebuilt from checked fields; None if it's malformed."""
+    try:
+        return {
+            "name": str(message["name"]),
+            "status": message["status"] if message["status"] in ("measured", "timeout", "error") else "error",
+            "error": _known_error(message.get("error")),
+            "points": [(int(n), float(seconds), int(peak)) for n, seconds, peak in message["points"]],
+        }
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _kind(annotation: Optional[ast.AST]) -> Optional[str]:
+    element = None
+    if isinstance(annotation, ast.Subscript):
+        element = annotation.slice
+        annotation = annotation.value
+    if isinstance(annotation, ast.Attribute):  # typing.List
+        annotation = ast.Name(annotation.attr)
+    if not isinstance(annotation, ast.Name):
+        return None
+    kind = _ANNOTATIONS.get(annotation.id)
+    if kind == "list" and isinstance(element, ast.Name) and element.id == "str":
+        return "list[str]"
+    return kind
+
+
+def _param_kind(arg: ast.arg) -> Optional[str]:
+    if arg.annotation is not None:
+        return _kind(arg.annotation)
+    name = arg.arg.lower()
+    if name in _INT_NAMES:
+        return "int"
+    if name in _STR_NAMES:
+        return "str"
+    if name in _STR_LIST_NAMES:
+        return "list[str]"
+    if name in _LIST_NAMES or (len(name) > 2 and name.endswith("s")):
+        return "list"
+    return None
+
+
+def plan(tree: ast.Module) -> Tuple[List[dict], List[dict]]:
+    """
+    (functions to run, functions skipped) for the top-level functions of
+    `tree`. A function is run when every required parameter takes a
+    simple value whose size can be scaled (n, a list of n items, a string
+    of n characters...), judged from annotations or, failing that, names.
+    """
+    run, skipped = [], []
+    for node in tree.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        entry = {"name": node.name, "line": node.lineno}
+        args = node.args
+        positional = args.posonlyargs + args.args
+        required = positional[:len(positional) - len(args.defaults)]
+        required_kwonly = [arg for arg, default in zip(args.kwonlyargs, args.kw_defaults) if default is None]
+        kinds = [_param_kind(arg) for arg in required]
+        unknown = [arg.arg for arg, kind in zip(required, kinds) if kind is None]
+
+        reason = None
+        if isinstance(node, ast.AsyncFunctionDef):
+            reason = "async functions aren't profiled"
+        elif node.decorator_list:
+            reason = "decorated functions aren't profiled"
+        elif required_kwonly:
+            reason = f"needs keyword argument '{required_kwonly[0].arg}'"
+        elif not required:
+            reason = "takes no input whose size could be scaled"
+        elif unknown:
+            reason = f"can't tell what to pass for '{unknown[0]}' (annotate it, e.g. list[int])"
+        elif len(run) >= config.SANDBOX_MAX_FUNCTIONS:
+            reason = f"over the limit of {config.SANDBOX_MAX_FUNCTIONS} functions per review"
+
+        if reason is None:
+            run.append({**entry, "params": kinds})
+        else:
+            skipped.append({**entry, "reason": reason})
+    return run, skipped
+
+
+def _line(xs: List[float], ys: List[float]) -> Optional[Tuple[float, float]]:
+    """(slope, mean squared residual) of the straight line through (xs, ys)."""
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    if sxx == 0:
+        return None
+    slope = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sxx
+    return slope, sum((y - my - slope * (x - mx)) ** 2 for x, y in zip(xs, ys)) / len(xs)
+
+
+def _least_squares(ns: List[int], ts: List[float], f) -> Optional[float]:
+    """Relative residual of the best t = a + b·f(n), b ≥ 0, weighted so every size counts alike."""
+    xs = [f(n) for n in ns]
+    ws = [1 / (t * t) for t in ts]
+    sw = sum(ws)
+    sx = sum(w * x for w, x in zip(ws, xs))
+    sy = sum(w * t for w, t in zip(ws, ts))
+    sxx = sum(w * x * x for w, x in zip(ws, xs))
+    sxy = sum(w * x * t for w, x, t in zip(ws, xs, ts))
+    det = sw * sxx - sx * sx
+    if det <= 0 or not math.isfinite(det):
+        return None
+    b = max(0.0, (sw * sxy - sx * sy) / det)
+    a = (sy - b * sx) / sw
+    return sum(w * (t - a - b * x) ** 2 for w, t, x in zip(ws, ts, xs))
+
+
+def fit_growth(points: List[Tuple[int, float]]) -> Optional[str]:
+    """
+    Growth model best matching (n, seconds) measurements ("O(n²)"...);
+    None with fewer than MIN_POINTS. Near-ties go to the simpler model:
+    O(n) and O(n log n) are hard to tell apart over a few sizes, and
+    claiming less is the safer mistake.
+    """
+    points = [(n, t) for n, t in points if t > 0]
+    if len(points) < MIN_POINTS:
+        return None
+    ns = [n for n, _ in points]
+    ts = [t for _, t in points]
+    logs = [math.log(t) for t in ts]
+    power = _line([math.log(n) for n in ns], logs)
+    if power is None:
+        return None
+    # Flat: time barely moves over the whole ladder of sizes
+    if power[0] < 0.1:
+        return "O(1)"
+    # Exponential code only gets through small sizes; its log-time is a
+    # straight line in n rather than in log n
+    if max(ns) <= 64:
+        exponential = _line([float(n) for n in ns], logs)
+        if exponential is not None and exponential[0] > 0 and exponential[1] * 2 < power[1]:
+            return "O(2ⁿ)"
+    fits = []
+    for label, f in _MODELS:
+        residual = _least_squares(ns, ts, f)
+        if residual is not None:
+            fits.append((residual, label))
+    if not fits:
+        return None
+    best = min(residual for residual, _ in fits)
+    return next(label for residual, label in fits if residual <= best * 1.25 + 1e-4)
+
+
+def exponent(points: List[Tuple[int, float]]) -> Optional[float]:
+    """Slope of log(time) over log(n) across the larger half of the sizes (≈2 for quadratic code)."""
+    points = [(n, t) for n, t in points if t > 0]
+    upper = points[len(points) // 2:] if len(points) >= 4 else points
+    if len(upper) < 2:
+        return None
+    fitted = _line([math.log(n) for n, _ in upper], [math.log(t) for _, t in upper])
+    return round(fitted[0], 2) if fitted is not None else None
+
+
+def run_sandboxed(code: str, functions: List[dict]) -> Tuple[List[dict], Optional[str]]:
+    """
+    Run the harness on `code` for `functions` (see plan()). Returns the
+    per-function results it got to, and why the run ended early, if it did.
+    """
+    budget = config.SANDBOX_FUNCTION_BUDGET_MS / 1000
+    job = {
+        "code": code,
+        "functions": [{"name": fn["name"], "params": fn["params"]} for fn in functions],
+        "sizes": [n for n in SIZES if n <= config.SANDBOX_MAX_N],
+        "budget_seconds": budget,
+        "min_batch_seconds": min(0.02, budget / 120),  # ~5 batches per size, room for a dozen sizes
+        "repeat": 3,
+        "cpu_seconds": config.SANDBOX_CPU_SECONDS,
+        "memory_mb": config.SANDBOX_MEMORY_LIMIT_MB,
+        "user": config.SANDBOX_USER,
+    }
+    # Module code + every function's budget, plus interpreter start-up
+    timeout = min(config.SANDBOX_TIMEOUT_SECONDS, budget * (len(functions) + 1) + 2)
+
+    error = None
+    with tempfile.TemporaryDirectory(prefix="sandbox-") as scratch:
+        try:
+            completed = subprocess.run(
+                [sys.executable, "-I", "-B", HARNESS],
+                input=json.dumps(job),
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                cwd=scratch,
+                env={"PATH": os.defpath},
+                timeout=timeout,
+                start_new_session=True,  # signals aimed at the API's process group don't reach it, and vice versa
+            )
+            stdout, returncode = completed.stdout, completed.returncode
+        except subprocess.TimeoutExpired as exc:
+            stdout, returncode = exc.stdout or "", None
+            if isinstance(stdout, bytes):
+                stdout = stdout.decode("utf-8", "replace")
+            error = f"stopped after the sandbox time limit of {timeout:g}s"
+
+    results = []
+    done = False
+    for line in stdout.splitlines():
+        if not line.startswith(RESULT_PREFIX):
+            continue  # the submission writing to file descriptor 1 directly
+        try:
+            message = json.loads(line[len(RESULT_PREFIX):])
+        except ValueError:
+            continue
+        if not isinstance(message, dict):
+            continue
+        if "function" in message:
+            result = _result(message["function"])
+            if result is not None:
+                results.append(result)
+        elif "error" in message:
+            error = _known_error(message["error"])
+        done = done or message.get("done") is True
+
+    if error is None and not done and returncode != 0:
+        error = _exit_reason(returncode)
+    if error is not None:
+        logger.info("Profiling run ended early: %s", error)
+    return results, error
+
+
+def _exit_reason(returncode: int) -> str:
+    if returncode is not None and returncode < 0:
+        signal_number = -returncode
+        if signal_number in (signal.SIGXCPU, signal.SIGKILL):  # SIGKILL: past the hard CPU limit
+            return f"stopped at the sandbox CPU limit of {config.SANDBOX_CPU_SECONDS}s"
+        return f"sandbox was killed by signal {signal_number}"
+    return f"sandbox exited with status {returncode}"
+
+
+def profile_code(code: Union[str, AnalysisContext]) -> dict:
+    """
+    Measured runtime and memory of the functions in a Python submission:
+    {"functions": [...], "seconds": wall time, "error": None or why
+    nothing (or not everything) was measured}. Each function has its
+    status (measured, timeout, error, skipped), the static estimate, the
+    fitted growth and the (n, seconds, peak bytes) points behind it.
+    """
+    ctx = AnalysisContext.of(code)
+    started = time.perf_counter()
+    report = {"functions": [], "seconds": 0.0, "error": None}
+    if ctx.language != "python":
+        report["error"] = "Profiling is only available for Python."
+        return report
+    if not config.SANDBOX_ENABLED or resource is None:
+        report["error"] = "Profiling is disabled on this server."
+        return report
+    if ctx.tree is None:
+        report["error"] = "Code doesn't parse, so it can't be run."
+        return report
+
+    functions, skipped = plan(ctx.tree)
+    estimates = {
+        f.args["name"]: f.args["complexity"] for f in (performance_facts(ctx) or {"functions": []})["functions"]
+    }
+    measured = {}
+    if functions:
+        results, report["error"] = run_sandboxed(ctx.code, functions)
+        measured = {result["name"]: result for result in results}
+
+    entries = []
+    for fn in functions:
+        result = measured.get(fn["name"])
+        points = [{"n": n, "seconds": seconds, "peak_bytes": peak} for n, seconds, peak in (result or {}).get("points", [])]
+        fitted = fit_growth([(p["n"], p["seconds"]) for p in points])
+        entries.append({
+            "name": fn["name"],
+            "line": fn["line"],
+            "status": result["status"] if result else "not run",
+            "reason": (result or {}).get("error"),
+            "params": fn["params"],
+            "estimated": estimates.get(fn["name"]),
+            "growth": fitted,
+            "exponent": exponent([(p["n"], p["seconds"]) for p in points]),
+            "points": points,
+        })
+    for fn in skipped:
+        entries.append({
+            "name": fn["name"], "line": fn["line"], "status": "skipped", "reason": fn["reason"], "params": [],
+            "estimated": estimates.get(fn["name"]), "growth": None, "exponent": None, "points": [],
+        })
+    report["functions"] = sorted(entries, key=lambda entry: entry["line"])
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def _duration(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds * 1e9:.3g} ns"
+
+
+def _size(count: int) -> str:
+    for unit, scale in (("MB", 1 << 20), ("KB", 1 << 10)):
+        if count >= scale:
+            return f"{count / scale:.3g} {unit}"
+    return f"{count} B"
+
+
+def profile_findings(report: dict) -> List[Finding]:
+    """Optimization hints carrying the measured numbers, one per function that was measured or ran out of time."""
+    findings = []
+    for entry in report["functions"]:
+        points = entry["points"]
+        if entry["growth"] is not None:
+            last = points[-1]
+            findings.append(Finding(
+                "profile.measured",
+                {
+                    "name": entry["name"],
+                    "growth": entry["growth"],
+                    "estimated": entry["estimated"] or complexity(0),
+                    "time": _duration(last["seconds"]),
+                    "n": last["n"],
+                    "memory": _size(last["peak_bytes"]),
+                },
+                line=entry["line"],
+                severity=_SEVERITY.get(entry["growth"], "low"),
+            ))
+        elif entry["status"] == "timeout":
+            findings.append(Finding(
+                "profile.too-slow",
+                {"name": entry["name"], "budget": _duration(config.SANDBOX_FUNCTION_BUDGET_MS / 1000),
+                 "n": points[-1]["n"] * 2 if points else SIZES[0]},
+                line=entry["line"],
+            ))
+    return findings
@@ -0,0 +1,315 @@
+# app/core/sandbox_harness.py
+"""
+The child side of review_type="profile" (see app/core/sandbox.py).
+
+Started as `python -I -B sandbox_harness.py` in an empty temp directory,
+with a JSON job on stdin. Standard library only: it never imports the
+app. It applies rlimits and an audit hook that refuses network, process
+and file-writing operations and any file outside the interpreter's own,
+then gives up root (if it has it) for job["user"]. Then it runs the
+submission and times each requested function over growing input sizes.
+Each result is printed as soon as it's known (one RESULT_PREFIX line per
+function), so a run killed halfway still reports what it measured.
+Errors are reported by built-in exception type only: no text from the
+submission goes back to the client.
+"""
+
+import ast
+import builtins
+import collections
+import gc
+import inspect
+import io
+import json
+import os
+import random
+import signal
+import string
+import sys
+import time
+import tracemalloc
+
+try:
+    import pwd
+    import resource  # POSIX only; the parent refuses to run without it
+except ImportError:  # pragma: no cover - Windows
+    pwd = resource = None
+
+RESULT_PREFIX = "@@sandbox@@ "
+MEMORY_ERROR = "MemoryError: over the sandbox memory limit"
+RECURSION_ERROR = "RecursionError: maximum recursion depth exceeded"
+UNDEFINED = "not defined after running the module"
+
+# Audit events submitted code may not trigger (prefixes). Blocks sockets,
+# starting processes or signalling them, native code, and changing files.
+# Reading is limited to the interpreter's own files (see READABLE).
+BLOCKED_EVENTS = (
+    "socket.", "subprocess.", "os.system", "os.exec", "os.posix_spawn", "os.spawn", "os.fork", "os.forkpty",
+    "os.kill", "os.killpg", "pty.", "ctypes.", "os.remove", "os.unlink", "os.rename", "os.replace", "os.rmdir",
+    "os.mkdir", "os.chmod", "os.chown", "os.truncate", "os.symlink", "os.link", "os.putenv", "os.unsetenv",
+    "shutil.", "urllib.", "http.", "ftplib.", "smtplib.", "poplib.", "imaplib.", "nntplib.", "telnetlib.",
+    "webbrowser.", "resource.setrlimit", "resource.prlimit",
+)
+_WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_CREAT | os.O_APPEND | os.O_TRUNC
+# Events that name a path, checked against READABLE: the standard library
+# can still be imported, /proc, the app and its database can't be read
+_PATH_EVENTS = ("open", "os.listdir", "os.scandir", "glob.glob")
+READABLE = tuple(sorted({
+    os.path.join(os.path.realpath(prefix), "")
+    for prefix in (sys.prefix, sys.base_prefix, sys.exec_prefix, sys.base_exec_prefix)
+}))
+
+
+class OutOfTime(BaseException):
+    """The function's time budget ran out (BaseException: `except Exception` in user code won't hide it)."""
+
+
+def _readable(path):
+    if isinstance(path, int):
+        return True  # an inherited descriptor: stdin/stdout/stderr
+    if path is None:
+        path = "."
+    if isinstance(path, bytes):
+        path = os.fsdecode(path)
+    return os.path.join(os.path.realpath(path), "").startswith(READABLE)
+
+
+def _audit(event, args):
+    if event.startswith(BLOCKED_EVENTS):
+        raise PermissionError(f"{event} is not allowed in the profiling sandbox")
+    if event in _PATH_EVENTS:
+        if event == "open":
+            _, mode, flags = args
+            if (isinstance(mode, str) and any(c in mode for c in "wax+")) or (flags or 0) & _WRITE_FLAGS:
+                raise PermissionError("writing files is not allowed in the profiling sandbox")
+        if not _readable(args[0]):
+            raise PermissionError("reading files is not allowed in the profiling sandbox")
+
+
+def limit(cpu_seconds, memory_mb):
+    """rlimits for this process: CPU time, address space, no file growth, few descriptors, no new processes."""
+    for name, value in (
+        ("RLIMIT_CPU", cpu_seconds),
+        ("RLIMIT_AS", memory_mb * 1024 * 1024),
+        ("RLIMIT_FSIZE", 0),
+        ("RLIMIT_NOFILE", 64),
+        ("RLIMIT_NPROC", 0),
+    ):
+        kind = getattr(resource, name, None)
+        if kind is None:
+            continue
+        hard = resource.getrlimit(kind)[1]
+        if hard != resource.RLIM_INFINITY:
+            value = min(value, hard)
+        # CPU: SIGXCPU at the soft limit, SIGKILL one second later
+        resource.setrlimit(kind, (value, value + 1 if name == "RLIMIT_CPU" and hard == resource.RLIM_INFINITY else value))
+
+
+def preload(tree):
+    """
+    Import the standard library modules `tree` imports while the interpreter's
+    files are still readable: as job["user"], they may not be (a Python
+    installed under /root, say).
+    """
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            if name.partition(".")[0] in sys.stdlib_module_names:
+                try:
+                    __import__(name)
+                except BaseException:  # the submission's own import reports it
+                    pass
+
+
+def drop_privileges(user):
+    """Become `user` (no supplementary groups) when running as root; rlimits like RLIMIT_NPROC don't bind root."""
+    if os.geteuid() != 0:
+        return
+    entry = pwd.getpwnam(user)
+    os.setgroups([])
+    os.setgid(entry.pw_gid)
+    os.setuid(entry.pw_uid)
+    if os.geteuid() == 0 or entry.pw_uid == 0:
+        raise PermissionError(f"sandbox user {user!r} is root")
+
+
+def error_name(exc):
+    """The built-in exception type `exc` is (or derives from): its message and class name are the submission's."""
+    for kind in type(exc).__mro__:
+        if getattr(builtins, kind.__name__, None) is kind:
+            return kind.__name__
+    return "BaseException"
+
+
+class _Discard(io.TextIOBase):
+    """stdout/stderr for submitted code: printing costs nothing and is never read."""
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        return len(text)
+
+
+def make_args(kinds, n):
+    """Arguments of input size `n` for parameters of the given kinds (same n, same values, every time)."""
+    rng = random.Random(n)
+    args = []
+    for kind in kinds:
+        if kind == "int":
+            args.append(n)
+        elif kind == "float":
+            args.append(float(n))
+        elif kind == "bool":
+            args.append(True)
+        elif kind == "str":
+            args.append("".join(rng.choice(string.ascii_lowercase) for _ in range(n)))
+        elif kind == "list[str]":
+            args.append(["".join(rng.choice(string.ascii_lowercase) for _ in range(5)) for _ in range(n)])
+        elif kind == "dict":
+            args.append({i: rng.randrange(n) for i in range(n)})
+        elif kind == "set":
+            args.append(set(range(n)))
+        elif kind == "tuple":
+            args.append(tuple(rng.randrange(n) for _ in range(n)))
+        else:  # "list"
+            args.append([rng.randrange(n) for _ in range(n)])
+    return args
+
+
+def _call(fn, args):
+    result = fn(*args)
+    if inspect.isgenerator(result):  # a generator does its work as it's consumed
+        collections.deque(result, maxlen=0)
+
+
+def _batch(fn, args, number):
+    gc.disable()  # as timeit does: collections would land on random calls
+    try:
+        started = time.perf_counter()
+        for _ in range(number):
+            _call(fn, args)
+        return time.perf_counter() - started
+    finally:
+        gc.enable()
+
+
+def measure(fn, kinds, n, min_batch, repeat):
+    """(best seconds per call, traced peak bytes) for one input size, timeit-style."""
+    args = make_args(kinds, n)
+    number = 1
+    while True:
+        elapsed = _batch(fn, args, number)
+        if elapsed >= min_batch or number >= 1 << 20:
+            break
+        number *= 2 if elapsed * 4 >= min_batch else 10
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        best = min(best, _batch(fn, make_args(kinds, n), number) / number)
+
+    args = make_args(kinds, n)
+    tracemalloc.start()
+    try:
+        _call(fn, args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def _on_alarm(signum, frame):
+    raise OutOfTime()
+
+
+def profile_function(fn, spec, job, emit):
+    points = []
+    result = {"name": spec["name"], "status": "measured", "error": None, "points": points}
+    budget = job["budget_seconds"]
+    deadline = time.perf_counter() + budget
+    signal.setitimer(signal.ITIMER_REAL, budget)
+    previous = None
+    try:
+        for n in job["sizes"]:
+            started = time.perf_counter()
+            seconds, peak = measure(fn, spec["params"], n, job["min_batch_seconds"], job["repeat"])
+            points.append([n, seconds, peak])
+            # Stop before the budget is blown: the next size costs at least
+            # twice this one, more if the calls have been growing faster
+            # (plus slack for the traced call, which allocation makes slow)
+            spent = time.perf_counter() - started
+            growth = max(2.0, seconds / previous) if previous else 2.0
+            previous = seconds
+            if time.perf_counter() + 1.5 * spent * growth > deadline:
+                break
+    except OutOfTime:
+        result["status"] = "timeout"
+    except MemoryError:
+        result["status"], result["error"] = "error", MEMORY_ERROR
+    except RecursionError:
+        result["status"], result["error"] = "error", RECURSION_ERROR
+    except BaseException as exc:  # SystemExit too: one function calling exit() shouldn't end the run
+        result["status"], result["error"] = "error", error_name(exc)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        tracemalloc.stop()
+    emit({"function": result})
+
+
+def main():
+    job = json.loads(sys.stdin.read())
+    out = open(os.dup(1), "w", encoding="utf-8")
+
+    def emit(message):
+        out.write(RESULT_PREFIX + json.dumps(message) + "\n")
+        out.flush()
+
+    try:
+        tree = ast.parse(job["code"], "<submission>")
+        code = compile(tree, "<submission>", "exec")
+    except (SyntaxError, ValueError) as exc:
+        emit({"error": error_name(exc)})
+        return
+
+    signal.signal(signal.SIGALRM, _on_alarm)
+    if resource is not None:
+        limit(job["cpu_seconds"], job["memory_mb"])
+    # ⛔ From here on, nothing can open a socket, start a process or write a file
+    sys.addaudithook(_audit)
+    sys.stdin = io.StringIO()
+    sys.stdout = sys.stderr = _Discard()
+    preload(tree)
+    try:
+        drop_privileges(job["user"])
+    except (KeyError, OSError) as exc:
+        emit({"error": f"couldn't switch to the sandbox user ({error_name(exc)})"})
+        return
+
+    namespace = {"__name__": "__sandbox__", "__builtins__": __builtins__}
+    signal.setitimer(signal.ITIMER_REAL, job["budget_seconds"])
+    try:
+        exec(code, namespace)
+    except OutOfTime:
+        emit({"error": "module-level code ran out of time"})
+        return
+    except BaseException as exc:
+        emit({"error": f"module-level code raised {error_name(exc)}"})
+        return
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+    for spec in job["functions"]:
+        fn = namespace.get(spec["name"])
+        if not callable(fn):
+            emit({"function": {"name": spec["name"], "status": "error", "error": UNDEFINED, "points": []}})
+            continue
+        profile_function(fn, spec, job, emit)
+    emit({"done": True})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+# app/core/symbol_index.py
+
+import hashlib
+import json
+import logging
+import os
+import posixpath
+import sqlite3
+from typing import Dict, Iterable, List, Optional
+
+from app.core import config
+from app.core.findings import Finding
+from app.core.result_cache import analyzer_version
+from app.utils.gpt_logic_checker import Signature, call_findings, symbol_facts
+
+logger = logging.getLogger(__name__)
+
+# 🔖 Bump when the stored entry layout changes
+INDEX_VERSION = "1"
+# Re-exports followed before giving up on a name (also ends import cycles)
+_MAX_HOPS = 5
+
+
+def module_names(path: str) -> List[str]:
+    """
+    Every dotted name `path` could be imported as, longest first:
+    "src/pkg/mod.py" → src.pkg.mod, pkg.mod, mod (the project root isn't
+    known, so neither is the import root).
+    """
+    parts = path.replace("\\", "/")[:-len(".py")].split("/")
+    if parts[-1] == "__init__":
+        parts.pop()
+    parts = [part for part in parts if part and part != "."]
+    return [".".join(parts[i:]) for i in range(len(parts))]
+
+
+def _absolute(target: str, path: str) -> str:
+    """An import target made absolute: from .x import f in a/b/c.py → a.b.x.f."""
+    level = len(target) - len(target.lstrip("."))
+    if not level:
+        return target
+    package = posixpath.dirname(path.replace("\\", "/")).split("/")
+    package = package[:len(package) - (level - 1)] if level > 1 else package
+    return ".".join([part for part in package if part] + [target[level:]]).rstrip(".")
+
+
+def file_symbols(path: str, code: str) -> dict:
+    """
+    The index entry for one Python file: what it defines at module level,
+    what it imports, and its calls into imported names (the ones a
+    single-file review can't check). Unparseable files define nothing.
+    """
+    facts = symbol_facts(code)
+    if facts is None:
+        return {"exports": {}, "imports": {}, "calls": []}
+    imports = {name: _absolute(target, path) for name, target in facts["imports"].items()}
+    local = facts["defs"]
+    calls = [
+        call for call in facts["calls"]
+        if call[0] not in local and call[0].split(".", 1)[0] in imports
+    ]
+    return {
+        "exports": {key: local[key] for key in facts["exports"]},
+        "imports": imports,
+        "calls": calls,
+    }
+
+
+class SymbolIndex:
+    """
+    Function signatures, classes and imports across every Python file of a
+    project, for checking calls from one file into another.
+
+    update() only re-parses files whose content changed since the index
+    last saw them, and lookups are dict hits (module name → file → name),
+    so re-checking a large project after a small change stays cheap. With
+    a `project` id the index is persisted (SYMBOL_INDEX_PATH) and reloaded
+    by the next review of the same project.
+    """
+
+    def __init__(self, project: Optional[str] = None, path: Optional[str] = None):
+        self.project = project
+        self.store_path = config.SYMBOL_INDEX_PATH if path is None else path
+        self.version = f"{INDEX_VERSION}-{analyzer_version()}"
+        self.files: Dict[str, dict] = {}  # path -> entry (see file_symbols, plus "digest")
+        self._changed = set()  # paths to write back
+        self._removed = set()
+        self._seen = set()  # paths passed to update() in this review
+        self._modules: Optional[Dict[str, Optional[str]]] = None  # dotted name -> path (None: ambiguous)
+        self.indexed = 0
+        self.reused = 0
+        if project and self.store_path:
+            self._load()
+
+    # 💾 Persistence: one row per (project, file), rewritten only when the file changes
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.store_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.store_path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS symbol_files (
+                project TEXT NOT NULL,
+                path TEXT NOT NULL,
+                version TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                entry TEXT NOT NULL,
+                PRIMARY KEY (project, path)
+            )
+            """
+        )
+        return conn
+
+    def _load(self):
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT path, digest, entry FROM symbol_files WHERE project = ? AND version = ?",
+                    (self.project, self.version),
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            logger.exception("Could not load the symbol index of %s", self.project)
+            return
+        for path, digest, entry in rows:
+            self.files[path] = {**json.loads(entry), "digest": digest}
+
+    def save(self, complete: bool = True):
+        """
+        Write changed entries back. `complete`: every file of the project
+        went through update(), so files it didn't see were deleted.
+        """
+        if complete:
+            self._removed |= set(self.files) - self._seen
+            for path in self._removed:
+                self.files.pop(path, None)
+        if not (self.project and self.store_path) or not (self._changed or self._removed):
+            return
+        rows = []
+        for path in self._changed:
+            entry = dict(self.files[path])
+            digest = entry.pop("digest")
+            rows.append((self.project, path, self.version, digest, json.dumps(entry, separators=(",", ":"))))
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO symbol_files (project, path, version, digest, entry) VALUES (?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                    conn.executemany(
+                        "DELETE FROM symbol_files WHERE project = ? AND path = ?",
+                        [(self.project, path) for path in self._removed],
+                    )
+                    # Rows an older analyzer wrote are never read again
+                    conn.execute("DELETE FROM symbol_files WHERE project = ? AND version != ?", (self.project, self.version))
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            logger.exception("Could not save the symbol index of %s", self.project)
+            return
+        self._changed.clear()
+        self._removed.clear()
+
+    def update(self, path: str, code: str) -> bool:
+        """Index `path` if its content changed (or is new); True if it was re-parsed."""
+        self._seen.add(path)
+        digest = hashlib.sha256(code.encode("utf-8", "surrogatepass")).hexdigest()
+        entry = self.files.get(path)
+        if entry is not None and entry["digest"] == digest:
+            self.reused += 1
+            return False
+        self.files[path] = {**file_symbols(path, code), "digest": digest}
+        self._changed.add(path)
+        self._modules = None
+        self.indexed += 1
+        return True
+
+    def _module_map(self) -> Dict[str, Optional[str]]:
+        if self._modules is None:
+            modules: Dict[str, Optional[str]] = {}
+            for path in self.files:
+                for name in module_names(path):
+                    # Two files answer to the same name: can't tell which one is meant
+                    modules[name] = path if modules.get(name, path) == path else None
+            self._modules = modules
+        return self._modules
+
+    def lookup(self, target: str, hops: int = 0) -> Optional[Signature]:
+        """Signature of an absolute dotted name ("pkg.mod.func", "pkg.mod.Class.method"), if the project defines it."""
+        modules = self._module_map()
+        parts = target.split(".")
+        for cut in range(len(parts) - 1, 0, -1):
+            path = modules.get(".".join(parts[:cut]))
+            if path is None:
+                continue
+            entry = self.files[path]
+            name = ".".join(parts[cut:])
+            if name in entry["exports"]:
+                return entry["exports"][name]
+            # Re-exported: from .impl import func in a package __init__
+            head, _, rest = name.partition(".")
+            if head in entry["imports"] and hops < _MAX_HOPS:
+                forwarded = entry["imports"][head] + ("." + rest if rest else "")
+                return self.lookup(forwarded, hops + 1)
+            return None
+        return None
+
+    def check(self, paths: Optional[Iterable[str]] = None) -> Dict[str, List[Finding]]:
+        """Cross-file call findings (arity, unreachable after a call), by path; every file by default."""
+        results = {}
+        resolved: Dict[str, Optional[Signature]] = {}  # most targets are called from many files
+        for path in self.files if paths is None else paths:
+            entry = self.files[path]
+            imports = entry["imports"]
+
+            def resolve(key: str) -> Optional[Signature]:
+                head, _, rest = key.partition(".")
+                target = imports[head] + ("." + rest if rest else "")
+                if target not in resolved:
+                    sig = self.lookup(target)
+                    resolved[target] = Signature(*sig) if sig is not None else None
+                return resolved[target]
+
+            findings = call_findings(entry["calls"], resolve)
+            if findings:
+                results[path] = findings
+        return results
@@ -0,0 +1,42 @@
+# app/core/warmup.py
+
+import importlib
+import logging
+import time
+
+from app.core import workers
+
+logger = logging.getLogger(__name__)
+
+# 🐢 Loaded by the first request that needs them, never by `import app.main`:
+# together they are most of the import time (SQLAlchemy, ReportLab, every
+# analyzer). benchmarks/bench_import_time.py checks they stay out.
+LAZY_MODULES = (
+    "app.core.review_pipeline",  # analyzers, result cache
+    "app.core.incremental",
+    "app.core.review_stream",
+    "app.core.live_review",
+    "app.core.project_review",
+    "app.core.database",  # SQLAlchemy, models
+    "app.core.review_writer",
+    "app.core.review_history",
+    "app.core.pdf_generator",  # ReportLab
+)
+# Third-party packages that must not be imported at startup either
+LAZY_PACKAGES = ("sqlalchemy", "reportlab")
+
+
+def warm_up():
+    """
+    Pay for everything that is otherwise lazy right now: imports, the
+    schema check and the worker processes. For deployments that would
+    rather start slower than serve a slow first request (WARMUP=1).
+    """
+    started = time.perf_counter()
+    for name in LAZY_MODULES:
+        importlib.import_module(name)
+
+    from app.core.database import ensure_db
+    ensure_db()
+    workers.warm_up()
+    logger.info("Warm-up done in %.2fs", time.perf_counter() - started)
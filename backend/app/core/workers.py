@@ -0,0 +1,191 @@
+# app/core/workers.py
+
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+try:
+    import resource  # POSIX only
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+from app.core import config
+
+logger = logging.getLogger(__name__)
+
+# Extra time the parent waits beyond the in-worker alarm before it decides
+# the worker is stuck in C code (e.g. a pathological regex) and kills it.
+_HARD_TIMEOUT_GRACE = 2.0
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+# Memory cap actually applied in this process (set by _init_worker)
+_memory_limit_mb = 0
+
+
+class AnalysisAborted(Exception):
+    """An analysis hit its time or memory cap (or its worker died)."""
+
+
+def pool_size() -> int:
+    """Configured worker count; 0 means run analysis in the calling thread."""
+    if config.ANALYSIS_WORKERS < 0:
+        return os.cpu_count() or 1
+    return config.ANALYSIS_WORKERS
+
+
+def _init_worker(memory_limit_mb: int):
+    global _memory_limit_mb
+    _memory_limit_mb = memory_limit_mb
+    # 🧱 Memory ceiling for everything this worker process allocates
+    if resource is not None and memory_limit_mb > 0:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    # Pre-import the analyzers so the first review doesn't pay for it
+    import app.core.review_pipeline  # noqa: F401
+
+
+def _guarded(fn, args, timeout: float, use_alarm: bool):
+    """Run fn(*args), turning cap violations into AnalysisAborted."""
+    def on_alarm(signum, frame):
+        raise AnalysisAborted(f"time limit of {timeout}s exceeded")
+
+    if use_alarm:
+        signal.signal(signal.SIGALRM, on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return fn(*args)
+    except MemoryError:
+        raise AnalysisAborted(f"memory limit of {_memory_limit_mb} MB exceeded" if _memory_limit_mb else "out of memory")
+    except RecursionError:
+        raise AnalysisAborted("input is nested too deeply to analyze")
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def get_pool() -> Optional[ProcessPoolExecutor]:
+    """The shared analysis process pool, created on first use."""
+    global _pool
+    if pool_size() == 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # "spawn" rather than fork: request threads may hold locks
+            # (SQLite connections, caches) that a forked child would inherit.
+            _pool = ProcessPoolExecutor(
+                max_workers=pool_size(),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(config.ANALYSIS_MEMORY_LIMIT_MB,),
+            )
+        return _pool
+
+
+def submit(fn, *args, inline: bool = False) -> Future:
+    """
+    Run fn(*args) on the pool under the time and memory caps, or inline
+    when pooling is disabled or `inline` is set (inline runs get no time or
+    memory cap, since signals and rlimits would hit the whole server).
+    """
+    timeout = config.ANALYSIS_TIMEOUT_SECONDS
+    pool = None if inline else get_pool()
+    if pool is not None:
+        try:
+            future = pool.submit(_guarded, fn, args, timeout, hasattr(signal, "setitimer"))
+        except BrokenProcessPool:
+            recycle(pool)
+            pool = get_pool()
+            future = pool.submit(_guarded, fn, args, timeout, hasattr(signal, "setitimer"))
+        future.pool = pool  # so collect() recycles the pool that ran it, not a newer one
+        return future
+    future: Future = Future()
+    try:
+        future.set_result(_guarded(fn, args, timeout, False))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+def collect(future: Future):
+    """
+    Wait for a submitted job. A worker that overruns its alarm (stuck in C
+    code) is killed along with its pool, and a crashed worker is replaced;
+    both surface as AnalysisAborted.
+    """
+    # The clock only starts once the job leaves the queue. "Running" means it
+    # was handed to the call queue, which may still hold one job ahead of it,
+    # hence two full time limits before the worker is declared stuck.
+    hard_timeout = 2 * config.ANALYSIS_TIMEOUT_SECONDS + _HARD_TIMEOUT_GRACE
+    started = None
+    try:
+        while True:
+            if started is None:
+                wait_for = 0.25
+            else:
+                wait_for = max(0.0, started + hard_timeout - time.monotonic())
+            try:
+                return future.result(timeout=wait_for)
+            except FutureTimeout:
+                if started is None:
+                    if future.running():
+                        started = time.monotonic()
+                    continue
+                recycle(getattr(future, "pool", None))
+                raise AnalysisAborted(f"time limit of {config.ANALYSIS_TIMEOUT_SECONDS}s exceeded")
+    except BrokenProcessPool:
+        recycle(getattr(future, "pool", None))
+        raise AnalysisAborted("analysis worker crashed (likely out of memory)")
+
+
+def run(fn, *args):
+    """submit() + collect()."""
+    return collect(submit(fn, *args))
+
+
+def _noop():
+    return os.getpid()
+
+
+def warm_up():
+    """Start every worker process now instead of on the first request."""
+    pool = get_pool()
+    if pool is None:
+        return
+    futures = [pool.submit(_noop) for _ in range(pool_size())]
+    for future in futures:
+        future.result()
+
+
+def recycle(pool: Optional[ProcessPoolExecutor] = None):
+    """
+    Kill a pool's processes (a stuck job cannot be cancelled) so a fresh
+    pool starts on next use. `pool` defaults to the current one; passing
+    the pool that ran a job means a newer replacement is never touched.
+    """
+    global _pool
+    with _pool_lock:
+        if pool is None:
+            pool = _pool
+        if pool is None:
+            return
+        if _pool is pool:
+            _pool = None
+    logger.warning("Recycling analysis process pool")
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown(wait: bool = True):
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=wait, cancel_futures=not wait)
+            _pool = None
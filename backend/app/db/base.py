@@ -1,3 +1 @@
-from sqlalchemy.orm import declarative_base
-
-Base = declarative_base()
+from app.models.code_review import Base  # noqa: F401
@@ -1,9 +1,9 @@
-from app.db.session import engine
-from app.db.models import Base
+from app.core.database import init_db as _init_db
+
 
 def init_db():
     print("✅ Initializing the database...")
-    Base.metadata.create_all(bind=engine)
+    _init_db()
     print("✅ Database initialized.")
 
 if __name__ == "__main__":
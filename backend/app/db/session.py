@@ -1,8 +1,2 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
-# Update this with your real DB URI
-SQLALCHEMY_DATABASE_URL = "sqlite:///./sql_app.db"
-
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Kept for old imports: the engine and sessions are configured once, in app.core.database
+from app.core.database import DATABASE_URL as SQLALCHEMY_DATABASE_URL, SessionLocal, engine  # noqa: F401
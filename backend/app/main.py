@@ -1,13 +1,46 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
+from fastapi.staticfiles import StaticFiles
 import os
+import sys
+import time
 
 from app.api.v1.endpoints import submit_code      # ✅ /review endpoint
 from app.api.v1.endpoints import style_analysis   # ✅ /style-check endpoint
 from app.api.v1.endpoints import analyze_endpoints  # ✅ /analyze/bugs & /analyze/optimize endpoints
+from app.api.v1.endpoints import reviews          # ✅ /reviews/{uid}/report.pdf on-demand reports
+from app.api.v1.endpoints import project_review   # ✅ /review/project/* whole-project reviews
+from app.api.v1.endpoints import admin            # 🔐 /admin/* stored profiles
+from app.api.v1.endpoints import live_review      # ⌨️ /review/live as-you-type reviews (WebSocket)
+from app.core import config, metrics, workers
+
+# 🐢 Nothing heavy is imported above: analyzers, SQLAlchemy (and the schema
+# check) and ReportLab load on the first request that needs them
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 🔥 Optionally load all of it now, so the first request isn't a cold start
+    if config.WARMUP:
+        from app.core import warmup
+        warmup.warm_up()
+    yield
+    # 🛑 Let in-progress PDF renders and analyses finish before the worker exits
+    # (a module that was never loaded has nothing to wait for)
+    report_store = sys.modules.get("app.core.report_store")
+    if report_store is not None:
+        report_store.shutdown(wait=True)
+    workers.shutdown(wait=True)
+    # 💾 Write out reviews still in the write-behind queue
+    review_writer = sys.modules.get("app.core.review_writer")
+    if review_writer is not None:
+        review_writer.review_writer.shutdown()
+
 
-app = FastAPI(title="Code Review Assistant")
+app = FastAPI(title="Code Review Assistant", lifespan=lifespan)
 
 # ✅ CORS middleware
 app.add_middleware(
@@ -18,6 +51,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _route_label(request: Request) -> str:
+    """Request path with its path parameters templated back in, so ids don't blow up label counts."""
+    if request.scope.get("route") is None:
+        return "unmatched"
+    path = request.url.path
+    for name, value in request.path_params.items():
+        path = path.replace(f"/{value}", f"/{{{name}}}", 1)
+    return path
+
+# ⏱️ Per-request stage timings: exported to /metrics and sent back as Server-Timing
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    started = time.perf_counter()
+    with metrics.collect() as timings:
+        response = await call_next(request)
+    elapsed = time.perf_counter() - started
+
+    path = _route_label(request)
+    timings.publish()
+    metrics.REQUESTS.inc(method=request.method, route=path, status=response.status_code)
+    metrics.REQUEST_SECONDS.observe(elapsed, method=request.method, route=path)
+    response.headers["Server-Timing"] = timings.server_timing(total=elapsed)
+    return response
+
+# 📈 Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
 # ✅ Root route
 @app.get("/")
 def read_root():
@@ -29,9 +91,16 @@ def favicon():
     favicon_path = os.path.join("app", "static", "favicon.ico")
     return FileResponse(favicon_path)
 
+# 📄 Static assets and previously generated PDF reports
+app.mount("/static", StaticFiles(directory=config.REPORT_DIR, check_dir=False), name="static")
+
 # ✅ Register API endpoints
 app.include_router(submit_code.router, prefix="/api/v1")
 app.include_router(style_analysis.router, prefix="/api/v1")
 app.include_router(analyze_endpoints.router, prefix="/api/v1")  # 🆕 Added for bug & optimization analysis
+app.include_router(reviews.router, prefix="/api/v1")
+app.include_router(project_review.router, prefix="/api/v1")
+app.include_router(admin.router, prefix="/api/v1")
+app.include_router(live_review.router, prefix="/api/v1")
 
 
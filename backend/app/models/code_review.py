@@ -1,18 +1,87 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Date, Index, Integer, LargeBinary, String, Text, DateTime
 from sqlalchemy.orm import declarative_base
 from datetime import datetime, timezone
+import uuid
 
 Base = declarative_base()
 
 class CodeReview(Base):
     __tablename__ = "code_reviews"
+    # 📇 Listing is newest first, keyset-paginated on (created_at, id); each
+    # common filter gets its own prefix so it is a range scan, not a full scan
+    __table_args__ = (
+        Index("ix_code_reviews_created_id", "created_at", "id"),
+        Index("ix_code_reviews_language_created_id", "language", "created_at", "id"),
+        Index("ix_code_reviews_remark_created_id", "remark", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    code = Column(Text, nullable=False)
+    # 🔐 Public, unguessable id used in report URLs (sequential ids would let
+    # anyone enumerate other people's submitted code)
+    uid = Column(String(32), unique=True, index=True, default=lambda: uuid.uuid4().hex)
+    # 🗜️ Source lives once per sha256 in code_blobs and findings in
+    # review_findings; code and the four text columns below are only filled
+    # in on rows written before that (and on rows still in the write queue)
+    code_sha256 = Column(String(64), index=True)
+    code = Column(Text, nullable=False, default="")
     language = Column(String(30), default="python")
     suggestions = Column(Text)
     warnings = Column(Text)
     optimizations = Column(Text)
+    bugs = Column(Text)  # JSON-encoded list of bug dicts
     score = Column(Integer)
     remark = Column(String(100))
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
\ No newline at end of file
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+class ReviewRollup(Base):
+    """
+    Review counts per day, language and score decile, updated in the same
+    transaction that inserts the reviews, so /reviews/stats never scans
+    code_reviews.
+    """
+    __tablename__ = "review_rollups"
+
+    day = Column(Date, primary_key=True)
+    language = Column(String(30), primary_key=True)
+    score_bucket = Column(Integer, primary_key=True)  # 0 = 0-9 ... 9 = 90-100
+    reviews = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Integer, nullable=False, default=0)
+
+
+class CodeBlob(Base):
+    """Submitted source, zlib-compressed, stored once however often it is reviewed."""
+    __tablename__ = "code_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(Integer, nullable=False)  # uncompressed, in bytes
+    data = Column(LargeBinary, nullable=False)
+
+
+class MessageTemplate(Base):
+    """Exact wording a finding was rendered with (see app/core/message_catalog.py)."""
+    __tablename__ = "message_templates"
+
+    id = Column(String(16), primary_key=True)  # sha256 prefix of the template text
+    rule_id = Column(String(64), nullable=False)
+    template = Column(Text, nullable=False)
+
+
+class ReviewFinding(Base):
+    __tablename__ = "review_findings"
+    __table_args__ = (
+        Index("ix_review_findings_review_position", "review_uid", "position"),
+        Index("ix_review_findings_rule", "rule_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    review_uid = Column(String(32), nullable=False)
+    position = Column(Integer, nullable=False)  # order within the review
+    kind = Column(String(12), nullable=False)  # suggestion, warning, optimization, bug
+    rule_id = Column(String(64), nullable=False)
+    severity = Column(String(10))
+    line = Column(Integer)
+    end_line = Column(Integer)
+    count = Column(Integer, nullable=False, default=1)  # occurrences folded into this row
+    template_id = Column(String(16), nullable=False)
+    args = Column(Text)  # JSON object, NULL when the template takes none
@@ -1,38 +1,38 @@
 # app/utils/bug_detector.py
 
 import ast
-from typing import List, Dict
-
-def detect_bugs(code: str) -> List[Dict[str, str]]:
-    bugs = []
-
-    try:
-        tree = ast.parse(code)
-
-        for node in ast.walk(tree):
-            # Bug 1: Using 'sum' as variable
-            if isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name) and target.id == 'sum':
-                        bugs.append({
-                            "message": "Avoid using 'sum' as a variable (shadows built-in).",
-                            "severity": "medium",
-                            "tip": "Using 'sum' as a variable name overrides Python’s built-in sum() function, which can cause unexpected behavior."
-                        })
-
-            # Bug 2: Unused pass
-            if isinstance(node, ast.Pass):
-                bugs.append({
-                    "message": "Consider removing unused 'pass' statement (possible dead code).",
-                    "severity": "low",
-                    "tip": "'pass' can be removed unless you're using it as a placeholder for future code."
-                })
-
-    except SyntaxError:
-        bugs.append({
-            "message": "Syntax Error in code. Unable to parse.",
-            "severity": "high",
-            "tip": "Check for typos or indentation issues in your code."
-        })
-
-    return bugs
+from typing import List, Dict, Union
+
+from app.core.analysis_context import AnalysisContext, registry
+from app.core.findings import Finding, aggregate, render_all
+from app.core.metrics import stage
+
+
+# Bug 1: Using 'sum' as variable
+@registry.rule("bugs", ast.Assign)
+def _shadowed_sum(node, ancestors, state):
+    for target in node.targets:
+        if isinstance(target, ast.Name) and target.id == 'sum':
+            state.findings.append(Finding("bug.shadowed-sum", line=node.lineno))
+
+
+# Bug 2: Unused pass
+@registry.rule("bugs", ast.Pass)
+def _unused_pass(node, ancestors, state):
+    state.findings.append(Finding("bug.unused-pass", line=node.lineno))
+
+
+@stage("bugs")
+def bug_findings(code: Union[str, AnalysisContext]) -> List[Finding]:
+    ctx = AnalysisContext.of(code)
+    state = ctx.rules("bugs")
+
+    if state is None:
+        return [Finding("bug.syntax-error")]
+
+    return list(state.findings)
+
+
+def detect_bugs(code: Union[str, AnalysisContext]) -> List[Dict[str, str]]:
+    """bug_findings() as message/severity/tip dicts, one per distinct bug."""
+    return render_all(aggregate(bug_findings(code)))
@@ -2,59 +2,332 @@
 
 import ast
 import re
-from typing import List
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
 
-def detect_logic_flaws(code: str) -> List[str]:
+from app.core.analysis_context import AnalysisContext, registry
+from app.core.findings import Finding, aggregate, render_all
+from app.core.metrics import stage
+
+# Decorators that keep a function's signature as written (any other one may
+# wrap it in something with a different signature: those aren't checked)
+_PLAIN_DECORATORS = {"staticmethod", "classmethod", "wraps", "functools.wraps", "lru_cache", "functools.lru_cache", "cache"}
+# Calls after which a function never returns normally
+_EXITS = {"sys.exit", "exit", "quit", "os._exit", "os.abort"}
+_BLOCK_FIELDS = ("body", "orelse", "finalbody")
+
+
+class Signature(NamedTuple):
+    """What a call has to look like. Stored as a plain list in cached facts: rebuild with Signature(*value)."""
+    params: Sequence[str]  # positional parameters (bound self/cls dropped)
+    positional_only: int  # how many of `params` can't be passed by keyword
+    required: int  # how many of `params` have no default
+    varargs: bool
+    kwonly: Sequence[str]
+    kwonly_required: Sequence[str]
+    varkw: bool
+    returns: bool = True  # False when the body always ends in raise / sys.exit() (never for methods)
+
+
+# A call site: (callee key, positional args, keyword names, has *x/**y,
+# line, line of the statement right after it if the call is a statement)
+Call = Tuple[str, int, List[str], bool, int, int]
+
+
+def _dotted(node: ast.AST) -> Optional[str]:
+    """'a.b.c' for Name/Attribute chains, None for anything else."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def _plain(node: Union[ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef]) -> bool:
+    for decorator in node.decorator_list:
+        if isinstance(decorator, ast.Call):
+            decorator = decorator.func
+        if _dotted(decorator) not in _PLAIN_DECORATORS:
+            return False
+    return True
+
+
+def _never_returns(body: List[ast.stmt]) -> bool:
+    last = body[-1]
+    if isinstance(last, ast.Raise):
+        # raise NotImplementedError: a stub meant to be overridden
+        return _dotted(last.exc.func if isinstance(last.exc, ast.Call) else last.exc) != "NotImplementedError"
+    return isinstance(last, ast.Expr) and isinstance(last.value, ast.Call) and _dotted(last.value.func) in _EXITS
+
+
+def signature_of(node: Union[ast.FunctionDef, ast.AsyncFunctionDef], bound: bool = False) -> Signature:
     """
-    Heuristic “logic flaw” detector:
-      - Flags functions called with wrong number of args
-      - Marks unreachable code after a return
-      - Detects assignments in `if` instead of comparisons
+    Signature of a def; `bound` drops the first parameter (self / cls).
+    A subclass may override a method, so methods are always assumed to return.
+    """
+    args = node.args
+    params = [a.arg for a in args.posonlyargs + args.args]
+    positional_only = len(args.posonlyargs)
+    required = len(params) - len(args.defaults)
+    if bound and params:
+        params = params[1:]
+        positional_only = max(0, positional_only - 1)
+        required = max(0, required - 1)
+    kwonly = [a.arg for a in args.kwonlyargs]
+    kwonly_required = [a.arg for a, default in zip(args.kwonlyargs, args.kw_defaults) if default is None]
+    return Signature(params, positional_only, required, args.vararg is not None, kwonly, kwonly_required,
+                     args.kwarg is not None, bound or not _never_returns(node.body))
 
-    Returns a list of human-friendly messages.
+
+def _expected(sig: Signature) -> str:
+    if sig.varargs:
+        return f"at least {sig.required}"
+    if sig.required == len(sig.params):
+        return str(sig.required)
+    return f"{sig.required}-{len(sig.params)}"
+
+
+def call_problem(sig: Signature, positional: int, keywords: Sequence[str], unpacked: bool) -> Optional[Tuple[str, dict]]:
+    """(rule id, template args) if a call can't bind to `sig`; None if it can, or can't be told (*x / **y)."""
+    if unpacked:
+        return None
+    params = sig.params
+    if positional > len(params) and not sig.varargs:
+        return "logic.arg-count", {"actual": positional, "expected": _expected(sig)}
+
+    if keywords and not sig.varkw:
+        by_keyword = set(params[sig.positional_only:]) | set(sig.kwonly)
+        for keyword in keywords:
+            if keyword not in by_keyword:
+                return "logic.unknown-keyword", {"keyword": keyword}
+
+    for param in params[positional:sig.required]:
+        if param not in keywords:
+            if not keywords:
+                return "logic.arg-count", {"actual": positional, "expected": _expected(sig)}
+            return "logic.missing-argument", {"param": param}
+    for param in sig.kwonly_required:
+        if param not in keywords:
+            return "logic.missing-argument", {"param": param}
+    return None
+
+
+def call_findings(calls: List[Call], lookup: Callable[[str], Optional[Signature]], lines: bool = True) -> List[Finding]:
     """
-    flaws: List[str] = []
+    Arity and unreachable-after-call findings for `calls`, against whatever
+    `lookup(key)` knows (a Signature, or None to skip the call).
+    """
+    findings = []
+    for key, positional, keywords, unpacked, line, next_line in calls:
+        sig = lookup(key)
+        if sig is None:
+            continue
+        if type(sig) is not Signature:
+            sig = Signature(*sig)  # plain list when read back from a cache
+        name = key.replace("().", ".")
+        problem = call_problem(sig, positional, keywords, unpacked)
+        if problem is not None:
+            rule, args = problem
+            findings.append(Finding(rule, {"name": name, **args}, line if lines else None))
+        if next_line and not sig.returns:
+            findings.append(Finding("logic.unreachable-after-call", {"name": name}, next_line if lines else None))
+    return findings
+
+
+@registry.initializer("logic")
+def _init(state):
+    state.defs = {}  # callee key -> Signature (None: can't tell)
+    state.exports = []  # keys defined at module level
+    state.imports = {}  # local name -> what it was imported as ("pkg.mod.f", ".sibling")
+    state.calls = []
+    state.unreachable = []
+    state.following = {}  # id(block owner) -> {id(statement): line of the next one}
+
+
+def _enclosing_class(ancestors) -> Optional[ast.ClassDef]:
+    for node in reversed(ancestors):
+        if isinstance(node, ast.ClassDef):
+            return node
+    return None
+
+
+# 1) Map each function to its signature (methods called on self as
+#    "Class().method", static and class methods also as "Class.method",
+#    classes by their __init__), and flag unreachable code after a return
+#    inside the function body
+@registry.rule("logic", ast.FunctionDef, ast.AsyncFunctionDef)
+def _function_def(node, ancestors, state):
+    parent = ancestors[-1]
+    if isinstance(parent, ast.ClassDef):
+        decorators = {_dotted(d) for d in node.decorator_list}
+        static = "staticmethod" in decorators
+        sig = signature_of(node, bound=not static) if _plain(node) else None
+        state.defs[f"{parent.name}().{node.name}"] = sig
+        # Class.method(obj, ...) passes self explicitly: only check those two
+        if static or "classmethod" in decorators:
+            state.defs[f"{parent.name}.{node.name}"] = sig
+            if len(ancestors) == 2:
+                state.exports.append(f"{parent.name}.{node.name}")
+    else:
+        state.defs[node.name] = signature_of(node) if _plain(node) else None
+        if len(ancestors) == 1:
+            state.exports.append(node.name)
 
-    try:
-        tree = ast.parse(code)
-    except SyntaxError:
-        return ["❌ Syntax error in code; unable to analyze logic."]
+    for stmt in node.body[:-1]:
+        if isinstance(stmt, ast.Return):
+            state.unreachable.append(Finding("logic.unreachable", {"name": node.name}, stmt.lineno))
+            break  # only report once per function
 
-    # 1) Map each function name → expected arg count
-    func_arg_counts = {
-        node.name: len(node.args.args)
-        for node in ast.walk(tree)
-        if isinstance(node, ast.FunctionDef)
+
+@registry.rule("logic", ast.ClassDef)
+def _class_def(node, ancestors, state):
+    init = None
+    for stmt in node.body:
+        if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)) and stmt.name in ("__init__", "__new__"):
+            init = stmt if stmt.name == "__init__" and init is None else False
+    # No __init__ of its own: it inherits one we can't see
+    state.defs[node.name] = signature_of(init, bound=True) if init and _plain(node) and not node.keywords else None
+    if len(ancestors) == 1:
+        state.exports.append(node.name)
+
+
+@registry.rule("logic", ast.Import, ast.ImportFrom)
+def _import(node, ancestors, state):
+    for alias in node.names:
+        if isinstance(node, ast.Import):
+            if alias.asname:
+                state.imports[alias.asname] = alias.name
+            else:
+                head = alias.name.split(".")[0]
+                state.imports[head] = head
+        elif alias.name != "*":
+            module = "." * node.level + (node.module or "")
+            separator = "" if module.endswith(".") or not module else "."
+            state.imports[alias.asname or alias.name] = f"{module}{separator}{alias.name}"
+
+
+def _next_line(stmt: ast.stmt, owner: ast.AST, state) -> int:
+    """Line of the statement after `stmt` in the same block (0 if it's the last one)."""
+    following = state.following.get(id(owner))
+    if following is None:
+        following = state.following[id(owner)] = {}
+        for field in _BLOCK_FIELDS:
+            block = getattr(owner, field, None)
+            if isinstance(block, list):
+                for current, after in zip(block, block[1:]):
+                    following[id(current)] = after.lineno
+    return following.get(id(stmt), 0)
+
+
+# 2) Collect calls so they can be checked once every def has been seen
+#    (see logic_flaws, and app/core/symbol_index.py across files)
+@registry.rule("logic", ast.Call)
+def _call(node, ancestors, state):
+    key = _dotted(node.func)
+    if key is None:
+        return
+    head, _, attr = key.partition(".")
+    if head in ("self", "cls") and attr and "." not in attr:
+        owner = _enclosing_class(ancestors)
+        if owner is None:
+            return
+        key = f"{owner.name}().{attr}"
+
+    positional = 0
+    unpacked = False
+    for arg in node.args:
+        if isinstance(arg, ast.Starred):
+            unpacked = True
+        else:
+            positional += 1
+    keywords = []
+    for keyword in node.keywords:
+        if keyword.arg is None:
+            unpacked = True  # **kwargs
+        else:
+            keywords.append(keyword.arg)
+
+    next_line = 0
+    if isinstance(ancestors[-1], ast.Expr) and len(ancestors) >= 2:
+        next_line = _next_line(ancestors[-1], ancestors[-2], state)
+    state.calls.append((key, positional, keywords, unpacked, node.lineno, next_line))
+
+
+def _facts(state) -> dict:
+    return {
+        "defs": state.defs,
+        "exports": state.exports,
+        "imports": state.imports,
+        "calls": state.calls,
+        "unreachable": state.unreachable,
     }
 
-    # 2) Scan for calls with wrong arg count
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
-            name = node.func.id
-            if name in func_arg_counts:
-                expected = func_arg_counts[name]
-                actual = len(node.args)
-                if actual != expected:
-                    flaws.append(
-                        f"🤖 Logic flaw: function '{name}' called with {actual} args "
-                        f"(expected {expected})."
-                    )
-
-    # 3) Unreachable code after a return inside functions
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):
-            # find first return
-            for i, stmt in enumerate(node.body[:-1]):
-                if isinstance(stmt, ast.Return):
-                    flaws.append(
-                        f"🤖 Unreachable code detected after `return` in function '{node.name}'."
-                    )
-                    break  # only report once per function
-
-    # 4) Assignment in if (common typo: = instead of ==)
+
+@stage("logic")
+def logic_facts(code: Union[str, AnalysisContext]) -> Optional[dict]:
+    """Definitions, imports, calls and unreachable code in one piece of source; None if it doesn't parse."""
+    ctx = AnalysisContext.of(code)
+    state = ctx.rules("logic")
+    if state is None:
+        return None
+    return _facts(state)
+
+
+@stage("logic")
+def symbol_facts(code: str) -> Optional[dict]:
+    """logic_facts() walking the logic rules only: for indexing files no other analyzer looks at."""
+    ctx = AnalysisContext(code)
+    if ctx.tree is None:
+        return None
+    return _facts(registry.walk(ctx, ("logic",))["logic"])
+
+
+@stage("logic")
+def logic_flaws(code: str, regions: List[dict]) -> List[Finding]:
+    """
+    Logic flaws for `code` from the logic_facts() of its regions, in source
+    order. Calls are checked against every definition in the file, so a
+    call and the function it targets may come from different regions.
+    Calls into other files are left to the project symbol index.
+    """
+    defs: Dict[str, Optional[Signature]] = {}
+    for facts in regions:
+        defs.update(facts["defs"])
+
+    flaws: List[Finding] = []
+    for facts in regions:
+        # Region-relative lines don't survive reuse: report these without one
+        flaws.extend(call_findings(facts["calls"], defs.get, lines=False))
+    for facts in regions:
+        flaws.extend(facts["unreachable"])
+
+    # 3) Assignment in if (common typo: = instead of ==)
     if re.search(r"\bif\s+[^=]+=[^=].*:", code):
-        flaws.append(
-            "🤖 Possible assignment in `if` statement (did you mean '==' instead of '='?)."
-        )
+        flaws.append(Finding("logic.assign-in-if"))
 
     return flaws
+
+
+@stage("logic")
+def logic_findings(code: Union[str, AnalysisContext]) -> List[Finding]:
+    ctx = AnalysisContext.of(code)
+    facts = logic_facts(ctx)
+    if facts is None:
+        return [Finding("logic.syntax-error")]
+    return logic_flaws(ctx.code, [facts])
+
+
+def detect_logic_flaws(code: Union[str, AnalysisContext]) -> List[str]:
+    """
+    Heuristic “logic flaw” detector:
+      - Flags calls that can't bind to the function's signature (argument
+        count, defaults, *args, keyword arguments, methods, constructors)
+      - Marks unreachable code after a return, or after a call to a
+        function that always raises
+      - Detects assignments in `if` instead of comparisons
+
+    Returns a list of human-friendly messages.
+    """
+    return render_all(aggregate(logic_findings(code)))
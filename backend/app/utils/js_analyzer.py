@@ -0,0 +1,188 @@
+# app/utils/js_analyzer.py
+
+from typing import Dict, List, Optional, Union
+
+from app.core.analysis_context import AnalysisContext
+from app.core.findings import Finding
+from app.core.metrics import stage
+from app.utils.js_lexer import Token, tokenize
+
+# 🟨 Every JavaScript rule, run over one token stream in a single pass:
+# style (tab indentation, line length), loose equality, var, console
+# calls and the first bug rules (shadowed globals, unreachable code,
+# duplicate object keys).
+
+# Globals a declaration shouldn't reuse
+SHADOWED_GLOBALS = frozenset((
+    "undefined", "NaN", "Infinity", "eval", "arguments", "globalThis", "window", "document",
+    "console", "Object", "Array", "String", "Number", "Boolean", "Symbol", "BigInt", "Function",
+    "Math", "JSON", "Date", "RegExp", "Error", "Promise", "Map", "Set", "WeakMap", "WeakSet",
+    "parseInt", "parseFloat", "isNaN", "isFinite", "setTimeout", "setInterval", "fetch",
+))
+CONSOLE_METHODS = frozenset(("log", "debug", "info", "trace", "dir", "table"))
+
+_DECLARATIONS = frozenset(("var", "let", "const", "function", "class"))
+_JUMPS = frozenset(("return", "throw", "break", "continue"))
+# Control keywords whose "(...)" may be followed by a braceless body
+_CONTROL = frozenset(("if", "for", "while", "with"))
+# A "{" after one of these opens an object literal (otherwise a block)
+_OBJECT_AFTER_PUNCT = frozenset((
+    "=", "(", "[", ",", ":", "?", "||", "&&", "??", "!", "+=", "-=", "||=", "&&=", "??=", "...",
+    "==", "===", "!=", "!==", "+", "-", "*", "/", "%", "<", ">", "<=", ">=",
+))
+_OBJECT_AFTER_NAMES = frozenset(("return", "typeof", "in", "of", "yield", "await", "case", "new", "void", "delete"))
+# Tokens that can't end an expression: a line break after them continues it
+_CONTINUES_AFTER = frozenset((
+    "=", "(", "[", "{", ",", ".", "?.", ":", "?", "=>", "||", "&&", "??", "+", "-", "*", "/", "%",
+    "**", "==", "===", "!=", "!==", "<", ">", "<=", ">=", "<<", ">>", ">>>", "&", "|", "^", "!", "~",
+    "+=", "-=", "*=", "/=", "%=", "**=", "<<=", ">>=", ">>>=", "&=", "|=", "^=", "&&=", "||=", "??=",
+))
+# ...and a line starting with these continues the previous one
+_CONTINUES_BEFORE = frozenset((
+    ".", "?.", "(", "[", ",", ":", "?", "=>", "||", "&&", "??", "*", "/", "%", "**", "==", "===",
+    "!=", "!==", "<", ">", "<=", ">=", "<<", ">>", ">>>", "&", "|", "^", "=",
+))
+
+
+def javascript_facts(code: Union[str, AnalysisContext]) -> dict:
+    """All JavaScript findings for `code` (shared by the review, style and bug checks)."""
+    ctx = AnalysisContext.of(code, "javascript")
+    return ctx.derived("javascript", _analyze)
+
+
+@stage("javascript")
+def _analyze(ctx: AnalysisContext) -> dict:
+    code = ctx.code
+    tokens = tokenize(code)
+    suggestions: List[Finding] = []
+    warnings: List[Finding] = []
+    optimizations: List[Finding] = []
+    bugs: List[Finding] = []
+    style_warnings: List[Finding] = []
+
+    # 📏 Line length is the one check that needs raw lines
+    for row, line in enumerate(ctx.lines, 1):
+        if len(line) > 79:
+            style_warnings.append(Finding("style.line-too-long", line=row))
+
+    # Open brackets: [bracket, keys seen (object literals only), where a key
+    # is expected (True, or "accessor" after get/set), token before it]
+    stack: List[list] = []
+    control_paren = False  # previous token closed an if/for/while (...) header
+    jump: Optional[Token] = None  # return/throw/... whose statement hasn't ended yet
+    jump_depth = 0
+    previous: Optional[Token] = None
+    count = len(tokens)
+
+    last_line = 0
+    for i, token in enumerate(tokens):
+        kind, value, line, offset = token
+        punct = kind == "punct"
+        following = tokens[i + 1] if i + 1 < count else None
+
+        # --- Style: tab indentation, checked on each line's first token ---
+        if line != last_line:
+            last_line = line
+            indent_from = code.rfind("\n", 0, offset) + 1
+            if "\t" in code[indent_from:offset]:
+                style_warnings.append(Finding("style.tab-indent", line=line))
+
+        # --- Unreachable code: a statement after return/throw/break/continue ---
+        if jump is not None and len(stack) <= jump_depth:
+            if len(stack) < jump_depth or (punct and value == "}"):
+                jump = None  # end of the block
+            else:
+                if previous is jump:
+                    if punct and value == ";":
+                        ended = False
+                    elif jump.value in ("break", "continue"):
+                        ended = not (kind == "name" and token.line == jump.line)  # label
+                    else:
+                        ended = token.line != jump.line  # "return\nx" returns undefined
+                elif previous.kind == "punct" and previous.value == ";":
+                    ended = True
+                else:
+                    # A line break ends the statement unless either side continues it
+                    ended = token.line != previous.line and not (
+                        (previous.kind == "punct" and previous.value in _CONTINUES_AFTER)
+                        or (punct and value in _CONTINUES_BEFORE)
+                    )
+                if ended:
+                    if not (punct and value == ";") and not (kind == "name" and value in ("case", "default", "function")):
+                        bugs.append(Finding("js.unreachable", {"keyword": jump.value}, token.line))
+                    jump = None
+
+        # --- Duplicate keys: a key is `name:`, `name,` (shorthand) or `name(` (method) ---
+        frame = stack[-1] if stack else None
+        if frame is not None and frame[2]:
+            expecting = frame[2]
+            frame[2] = False
+            if punct:
+                if value == "*":
+                    frame[2] = expecting  # generator method
+                # anything else: computed key or spread, not checked
+            elif kind == "name" and value in ("get", "set", "async", "static") and following is not None \
+                    and following.kind in ("name", "string", "number"):
+                frame[2] = "accessor" if value in ("get", "set") else expecting
+            elif following is not None and following.value in (":", "(", ",", "}") and following.kind == "punct":
+                key = value[1:-1] if kind == "string" else value
+                if expecting != "accessor":  # a getter and setter may share a name
+                    if key in frame[1]:
+                        bugs.append(Finding("js.duplicate-key", {"name": key}, token.line))
+                    frame[1].add(key)
+
+        if kind == "name":
+            after_dot = previous is not None and previous.kind == "punct" and previous.value in (".", "?.")
+            if not after_dot:
+                if value in _DECLARATIONS and following is not None and following.kind == "name" \
+                        and following.value in SHADOWED_GLOBALS:
+                    bugs.append(Finding("js.shadowed-global", {"name": following.value}, token.line))
+                if value == "var":
+                    suggestions.append(Finding("js.no-var", line=token.line))
+                elif value == "console" and i + 2 < count and following.value == "." \
+                        and tokens[i + 2].kind == "name" and tokens[i + 2].value in CONSOLE_METHODS:
+                    optimizations.append(Finding("js.console-log", {"method": tokens[i + 2].value}, token.line))
+                elif value in _JUMPS and not control_paren and not (
+                    previous is not None and previous.kind == "name" and previous.value in ("else", "do")
+                ):
+                    jump = token
+                    jump_depth = len(stack)
+
+        elif punct:
+            if value == "==" or value == "!=":
+                warnings.append(Finding("js.strict-equality", {"strict": value + "="}, token.line))
+            elif value == "(" or value == "[" or value == "{":
+                is_object = value == "{" and previous is not None and (
+                    (previous.kind == "punct" and previous.value in _OBJECT_AFTER_PUNCT)
+                    or (previous.kind == "name" and previous.value in _OBJECT_AFTER_NAMES)
+                )
+                stack.append([value, set() if is_object else None, is_object, previous])
+            elif (value == ")" or value == "]" or value == "}") and stack:
+                before = stack.pop()[3]
+                control_paren = value == ")" and before is not None and before.kind == "name" and before.value in _CONTROL
+                previous = token
+                continue
+            elif value == "," and frame is not None and frame[1] is not None:
+                frame[2] = True  # next key
+
+        control_paren = False
+        previous = token
+
+    if code and not code.endswith("\n"):
+        style_suggestions = [Finding("style.final-newline", line=code.count("\n") + 1)]
+    else:
+        style_suggestions = []
+
+    return {
+        "suggestions": suggestions,
+        "warnings": warnings,
+        "optimizations": optimizations,
+        "bugs": bugs,
+        "style": {"suggestions": style_suggestions, "warnings": style_warnings},
+    }
+
+
+def javascript_findings(code: Union[str, AnalysisContext]) -> Dict[str, List[Finding]]:
+    """Suggestions, warnings and optimizations (not style or bugs) for JavaScript."""
+    facts = javascript_facts(code)
+    return {key: facts[key] for key in ("suggestions", "warnings", "optimizations")}
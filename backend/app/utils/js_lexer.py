@@ -0,0 +1,121 @@
+# app/utils/js_lexer.py
+
+import re
+from typing import List, NamedTuple
+
+# 🔤 JavaScript tokenizer: one left-to-right pass, one regex match per token,
+# so cost stays linear even on minified multi-megabyte bundles. Enough of
+# the grammar to never mistake strings, comments, template literals or
+# regex literals for code; it does not validate anything. Comments and
+# whitespace are skipped (they only advance the line count).
+
+
+class Token(NamedTuple):
+    kind: str  # name, number, string, template, regex or punct
+    value: str
+    line: int  # 1-based line of the token's first character
+    offset: int
+
+
+_TOKEN = re.compile(r"""
+    [ \t\r\f\v\ufeff\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]*
+    (?:
+        (?P<nl>\n)
+      | (?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))
+      | (?P<name>\#?[A-Za-z_$\u0080-\uffff][\w$\u0080-\uffff]*)
+      | (?P<number>0[xX][\da-fA-F_]+n?|0[oObB][\d_]+n?|(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][+-]?\d+)?n?)
+      | (?P<string>"(?:[^"\\\n]|\\[\s\S])*"?|'(?:[^'\\\n]|\\[\s\S])*'?)
+      | (?P<template>`)
+      | (?P<punct>>>>=|\.\.\.|===|!==|\*\*=|<<=|>>=|>>>|&&=|\|\|=|\?\?=|=>|==|!=|<=|>=|&&|\|\||\?\?|\?\.(?!\d)
+          |\+\+|--|\+=|-=|\*=|/=|%=|&=|\|=|\^=|\*\*|<<|>>|[{}()\[\];,<>+\-*/%&|^!~?:=.@])
+      | (?P<other>[\s\S])
+      | \Z
+    )
+""", re.VERBOSE)
+
+# Rest of a template literal chunk, up to its end or the next ${
+_TEMPLATE_CHUNK = re.compile(r"(?:[^`\\$]|\\[\s\S]|\$(?!\{))*(?:`|\$\{|\Z)")
+
+_REGEX = re.compile(r"/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*")
+
+# After these a "/" starts a regex literal rather than a division
+_REGEX_AFTER_NAMES = frozenset((
+    "return", "typeof", "instanceof", "in", "of", "new", "delete", "void",
+    "throw", "case", "do", "else", "yield", "await",
+))
+_DIVISION_AFTER_PUNCT = frozenset((")", "]", "}", "++", "--"))
+
+
+def tokenize(code: str) -> List[Token]:
+    """Every token of `code`, in order. Never raises on malformed input."""
+    tokens: List[Token] = []
+    append = tokens.append
+    match = _TOKEN.match
+    new = tuple.__new__  # Token(...) without the namedtuple __new__ overhead
+    pos = 0
+    line = 1
+    end = len(code)
+    # One entry per open "{": True where the brace is a template's "${"
+    braces: List[bool] = []
+    previous = None  # last token, for regex-vs-division
+
+    while pos < end:
+        m = match(code, pos)
+        kind = m.lastgroup
+        pos = m.end()
+        if kind == "nl":
+            line += 1
+            continue
+        start = m.start(kind) if kind is not None else pos
+
+        if kind == "name" or kind == "number":
+            previous = new(Token, (kind, m.group(kind), line, start))
+            append(previous)
+        elif kind == "punct":
+            value = m.group(kind)
+            if value == "}" and braces and braces.pop():
+                # End of a ${...} substitution: back into the template literal
+                pos, line, previous = _template(code, start, line, braces, append)
+                continue
+            if value[0] == "/" and (
+                previous is None
+                or (previous.kind == "punct" and previous.value not in _DIVISION_AFTER_PUNCT)
+                or (previous.kind == "name" and previous.value in _REGEX_AFTER_NAMES)
+            ):
+                regex = _REGEX.match(code, start)
+                if regex is not None:
+                    previous = new(Token, ("regex", regex.group(), line, start))
+                    append(previous)
+                    pos = regex.end()
+                    continue
+            if value == "{":
+                braces.append(False)
+            previous = new(Token, ("punct", value, line, start))
+            append(previous)
+        elif kind == "comment":
+            line += m.group(kind).count("\n")
+        elif kind == "string":
+            value = m.group(kind)
+            previous = new(Token, ("string", value, line, start))
+            append(previous)
+            if "\n" in value:
+                line += value.count("\n")  # line continuations
+        elif kind == "template":
+            pos, line, previous = _template(code, start, line, braces, append)
+        elif kind == "other":
+            previous = new(Token, ("punct", m.group(kind), line, start))
+            append(previous)
+        else:
+            break  # end of input
+    return tokens
+
+
+def _template(code: str, pos: int, line: int, braces: List[bool], append):
+    """Lex a template chunk starting at the "`" or "}" at `pos`; returns (pos, line, token)."""
+    m = _TEMPLATE_CHUNK.match(code, pos + 1)
+    value = code[pos:m.end()]
+    token = tuple.__new__(Token, ("template", value, line, pos))
+    append(token)
+    if value.endswith("${"):
+        braces.append(True)
+    return m.end(), line + value.count("\n"), token
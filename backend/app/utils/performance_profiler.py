@@ -1,46 +1,325 @@
 # app/utils/performance_profiler.py
 import ast
+from typing import List, NamedTuple, Optional, Union
 
-def detect_performance_issues(code: str) -> list[str]:
-    issues = []
-
-    try:
-        tree = ast.parse(code)
-
-        class LoopVisitor(ast.NodeVisitor):
-            def __init__(self):
-                self.nested_loop_depth = 0
-                self.max_depth = 0
-
-            def visit_For(self, node):
-                self.nested_loop_depth += 1
-                self.max_depth = max(self.max_depth, self.nested_loop_depth)
-                self.generic_visit(node)
-                self.nested_loop_depth -= 1
-
-            def visit_While(self, node):
-                self.nested_loop_depth += 1
-                self.max_depth = max(self.max_depth, self.nested_loop_depth)
-                self.generic_visit(node)
-                self.nested_loop_depth -= 1
-
-        visitor = LoopVisitor()
-        visitor.visit(tree)
-
-        if visitor.max_depth >= 3:
-            issues.append("⚠️ Deeply nested loops detected. Consider refactoring for better performance.")
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.For) or isinstance(node, ast.While):
-                for child in ast.walk(node):
-                    if isinstance(child, ast.Call) and isinstance(child.func, ast.Attribute):
-                        if child.func.attr == "append":
-                            issues.append("💡 Consider using list comprehension instead of append inside a loop.")
-                    if isinstance(child, ast.Call) and isinstance(child.func, ast.Name):
-                        if child.func.id in ("sorted", "sort"):
-                            issues.append("⚠️ Avoid sorting inside loops unless necessary.")
-
-    except SyntaxError:
-        issues.append("❌ Unable to analyze performance due to syntax errors.")
-
-    return issues
+from app.core.analysis_context import AnalysisContext, registry
+from app.core.findings import Finding, aggregate, render_all
+from app.core.metrics import stage
+
+_LOOPS = (ast.For, ast.AsyncFor, ast.While)
+_COMPREHENSIONS = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+_FUNCTIONS = (ast.FunctionDef, ast.AsyncFunctionDef)
+_SUPERSCRIPTS = str.maketrans("0123456789", "⁰¹²³⁴⁵⁶⁷⁸⁹")
+
+
+def complexity(degree: int, log: int = 0) -> str:
+    """Big-O text for n**degree * log(n)**log: O(1), O(n log n), O(n²)..."""
+    if degree == 0:
+        return "O(log n)" if log else "O(1)"
+    power = "n" if degree == 1 else "n" + str(degree).translate(_SUPERSCRIPTS)
+    return f"O({power} log n)" if log else f"O({power})"
+
+
+class _Scope:
+    """A function (or class/module body) being walked: its names and its worst cost so far."""
+
+    __slots__ = ("name", "node", "lists", "strings", "cost")
+
+    def __init__(self, name: str, node: Optional[ast.AST] = None):
+        self.name = name
+        self.node = node
+        self.lists = set()  # names bound to a list
+        self.strings = set()  # names bound to a str
+        self.cost = (0, 0)  # (power of n, power of log n)
+
+
+class _Frame(NamedTuple):
+    index: int  # position of `node` in the walk's ancestors
+    node: ast.AST
+    scope: _Scope
+    depth: int  # loops around this frame's body, within its function
+    loop: Optional[ast.AST]  # innermost loop whose body holds this frame's body
+    outer_depth: int  # ...and the same for the frame node itself, for `outside`
+    outer_loop: Optional[ast.AST]
+    outside: Optional[ast.AST]  # part evaluated once, before looping (For.iter)
+    outside_index: int
+
+
+# 🔁 Loops, functions and classes open frames. Rules find the innermost live
+# frame from the end of a stack that is trimmed against `ancestors` as the
+# walk moves on, so every node costs O(1) amortized: no rescanning of the
+# ancestors (or re-walking of loop bodies) per node.
+def _where(ancestors: List[ast.AST], node: ast.AST, state):
+    """(loop depth, scope, innermost loop) at `node`."""
+    frames = state.frames
+    while frames and not (frames[-1].index < len(ancestors) and ancestors[frames[-1].index] is frames[-1].node):
+        frames.pop()
+    if not frames:
+        return 0, state.module, None
+    frame = frames[-1]
+    if frame.outside is not None:
+        k = frame.outside_index
+        if (ancestors[k] is frame.outside) if k < len(ancestors) else (k == len(ancestors) and node is frame.outside):
+            return frame.outer_depth, frame.scope, frame.outer_loop
+    return frame.depth, frame.scope, frame.loop
+
+
+def _charge(scope: _Scope, cost):
+    if cost > scope.cost:
+        scope.cost = cost
+
+
+_MODULE_NAMES = "performance.module-names"
+
+
+def seed_module_names(ctx: AnalysisContext, lists, strings):
+    """
+    Names bound to a list / a str at module level by code outside `ctx`
+    (earlier regions of the same file), for the rules to start from.
+    Call before anything walks `ctx`.
+    """
+    ctx.derived(_MODULE_NAMES, lambda _: (tuple(lists), tuple(strings)))
+
+
+@registry.initializer("performance")
+def _init(state):
+    state.max_depth = 0
+    state.module = _Scope("<module>")
+    lists, strings = state.ctx.derived(_MODULE_NAMES, lambda _: ((), ()))
+    state.module.lists.update(lists)
+    state.module.strings.update(strings)
+    state.frames = []
+    state.scopes = []  # functions in source order
+    state.appending = set()  # loops already reported for .append()
+
+
+@registry.rule("performance", *_FUNCTIONS, ast.ClassDef)
+def _open_scope(node, ancestors, state):
+    _, parent, _ = _where(ancestors, node, state)
+    name = node.name if parent is state.module else f"{parent.name}.{node.name}"
+    scope = _Scope(name, node)
+    if isinstance(node, _FUNCTIONS):
+        state.scopes.append(scope)
+        for arg in node.args.posonlyargs + node.args.args + node.args.kwonlyargs:
+            kind = _annotation(arg.annotation)
+            if kind == "list":
+                scope.lists.add(arg.arg)
+            elif kind == "str":
+                scope.strings.add(arg.arg)
+    # A function body starts over at depth 0: defining it in a loop doesn't run it there
+    state.frames.append(_Frame(len(ancestors), node, scope, 0, None, 0, None, None, 0))
+
+
+@registry.rule("performance", *_LOOPS, *_COMPREHENSIONS)
+def _open_loop(node, ancestors, state):
+    depth, scope, loop = _where(ancestors, node, state)
+    index = len(ancestors)
+    if isinstance(node, _COMPREHENSIONS):
+        # [... for a in xs for b in a]: one level per `for`; xs is evaluated once
+        levels = len(node.generators)
+        outside, outside_index = node.generators[0].iter, index + 2
+    else:
+        levels = 1
+        outside = node.iter if not isinstance(node, ast.While) else None
+        outside_index = index + 1
+    inner = depth + levels
+    state.frames.append(_Frame(index, node, scope, inner, node, depth, loop, outside, outside_index))
+    state.max_depth = max(state.max_depth, inner)
+    _charge(scope, (inner, 0))
+
+
+def _annotation(node: Optional[ast.AST]) -> Optional[str]:
+    """"list" or "str" for annotations naming those types (List[int], list[str], str...)."""
+    if isinstance(node, ast.Subscript):
+        node = node.value
+    if isinstance(node, ast.Attribute):  # typing.List
+        node = ast.Name(node.attr)
+    if isinstance(node, ast.Name) and node.id in ("list", "List", "str"):
+        return "str" if node.id == "str" else "list"
+    return None
+
+
+def _is_list(node: ast.AST, scope: _Scope, state) -> bool:
+    node_type = type(node)
+    if node_type is ast.Name:
+        return node.id in scope.lists or (node.id in state.module.lists and node.id not in scope.strings)
+    if node_type is ast.Call:
+        return type(node.func) is ast.Name and node.func.id == "list"
+    return node_type is ast.ListComp
+
+
+def _is_str(node: ast.AST, scope: _Scope, state) -> bool:
+    node_type = type(node)
+    if node_type is ast.Constant:
+        return type(node.value) is str
+    if node_type is ast.Name:
+        return node.id in scope.strings or (node.id in state.module.strings and node.id not in scope.lists)
+    if node_type is ast.BinOp:
+        return type(node.op) is ast.Add and (_is_str(node.left, scope, state) or _is_str(node.right, scope, state))
+    if node_type is ast.Call:
+        return type(node.func) is ast.Name and node.func.id == "str"
+    return node_type is ast.JoinedStr
+
+
+def _kind(value: ast.AST, scope: _Scope, state) -> Optional[str]:
+    """"list" or "str" if `value` evidently makes one."""
+    if type(value) is ast.Constant:  # the usual NAME = 3; a quick exit
+        return "str" if type(value.value) is str else None
+    if type(value) is ast.List or _is_list(value, scope, state):
+        return "list"
+    return "str" if _is_str(value, scope, state) else None
+
+
+def _concat_in_loop(node, depth, scope, state):
+    state.findings.append(Finding("perf.string-concat-in-loop", line=node.lineno, end_line=node.end_lineno))
+    _charge(scope, (depth + 1, 0))
+
+
+@registry.rule("performance", ast.Assign, ast.AnnAssign)
+def _binding(node, ancestors, state):
+    targets = node.targets if type(node) is ast.Assign else [node.target]
+    names = [target.id for target in targets if type(target) is ast.Name]
+    if not names:
+        return
+    depth, scope, _ = _where(ancestors, node, state)
+    value = node.value
+    kind = _annotation(node.annotation) if value is None else _kind(value, scope, state)  # x: List[int]
+    lists, strings = scope.lists, scope.strings
+    for name in names:
+        lists.discard(name)
+        strings.discard(name)
+        if kind == "list":
+            lists.add(name)
+        elif kind == "str":
+            strings.add(name)
+    # s = s + "..." in a loop copies everything built so far
+    if depth and kind == "str" and type(value) is ast.BinOp and type(value.left) is ast.Name \
+            and value.left.id in names:
+        _concat_in_loop(node, depth, scope, state)
+
+
+@registry.rule("performance", ast.AugAssign)
+def _augmented(node, ancestors, state):
+    if not isinstance(node.op, ast.Add) or not isinstance(node.target, ast.Name):
+        return
+    depth, scope, _ = _where(ancestors, node, state)
+    if depth and (_is_str(node.target, scope, state) or _is_str(node.value, scope, state)):
+        _concat_in_loop(node, depth, scope, state)
+
+
+@registry.rule("performance", ast.Compare)
+def _membership(node, ancestors, state):
+    depth, scope, _ = _where(ancestors, node, state)
+    if not depth:
+        return  # one scan of a list is fine; it's the scan per iteration that adds up
+    for op, right in zip(node.ops, node.comparators):
+        if isinstance(op, (ast.In, ast.NotIn)) and _is_list(right, scope, state):
+            state.findings.append(Finding("perf.list-membership", line=node.lineno, end_line=node.end_lineno))
+            _charge(scope, (depth + 1, 0))
+            return
+
+
+@registry.rule("performance", ast.Call)
+def _call(node, ancestors, state):
+    func = node.func
+    name = func.id if type(func) is ast.Name else func.attr if type(func) is ast.Attribute else None
+    is_sort = name == ("sorted" if type(func) is ast.Name else "sort")
+    is_append = name == "append" and type(func) is ast.Attribute
+    if not (is_sort or is_append):
+        return
+    depth, scope, loop = _where(ancestors, node, state)
+    if is_sort:
+        if depth:
+            state.findings.append(Finding("perf.sort-in-loop", line=node.lineno, end_line=node.end_lineno))
+        _charge(scope, (depth + 1, 1))
+    elif loop is not None and id(loop) not in state.appending:
+        # One hint per loop, not one per .append() in it
+        state.appending.add(id(loop))
+        state.findings.append(Finding("perf.loop-append", line=node.lineno, end_line=node.end_lineno))
+
+
+def _severity(cost) -> str:
+    return "high" if cost[0] >= 3 else "medium" if cost[0] == 2 else "low"
+
+
+@registry.finalizer("performance")
+def _estimates(state):
+    state.functions = [
+        Finding(
+            "perf.complexity",
+            {"name": scope.name, "complexity": complexity(*scope.cost), "degree": scope.cost[0], "log": scope.cost[1]},
+            line=scope.node.lineno,
+            end_line=scope.node.end_lineno,
+            severity=_severity(scope.cost),
+        )
+        for scope in state.scopes
+    ]
+    state.module_cost = state.module.cost
+    state.module_names = (sorted(state.module.lists), sorted(state.module.strings))
+    del state.frames, state.scopes, state.appending, state.module
+
+
+@stage("performance")
+def performance_facts(code: Union[str, AnalysisContext]) -> Optional[dict]:
+    """
+    Loop findings, per-function complexity estimates (perf.complexity
+    Findings), deepest loop nesting and the module-level names left bound
+    to a list / a str in one piece of source; None if it doesn't parse.
+    """
+    ctx = AnalysisContext.of(code)
+    state = ctx.rules("performance")
+    if state is None:
+        return None
+    return {
+        "max_depth": state.max_depth,
+        "module": list(state.module_cost),
+        "functions": list(state.functions),
+        "findings": list(state.findings),
+        "module_lists": state.module_names[0],
+        "module_strings": state.module_names[1],
+    }
+
+
+def superlinear(estimate: Finding) -> bool:
+    """A perf.complexity estimate worth a hint: O(n²) or worse."""
+    return estimate.args["degree"] >= 2
+
+
+@stage("performance")
+def performance_findings(regions: List[dict]) -> List[Finding]:
+    """Performance issues for a file from the performance_facts() of its regions, in source order."""
+    findings = [estimate for facts in regions for estimate in facts["functions"] if superlinear(estimate)]
+    findings += [finding for facts in regions for finding in facts["findings"]]
+    if max((facts["max_depth"] for facts in regions), default=0) >= 3:
+        findings.insert(0, Finding("perf.deep-nesting"))
+    return findings
+
+
+def performance_report(regions: List[dict]) -> dict:
+    """
+    Complexity per function, the worst of the file (module-level code
+    included) and its performance issues, from performance_facts() of
+    its regions.
+    """
+    functions = [estimate for facts in regions for estimate in facts["functions"]]
+    costs = [tuple(facts["module"]) for facts in regions]
+    costs += [(estimate.args["degree"], estimate.args["log"]) for estimate in functions]
+    return {
+        "complexity": complexity(*max(costs, default=(0, 0))),
+        "functions": functions,
+        "findings": performance_findings(regions),
+    }
+
+
+@stage("performance")
+def find_performance_issues(code: Union[str, AnalysisContext]) -> List[Finding]:
+    facts = performance_facts(code)
+
+    if facts is None:
+        return [Finding("perf.syntax-error")]
+
+    return performance_findings([facts])
+
+
+def detect_performance_issues(code: Union[str, AnalysisContext]) -> list[str]:
+    return render_all(aggregate(find_performance_issues(code)))
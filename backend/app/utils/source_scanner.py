@@ -0,0 +1,268 @@
+# app/utils/source_scanner.py
+
+import re
+from typing import Dict, List, Optional, Tuple, Union
+
+from app.core.analysis_context import AnalysisContext
+from app.core.findings import Finding
+from app.core.metrics import stage
+
+# Characters that start a string, a comment or a line continuation. Code in
+# between is only scanned for brackets (with str.count), so most lines cost
+# a handful of C calls rather than a Python step per token.
+_SPECIAL = re.compile(r"[#'\"\\]")
+# Remainder of a string literal after its opening quote, through the closing one
+_STRING_END = {
+    "'''": re.compile(r"[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*'''"),
+    '"""': re.compile(r'[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*"""'),
+    "'": re.compile(r"[^'\\]*(?:\\.[^'\\]*)*'"),
+    '"': re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"'),
+}
+_PREFIX_CHARS = "rRbBuUfF"
+
+_NAMING = re.compile(r"\bdef\s+([^\W\d]\w*)|\b([^\W\d]\w*)[ \t]*=(?!=)")
+_SNAKE_CASE = re.compile(r"^[a-z_][a-z0-9_]*$")
+_NAME_USE = re.compile(r"(?<![\w.])[^\W\d]\w*")
+_DEF = re.compile(r"\s*(?:async\s+)?def\s")
+_IMPORT = re.compile(r"\s*(import|from)\s")
+_FOR_HEADER = re.compile(r"\s*for\s+\w+\s+in\s+\w+\s*:\s*$")
+_APPEND = re.compile(r"\s*\w+\.append\(")
+
+# A piece of a logical line: ("code", text) or ("str", literal, is_fstring)
+Piece = Tuple
+
+
+def _bracket_delta(code: str) -> int:
+    return (
+        code.count("(") + code.count("[") + code.count("{")
+        - code.count(")") - code.count("]") - code.count("}")
+    )
+
+
+def scan_source(code: Union[str, AnalysisContext]) -> dict:
+    """
+    One streaming pass over the source that collects every text-level fact
+    the style and review checks need: line length, tabs, comment spacing,
+    indentation, naming, docstrings, imports and the names they're used by.
+
+    Lines are lexed with their string / bracket / continuation state, so
+    nothing inside a string literal or comment is mistaken for code, and
+    the cost is linear in the size of the file. The result is shared by
+    every caller with the same context.
+    """
+    ctx = AnalysisContext.of(code)
+    return ctx.derived("source_scan", _scan)
+
+
+@stage("scan")
+def _scan(ctx: AnalysisContext) -> dict:
+    scan = _Scan()
+    string = None  # delimiter of a string literal still open from an earlier line
+    depth = 0  # open brackets
+    joined = False  # previous line ended with a backslash
+    pieces: List[Piece] = []
+
+    for i, line in enumerate(ctx.lines):
+        row = i + 1
+        if len(line) > 79:
+            scan.warnings.append(Finding("style.line-too-long", line=row))
+        if "\t" in line:
+            scan.warnings.append(Finding("style.tab-indent", line=row))
+
+        pos = 0
+        if string is not None:
+            end = _STRING_END[string].match(line)
+            if end is None:
+                if len(string) == 1 and not line.endswith("\\"):
+                    string = None  # unterminated single-quoted string: drop it
+                continue  # the whole line is inside the string
+            pos = end.end()
+            string = None
+        else:
+            stripped = line.strip()
+            if stripped.startswith("#") and not stripped.startswith("# "):
+                scan.suggestions.append(Finding("style.comment-space", line=row))
+            if depth == 0 and not joined and stripped:
+                leading_spaces = len(line) - len(line.lstrip(' '))
+                if leading_spaces % 4 != 0:
+                    scan.warnings.append(Finding("style.indent-width", line=row))
+
+        joined = False
+        while True:
+            match = _SPECIAL.search(line, pos)
+            at = match.start() if match is not None else len(line)
+            segment = line[pos:at]
+            if segment:
+                depth = max(0, depth + _bracket_delta(segment))
+            if match is None:
+                pieces.append(("code", segment))
+                break
+            char = match.group()
+            if char == "\\":
+                segment = line[pos:at + 1]
+                joined = not line[at + 1:].strip()
+                pieces.append(("code", segment))
+                pos = at + 1
+                if joined:
+                    break
+                continue
+            if char == "#":
+                pieces.append(("code", segment))
+                break
+
+            start = at
+            while start > pos and at - start < 2 and line[start - 1] in _PREFIX_CHARS:
+                start -= 1
+            if start > 0 and (line[start - 1].isalnum() or line[start - 1] == "_"):
+                start = at  # letters belong to a name, not a prefix
+            delimiter = char * 3 if line.startswith(char * 3, at) else char
+            pieces.append(("code", line[pos:start]))
+            end = _STRING_END[delimiter].match(line, at + len(delimiter))
+            fstring = "f" in line[start:at].lower()
+            if end is None:
+                pieces.append(("str", line[start:], fstring))
+                if len(delimiter) == 3 or line.endswith("\\"):
+                    string = delimiter
+                break
+            pieces.append(("str", line[start:end.end()], fstring))
+            pos = end.end()
+
+        if string is None and depth == 0 and not joined:
+            scan.logical_line(pieces)
+            pieces = []
+
+    if pieces:
+        scan.logical_line(pieces)
+    scan.finish()
+    return scan.facts()
+
+
+class _Scan:
+    """Accumulates facts one logical line at a time."""
+
+    def __init__(self):
+        self.suggestions: List[Finding] = []
+        self.warnings: List[Finding] = []
+        self.naming: List[Finding] = []
+        self.docstrings: List[Finding] = []
+        self.imports: List[List[str]] = []
+        self.used_names = set()
+        self.list_comprehension = False
+        self._code: List[str] = []  # code outside strings and comments, minus import statements
+        self._pending_def: Optional[str] = None  # header awaiting its body's first statement
+        self._pending_for = False  # `for x in y:` awaiting its body's first statement
+
+    def logical_line(self, pieces: List[Piece]):
+        first = None
+        for piece in pieces:
+            if piece[0] == "str" or not piece[1].isspace() and piece[1]:
+                first = piece
+                break
+        if first is None:
+            return  # blank or comment-only line
+        code = " ".join([p[1] for p in pieces if p[0] == "code"]) if len(pieces) > 1 else first[1]
+
+        if self._pending_def is not None:
+            self._body_starts(self._pending_def, first)
+            self._pending_def = None
+        if self._pending_for:
+            self.list_comprehension = self.list_comprehension or bool(_APPEND.match(code))
+            self._pending_for = False
+
+        head = code.lstrip()[:6]
+        if head.startswith(("import", "from")) or ";" in code:
+            for statement in code.split(";"):
+                import_match = _IMPORT.match(statement)
+                if import_match:
+                    self._import(import_match.group(1), statement[import_match.end():])
+                else:
+                    self._code.append(statement)
+        else:
+            self._code.append(code)
+
+        if len(pieces) > 1:
+            for piece in pieces:
+                if piece[0] == "str" and (piece[2] or "__all__" in code):
+                    # names used in f-string fields (or re-exported via __all__)
+                    self._code.append(piece[1])
+
+        if head.startswith(("def", "async")):
+            if _DEF.match(code):
+                self._def(pieces)
+        elif head.startswith("for") and _FOR_HEADER.match(code):
+            self._pending_for = True
+
+    def _def(self, pieces: List[Piece]):
+        """Find the colon ending a def header and check what the body starts with."""
+        depth = 0
+        for index, piece in enumerate(pieces):
+            if piece[0] != "code":
+                continue
+            text = piece[1]
+            for offset, char in enumerate(text):
+                if char in "([{":
+                    depth += 1
+                elif char in ")]}":
+                    depth -= 1
+                elif char == ":" and depth == 0:
+                    source = "".join(p[1] for p in pieces[:index]) + text[:offset + 1]
+                    header = " ".join(source.split())
+                    rest = [("code", text[offset + 1:])] + pieces[index + 1:]
+                    first = next((p for p in rest if p[0] == "str" or p[1].strip()), None)
+                    if first is None:
+                        self._pending_def = header
+                    else:
+                        self._body_starts(header, first)
+                    return
+
+    def _body_starts(self, header: str, first: Piece):
+        if first[0] != "str" or first[2]:
+            self.docstrings.append(Finding("docstring.missing-function", {"header": header}))
+
+    def _import(self, keyword: str, rest: str):
+        if keyword == "import":
+            module = ""
+            names = rest
+        else:
+            module, _, names = rest.partition(" import")
+            module = module.strip()
+            if module == "__future__":
+                return
+        for item in names.replace("(", " ").replace(")", " ").split(","):
+            parts = item.split()
+            if not parts or parts[0] == "*":
+                continue
+            name = parts[0]
+            alias = parts[2] if len(parts) >= 3 and parts[1] == "as" else None
+            if keyword == "import":
+                reported = name
+                bound = alias or name.split(".")[0]
+            else:
+                reported = f"{module}.{name}" if not module.endswith(".") else module + name
+                bound = alias or name
+            if alias:
+                reported += f" as {alias}"
+            self.imports.append([reported, bound])
+
+    def finish(self):
+        if self._pending_def is not None:
+            self.docstrings.append(Finding("docstring.missing-function", {"header": self._pending_def}))
+        # Name checks run once over all the code (strings and comments
+        # already removed) instead of once per line
+        code = "\n".join(self._code)
+        for func_name, var_name in _NAMING.findall(code):
+            name = func_name or var_name
+            if not _SNAKE_CASE.match(name):
+                self.naming.append(Finding("style.snake-case", {"name": name}))
+        self.used_names.update(_NAME_USE.findall(code))
+
+    def facts(self) -> Dict[str, object]:
+        return {
+            "suggestions": self.suggestions,
+            "warnings": self.warnings,
+            "naming": self.naming,
+            "docstrings": self.docstrings,
+            "imports": self.imports,
+            "used_names": self.used_names,
+            "list_comprehension": self.list_comprehension,
+        }
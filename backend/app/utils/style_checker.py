@@ -1,81 +1,109 @@
-import re
-
-# Cache dictionary to store results
-style_cache = {}
+import ast
+from typing import List, Union
 
 # Local app imports (after standard library imports)
-from app.utils.formatter import format_issues
-
-
-def format_issues(raw_issues: list[str]) -> list[str]:
-    formatted = []
-    for issue in raw_issues:
-        if "exceeds 79 characters" in issue:
-            formatted.append("📏 Line too long: Try keeping lines under 79 characters for better readability.")
-        elif "tab character" in issue:
-            formatted.append("🔧 Replace tab characters with 4 spaces for consistent indentation.")
-        elif "Add a space after '#'" in issue:
-            formatted.append("💡 Consider adding a space after '#' to improve comment readability.")
-        elif "File should end with a newline" in issue:
-            formatted.append("📄 Add a newline at the end of the file to follow POSIX standards.")
-        elif "snake_case" in issue:
-            formatted.append("🔧 Rename variable or function to snake_case for consistency.")
-        elif "Indentation not a multiple of 4" in issue:
-            formatted.append("⚠️ Use consistent indentation of 4 spaces.")
-        else:
-            formatted.append(issue)
-    return formatted
-
-
-def check_code_style(code: str, language: str) -> dict:
-    # ✅ Return cached result if code was already checked
-    if code in style_cache:
-        return style_cache[code]
-
+from app.core.analysis_context import AnalysisContext, registry
+from app.core.findings import Finding, aggregate, occurrences, render_all
+from app.core.metrics import stage
+from app.core.result_cache import ResultCache, cache_key
+from app.utils.js_analyzer import javascript_facts
+from app.utils.source_scanner import scan_source
+
+# Bounded LRU cache of style results, keyed by content hash + language
+style_cache = ResultCache(name="style")
+
+
+@registry.rule("docstrings", ast.FunctionDef, ast.ClassDef)
+def _missing_docstring(node, ancestors, state):
+    if not ast.get_docstring(node):
+        what = "Class" if isinstance(node, ast.ClassDef) else "Function"
+        state.findings.append(Finding("docstring.missing", {"what": what, "name": node.name}, node.lineno))
+
+
+def find_missing_docstrings(code: Union[str, AnalysisContext]) -> List[str]:
+    """Docstring issues for every function and class; raises SyntaxError on bad input."""
+    ctx = AnalysisContext.of(code)
+    state = ctx.rules("docstrings")
+    if state is None:
+        raise ctx.syntax_error
+    return render_all(state.findings)
+
+
+@stage("style")
+def style_facts(code: Union[str, AnalysisContext]) -> dict:
+    """
+    Python style findings that depend only on this text. Line numbers are
+    relative to the text, so a cached region's findings can be shifted to
+    wherever the region sits in a later version.
+    """
+    scan = scan_source(code)
+    return {"suggestions": scan["suggestions"], "warnings": scan["warnings"], "naming": scan["naming"]}
+
+
+def shift_lines(findings: List[Finding], offset: int) -> List[Finding]:
+    """Move findings down by `offset` lines."""
+    return [finding.shifted(offset) for finding in findings]
+
+
+@stage("style")
+def style_result(code: str, regions: List[tuple]) -> dict:
+    """
+    Python style result for `code` from the style_facts() of its regions,
+    given as (first line offset, facts) pairs in source order.
+    """
     suggestions = []
     warnings = []
-    optimizations = []
+    for offset, facts in regions:
+        suggestions += shift_lines(facts["suggestions"], offset)
+        warnings += shift_lines(facts["warnings"], offset)
 
-    if language.lower() == "python":
-        lines = code.split("\n")
-        for i, line in enumerate(lines):
-            if len(line) > 79:
-                warnings.append(f"Line {i+1}: exceeds 79 characters.")
-            if "\t" in line:
-                warnings.append(f"Line {i+1}: contains tab character. Use 4 spaces instead.")
-            if line.strip().startswith("#") and not line.strip().startswith("# "):
-                suggestions.append(f"Line {i+1}: Add a space after '#' in comments.")
-            leading_spaces = len(line) - len(line.lstrip(' '))
-            if leading_spaces and leading_spaces % 4 != 0:
-                warnings.append(f"Line {i+1}: Indentation not a multiple of 4 spaces.")
-
-        if not code.endswith("\n"):
-            suggestions.append("File should end with a newline.")
-
-        var_func_names = re.findall(r"def\s+([a-zA-Z0-9_]+)\s*\(|([a-zA-Z0-9_]+)\s*=", code)
-        for func_name, var_name in var_func_names:
-            name = func_name or var_name
-            if name and not re.match(r"^[a-z_][a-z0-9_]*$", name):
-                suggestions.append(f"🔧 Rename '{name}' to follow snake_case.")
+    if not code.endswith("\n"):
+        suggestions.append(Finding("style.final-newline", line=code.count("\n") + 1))
 
-    else:
-        warnings.append(f"Style check for {language} not supported yet.")
-
-    formatted_suggestions = format_issues(suggestions)
-    formatted_warnings = format_issues(warnings)
-    formatted_optimizations = format_issues(optimizations)
-
-    result = {
-        "suggestions": formatted_suggestions,
-        "warnings": formatted_warnings,
-        "optimizations": formatted_optimizations,
-        "score": max(0, 100 - (len(suggestions)*2 + len(warnings)*3)),
-        "remark": "Good job!" if len(suggestions) + len(warnings) <= 2 else "Needs improvement"
+    for _, facts in regions:
+        suggestions += facts["naming"]
+
+    return _result(suggestions, warnings, [])
+
+
+def _result(suggestions: List[Finding], warnings: List[Finding], optimizations: List[Finding]) -> dict:
+    issues = occurrences(suggestions) + occurrences(warnings)
+    return {
+        "suggestions": aggregate(suggestions),
+        "warnings": aggregate(warnings),
+        "optimizations": aggregate(optimizations),
+        "score": max(0, 100 - (occurrences(suggestions)*2 + occurrences(warnings)*3)),
+        "remark": "Good job!" if issues <= 2 else "Needs improvement"
     }
 
-    # ✅ Store result in cache
-    style_cache[code] = result
+
+def check_code_style(code: Union[str, AnalysisContext], language: str) -> dict:
+    """style_findings() with the findings rendered as text."""
+    result = style_findings(code, language)
+    for key in ("suggestions", "warnings", "optimizations"):
+        result[key] = render_all(result[key], impact=False)
     return result
 
 
+@stage("style")
+def style_findings(code: Union[str, AnalysisContext], language: str) -> dict:
+    ctx = AnalysisContext.of(code, language)
+    code = ctx.code
+
+    # ✅ Return cached result if code was already checked
+    key = cache_key(code, language, kind="style")
+    cached = style_cache.get(key)
+    if cached is not None:
+        return cached
+
+    if language.lower() == "python":
+        result = style_result(code, [(0, style_facts(ctx))])
+    elif language.lower() == "javascript":
+        style = javascript_facts(ctx)["style"]
+        result = _result(style["suggestions"], style["warnings"], [])
+    else:
+        result = _result([], [Finding("style.unsupported-language", {"language": language})], [])
 
+    # ✅ Store result in cache
+    style_cache.put(key, result)
+    return result
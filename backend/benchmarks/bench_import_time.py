@@ -0,0 +1,157 @@
+"""
+Cold-start import time of the API, from `python -X importtime`.
+
+    cd backend && python -m benchmarks.bench_import_time                   # run, compare with import_baseline.json
+    cd backend && python -m benchmarks.bench_import_time --update-baseline # record a new baseline
+    cd backend && python -m benchmarks.bench_import_time --top 40 --module app.core.review_pipeline
+
+Imports `app.main` (or --module) in fresh interpreters, keeps the fastest
+run and prints the modules with the largest cumulative import time. The
+total is also stored divided by the suite's calibration workload (see
+benchmarks/suite.py), so baselines from different machines roughly
+compare. Exit status is 1 if the import got slower than the baseline by
+more than --threshold, or if importing app.main pulled in anything that
+should load lazily (SQLAlchemy, ReportLab, the analyzers: see
+app.core.warmup).
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from app.core.warmup import LAZY_MODULES, LAZY_PACKAGES
+
+from benchmarks.suite import calibrate
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "import_baseline.json")
+
+# Below this, differences between runs are noise rather than regressions
+MIN_MS = 20
+
+
+def import_profile(module: str = "app.main") -> List[Tuple[str, int, float, float]]:
+    """(module, depth, self ms, cumulative ms) for every import of one fresh `import module`."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(self_us) / 1000, int(cumulative_us) / 1000))
+    return rows
+
+
+def total_ms(rows, module: str) -> float:
+    """Cumulative time of `module` and the packages it lives in (interpreter start-up excluded)."""
+    return sum(
+        cumulative for name, depth, _, cumulative in rows
+        if depth == 0 and (name == module or module.startswith(name + "."))
+    )
+
+
+def eager_imports(rows) -> List[str]:
+    """Modules that should have been left for first use but were imported."""
+    loaded = {name for name, _, _, _ in rows}
+    return [name for name in LAZY_MODULES + LAZY_PACKAGES if name in loaded]
+
+
+def run(module: str = "app.main", repeat: int = 5) -> dict:
+    calibration = calibrate()
+    best = None
+    for _ in range(repeat):
+        rows = import_profile(module)
+        if best is None or total_ms(rows, module) < total_ms(best, module):
+            best = rows
+
+    total = total_ms(best, module)
+    top = sorted(best, key=lambda row: row[3], reverse=True)
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "module": module,
+            "repeat": repeat,
+            "calibration_seconds": round(calibration, 5),
+        },
+        "total_ms": round(total, 1),
+        "normalized": round(total / 1000 / calibration, 3),
+        "eager": eager_imports(best) if module == "app.main" else [],
+        "modules": {name: round(cumulative, 1) for name, _, _, cumulative in top[:50]},
+    }
+
+
+def compare(current: dict, baseline: Optional[dict], threshold: float = 0.25) -> List[str]:
+    """Problems with `current`: lazy modules imported, or a slower import than `baseline`."""
+    problems = [f"{name} is imported at startup (should load on first use)" for name in current["eager"]]
+    if baseline is None:
+        return problems
+    if current["meta"].get("module") != baseline["meta"].get("module"):
+        raise ValueError(
+            f"baseline was recorded for {baseline['meta'].get('module')}, "
+            f"this run imported {current['meta'].get('module')}"
+        )
+
+    slow_enough = max(current["total_ms"], baseline["total_ms"]) >= MIN_MS
+    if slow_enough and current["normalized"] > baseline["normalized"] * (1 + threshold):
+        problems.append(
+            f"import time {baseline['normalized']:.3f} -> {current['normalized']:.3f} "
+            f"(+{current['normalized'] / baseline['normalized'] - 1:.0%}, {current['total_ms']:.0f} ms)"
+        )
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main", help="module to import (default app.main)")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters to run (fastest is kept)")
+    parser.add_argument("--top", type=int, default=20, help="slowest modules to print")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, as a fraction (default 0.25)")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    current = run(args.module, args.repeat)
+    print(f"{'cumulative ms':>14}  module")
+    for name, cumulative in list(current["modules"].items())[:args.top]:
+        print(f"{cumulative:>14.1f}  {name}")
+    print(f"\n⏱️ import {args.module}: {current['total_ms']:.1f} ms ({current['normalized']:.3f} x calibration)")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"📌 Baseline written to {args.baseline}")
+        return 0
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    else:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to track import time.")
+    problems = compare(current, baseline, args.threshold)
+    if problems:
+        print(f"\n❌ {len(problems)} problem(s):")
+        for line in problems:
+            print(f"  {line}")
+        return 1
+    print(f"\n✅ No regressions over {args.threshold:.0%}, nothing heavy imported eagerly")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Scaling benchmark for the JavaScript tokenizer and the rule pass over it.
+
+    cd backend && python -m benchmarks.bench_js_analyzer [--sizes 0.1,1,4] [--repeat 3]
+
+Times tokenize() and the full analysis on generated bundles of increasing
+size (in MB), both as formatted source and minified onto one line, and
+prints the cost per KB. A linear pass keeps that column flat as bundles
+grow. The last rows feed in single huge strings, templates and comments.
+"""
+
+import argparse
+import time
+
+from app.core.analysis_context import AnalysisContext
+from app.utils.js_analyzer import javascript_facts
+from app.utils.js_lexer import tokenize
+
+from benchmarks.corpus import javascript_source
+
+
+def generated_bundle(megabytes: float, minified: bool = False) -> str:
+    """Roughly `megabytes` of bundler-style JavaScript."""
+    chunk = javascript_source(functions=50, nesting=3)
+    chunk += "const config = {name: 'app', retries: 3, urls: [`/api/${1 + 2}`, \"/x\"]};\n"
+    chunk += "export const re = /[a-z]+\\/[0-9]*/gi, half = total / 2 / 1;\n"
+    code = chunk * max(1, int(megabytes * 1024 * 1024 / len(chunk)))
+    if minified:
+        code = "\n".join(line.split(" //")[0].strip() for line in code.split("\n")).replace("\n", "")
+    return code
+
+
+def time_call(call, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="0.1,0.5,1,4", help="comma-separated bundle sizes in MB")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size (best is reported)")
+    args = parser.parse_args()
+
+    print(f"{'input':>28} {'tokens':>9} {'lex s':>8} {'total s':>8} {'us/KB':>8}")
+    for size in (float(s) for s in args.sizes.split(",")):
+        for minified in (False, True):
+            code = generated_bundle(size, minified)
+            tokens = len(tokenize(code))
+            lex = time_call(lambda: tokenize(code), args.repeat)
+            total = time_call(lambda: javascript_facts(AnalysisContext(code, "javascript")), args.repeat)
+            label = f"{len(code) / 1e6:.2f} MB{' minified' if minified else ''}"
+            print(f"{label:>28} {tokens:>9} {lex:>8.3f} {total:>8.3f} {total / len(code) * 1e9:>8.1f}")
+
+    for chars in (100_000, 1_000_000):
+        for name, blob in (
+            ("string", "s = '" + "A" * chars + "';\n"),
+            ("template", "t = `" + "A\n" * (chars // 2) + "`;\n"),
+            ("comment", "/*" + "*" * chars + "\n"),  # unterminated
+        ):
+            seconds = time_call(lambda: javascript_facts(AnalysisContext(blob, "javascript")), args.repeat)
+            print(f"{f'{chars} char {name}':>28} {'':>9} {'':>8} {seconds:>8.3f} {'':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Scaling benchmark for the text-level scan behind the style and review checks.
+
+    cd backend && python -m benchmarks.bench_source_scanner [--sizes 1000,10000,100000]
+
+Times scan_source() on generated modules of increasing size and prints the
+cost per line; a linear scan keeps that column flat as files grow. The last
+rows feed in single huge tokens, which the old regex heuristics handled in
+quadratic time.
+"""
+
+import argparse
+import time
+
+from app.core.analysis_context import AnalysisContext
+from app.utils.source_scanner import scan_source
+
+
+def generated_module(lines: int) -> str:
+    """Code-generator style module: imports, classes, methods, strings and comments."""
+    out = ["import os", "import sys", "from typing import Dict, List", ""]
+    i = 0
+    while len(out) < lines:
+        out += [
+            f"class Model{i}:",
+            f'    """Generated model {i}."""',
+            "",
+            f"    def load_{i}(self, rows: List[str], sep: str = ',') -> Dict[str, int]:",
+            f"        result = {{}}  # mapping for model {i}",
+            "        for row in rows:",
+            "            key, value = row.split(sep)",
+            f"            result[key] = int(value) + {i}",
+            "        return result",
+            "",
+            f"    def path_{i}(self):",
+            f"        return os.path.join(sys.prefix, f'model_{{self!r}}_{i}.json')",
+            "",
+        ]
+        i += 1
+    return "\n".join(out[:lines]) + "\n"
+
+
+def time_scan(code: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        ctx = AnalysisContext(code)
+        ctx.lines  # splitting is not part of the scan
+        started = time.perf_counter()
+        scan_source(ctx)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,50000,100000", help="comma-separated line counts")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size (best is reported)")
+    args = parser.parse_args()
+
+    print(f"{'input':>28} {'seconds':>10} {'us/line':>10}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        seconds = time_scan(generated_module(size), args.repeat)
+        print(f"{f'{size} lines':>28} {seconds:>10.3f} {seconds / size * 1e6:>10.2f}")
+
+    for chars in (100_000, 1_000_000):
+        blob = "data = '" + "A" * chars + "'\nBLOB" + "B" * chars + " = 1\n"
+        seconds = time_scan(blob, args.repeat)
+        print(f"{f'{chars} char literal + name':>28} {seconds:>10.3f} {'':>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Scaling benchmark for the project symbol index (cross-file call checks).
+
+    cd backend && python -m benchmarks.bench_symbol_index [--files 1000,10000] [--repeat 3]
+
+Builds a generated project of N modules in packages, each importing and
+calling functions from a few others, then times: indexing every file
+from scratch, reloading the persisted index and updating it with nothing
+changed (the next review of the same project), updating after one file
+changed, and checking every call in the project. Only the first should
+grow with the amount of code; the reload and check grow with the number
+of files and calls but never re-parse anything.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict
+
+from app.core.symbol_index import SymbolIndex
+
+
+def generated_project(files: int, per_package: int = 50, functions: int = 8) -> Dict[str, str]:
+    """{path: source} for `files` modules that call into each other."""
+    project = {}
+    for n in range(files):
+        package = f"pkg{n // per_package}"
+        lines = []
+        targets = [(n * 7 + k) % files for k in (1, 2, 3)]
+        for t in targets:
+            lines.append(f"from pkg{t // per_package}.mod{t} import func{t}_0, Helper{t}")
+        lines.append("")
+        for f in range(functions):
+            lines.append(f"def func{n}_{f}(a, b=1, *args, key=None):")
+            lines.append(f"    total = a + b")
+            for t in targets:
+                lines.append(f"    total += func{t}_0(a, b, key=total)")
+            lines.append("    return total")
+            lines.append("")
+        lines.append(f"class Helper{n}:")
+        lines.append("    def __init__(self, x):")
+        lines.append("        self.x = x")
+        lines.append("")
+        lines.append("    @staticmethod")
+        lines.append("    def make(x, y):")
+        lines.append(f"        return Helper{n}(x + y)")
+        lines.append("")
+        for t in targets:
+            lines.append(f"h{t} = Helper{t}.make(1, 2)")
+        project[f"{package}/mod{n}.py"] = "\n".join(lines) + "\n"
+        if n % per_package == 0:
+            project[f"{package}/__init__.py"] = ""
+    return project
+
+
+def best(call, repeat: int) -> float:
+    fastest = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        fastest = min(fastest, time.perf_counter() - started)
+    return fastest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", default="1000,5000,10000", help="comma-separated project sizes (files)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    print(f"{'files':>7} {'MB':>6} {'index s':>8} {'reload s':>9} {'1 change s':>10} {'check s':>8} {'issues':>7}")
+    for count in (int(n) for n in args.files.split(",")):
+        project = generated_project(count)
+        size = sum(len(code) for code in project.values()) / 1e6
+        with tempfile.TemporaryDirectory() as scratch:
+            store = os.path.join(scratch, "symbol_index.db")
+
+            def cold():
+                index = SymbolIndex(None, path="")
+                for path, code in project.items():
+                    index.update(path, code)
+
+            def reload():
+                index = SymbolIndex("bench", path=store)
+                for path, code in project.items():
+                    index.update(path, code)
+                index.save()
+                return index
+
+            index_seconds = best(cold, args.repeat)
+            reload()  # first review: stores everything
+            reload_seconds = best(reload, args.repeat)
+
+            index = reload()
+            changed = next(iter(project))
+            edits = iter(range(args.repeat))
+            change_seconds = best(lambda: index.update(changed, project[changed] + f"x = {next(edits)}\n"), args.repeat)
+            issues = []
+            check_seconds = best(lambda: issues.append(index.check()), args.repeat)
+
+        print(f"{count:>7} {size:>6.1f} {index_seconds:>8.2f} {reload_seconds:>9.2f} {change_seconds:>10.4f} "
+              f"{check_seconds:>8.2f} {len(issues[-1]):>7}")
+
+
+if __name__ == "__main__":
+    main()
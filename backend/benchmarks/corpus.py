@@ -0,0 +1,119 @@
+"""
+Synthetic source generator for the analyzer benchmarks.
+
+Each generator is deterministic and takes the knobs that drive analyzer
+cost: number of functions, nesting depth, line length, imports and
+constants. SHAPES names the combinations the suite runs, so results from
+different runs line up key by key.
+"""
+
+from typing import Callable, Dict, NamedTuple
+
+
+class Shape(NamedTuple):
+    language: str
+    functions: int = 20
+    nesting: int = 2
+    line_length: int = 60
+    imports: int = 5
+    constants: int = 5
+
+
+def _padding(prefix: str, length: int) -> str:
+    """A comment tail that pushes the line to roughly `length` characters."""
+    missing = length - len(prefix) - 3
+    return prefix + ("  # " + "x" * missing if missing > 0 else "")
+
+
+def python_source(functions: int = 20, nesting: int = 2, line_length: int = 60,
+                  imports: int = 5, constants: int = 5) -> str:
+    out = []
+    for i in range(imports):
+        out.append(f"import mod_{i}" if i % 2 else f"from pkg_{i} import name_{i}, Other{i}")
+    out.append("")
+    for i in range(constants):
+        out.append(f"LIMIT_{i} = {100 + i}")
+    out.append("")
+
+    for f in range(functions):
+        out.append(f"def handler_{f}(rows, key={f}):")
+        if f % 3:
+            out.append(f'    """Handler {f}."""')
+        out.append("    total = []")
+        indent = "    "
+        for level in range(nesting):
+            kind = level % 3
+            if kind == 0:
+                out.append(f"{indent}for item_{level} in rows:")
+            elif kind == 1:
+                out.append(f"{indent}if item_{level - 1} > {level * 7 + 13}:")
+            else:
+                out.append(f"{indent}while len(total) < {level * 11 + 17}:")
+            indent += "    "
+        out.append(_padding(f"{indent}total.append(sorted(rows)[key] * {f + 42})", line_length))
+        out.append("    return total")
+        out.append("")
+
+    # Call a few handlers with the wrong number of args for the logic checks
+    for f in range(0, functions, 5):
+        out.append(f"handler_{f}(LIMIT_0, 1, 2)" if constants else f"handler_{f}([], 1, 2)")
+    return "\n".join(out) + "\n"
+
+
+def javascript_source(functions: int = 20, nesting: int = 2, line_length: int = 60,
+                      imports: int = 5, constants: int = 5) -> str:
+    out = [f"import {{ name{i} }} from './module_{i}.js';" for i in range(imports)]
+    out += [f"const LIMIT_{i} = {100 + i};" for i in range(constants)]
+    out.append("")
+
+    for f in range(functions):
+        out.append(f"function handler{f}(rows, key) {{")
+        out.append("  var total = [];")
+        indent = "  "
+        for level in range(nesting):
+            if level % 2 == 0:
+                out.append(f"{indent}for (let i{level} = 0; i{level} < rows.length; i{level}++) {{")
+            else:
+                out.append(f"{indent}if (rows[i{level - 1}] == {level * 7 + 13}) {{")
+            indent += "  "
+        body = f"{indent}total.push(rows[key] * {f + 42});"
+        out.append(body + (" // " + "x" * (line_length - len(body) - 4) if line_length - len(body) > 4 else ""))
+        for level in range(nesting):
+            indent = indent[:-2]
+            out.append(f"{indent}}}")
+        out.append("  console.log(total.length);")
+        out.append("  return total;")
+        out.append("}")
+        out.append("")
+    return "\n".join(out) + "\n"
+
+
+GENERATORS: Dict[str, Callable[..., str]] = {
+    "python": python_source,
+    "javascript": javascript_source,
+}
+
+SHAPES: Dict[str, Shape] = {
+    "python/many_functions": Shape("python", functions=400),
+    "python/deep_nesting": Shape("python", functions=40, nesting=12),
+    "python/long_lines": Shape("python", functions=100, line_length=400),
+    "python/many_imports": Shape("python", functions=20, imports=1500),
+    "python/many_constants": Shape("python", functions=20, constants=3000),
+    "javascript/many_functions": Shape("javascript", functions=400),
+    "javascript/deep_nesting": Shape("javascript", functions=40, nesting=12),
+    "javascript/long_lines": Shape("javascript", functions=100, line_length=400),
+}
+
+
+def generate(shape: Shape, scale: float = 1.0) -> str:
+    """Source for `shape`; `scale` multiplies the counts (not the depth or line length)."""
+    def scaled(n: int) -> int:
+        return max(1, int(n * scale)) if n else 0
+
+    return GENERATORS[shape.language](
+        functions=scaled(shape.functions),
+        nesting=shape.nesting,
+        line_length=shape.line_length,
+        imports=scaled(shape.imports),
+        constants=scaled(shape.constants),
+    )
@@ -0,0 +1,276 @@
+"""
+Analyzer benchmark suite with a stored baseline and a regression gate.
+
+    cd backend && python -m benchmarks.suite                   # run, compare with baseline.json
+    cd backend && python -m benchmarks.suite --update-baseline # record a new baseline
+    cd backend && python -m benchmarks.suite --scale 0.1 --only python/deep_nesting
+
+Every analyzer runs on every corpus shape (see benchmarks/corpus.py) with
+caches cleared, so each timing includes parsing. Peak memory is measured
+with tracemalloc in a separate run, because tracing slows the code down.
+
+Each timing is the median of --repeat batches, and each batch runs the
+analyzer cold as many times as fit in --min-time. This keeps runs of a
+few milliseconds from being decided by one scheduler hiccup. The
+batches' spread is stored as "noise", and the gate widens the threshold
+by it.
+
+Timings are also stored divided by a fixed pure-Python calibration
+workload, timed alongside every batch. Comparisons use those normalized
+numbers, so a baseline recorded on one machine is roughly usable on
+another, and a machine that slows down mid-run doesn't look like a
+regression. Results are written
+as JSON (--output), and the exit status is 1 if any analyzer got slower
+(or used more memory) than the baseline by more than --threshold plus
+the noise.
+"""
+
+import argparse
+import ast
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from app.core import pdf_generator
+from app.core.analysis_context import AnalysisContext
+from app.core.findings import render_result
+from app.core.result_cache import review_cache
+from app.core.review_engine import analyze_code
+from app.utils.bug_detector import detect_bugs
+from app.utils.gpt_logic_checker import detect_logic_flaws
+from app.utils.performance_profiler import detect_performance_issues
+from app.utils.style_checker import check_code_style, style_cache
+
+from benchmarks.corpus import SHAPES, generate
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Below these, differences between runs are noise rather than regressions
+MIN_SECONDS = 0.005
+MIN_PEAK_KB = 256
+
+
+def _render_pdf(code: str, language: str, result: dict):
+    result = render_result(result)
+    pdf_generator.generate_review_pdf(
+        code, language, result["suggestions"], result["warnings"], result["optimizations"],
+        result["bugs"], result["score"], result["remark"], filename="bench.pdf",
+    )
+
+
+# name -> (languages, call(code, language, analysis result))
+ANALYZERS: Dict[str, tuple] = {
+    "analyze_code": (("python", "javascript"), lambda code, lang, _: analyze_code(lang, AnalysisContext(code, lang))),
+    "check_code_style": (("python", "javascript"), lambda code, lang, _: check_code_style(AnalysisContext(code, lang), lang)),
+    "detect_bugs": (("python",), lambda code, lang, _: detect_bugs(AnalysisContext(code))),
+    "detect_logic_flaws": (("python",), lambda code, lang, _: detect_logic_flaws(AnalysisContext(code))),
+    "detect_performance_issues": (("python",), lambda code, lang, _: detect_performance_issues(AnalysisContext(code))),
+    "generate_review_pdf": (("python", "javascript"), _render_pdf),
+}
+
+
+def _clear_caches():
+    review_cache.clear()
+    style_cache.clear()
+
+
+def _batch(call: Callable[[], object], min_time: float) -> float:
+    """Seconds per cold call, over as many calls as it takes to fill `min_time` (caches cleared untimed)."""
+    elapsed = 0.0
+    number = 0
+    while number == 0 or elapsed < min_time:
+        _clear_caches()
+        gc.collect()
+        started = time.perf_counter()
+        call()
+        elapsed += time.perf_counter() - started
+        number += 1
+    return elapsed / number
+
+
+def _median_and_noise(samples: List[float]) -> tuple:
+    """Median of `samples`, and their half-spread relative to it."""
+    samples = sorted(samples)
+    median = statistics.median(samples)
+    return median, (samples[-1] - samples[0]) / 2 / median if median else 0.0
+
+
+_CALIBRATION_SOURCE = generate(SHAPES["python/many_functions"], scale=0.25)
+
+
+def _calibration_workload():
+    tree = ast.parse(_CALIBRATION_SOURCE)
+    sum(1 for _ in ast.walk(tree))
+    sorted(_CALIBRATION_SOURCE.split())
+
+
+def calibrate(repeat: int = 5, min_time: float = 0.1) -> float:
+    """Seconds for a fixed parse-and-walk workload: the unit normalized timings are in."""
+    return _median_and_noise([_batch(_calibration_workload, min_time) for _ in range(repeat)])[0]
+
+
+def measure(call: Callable[[], object], repeat: int, min_time: float = 0.1) -> dict:
+    """
+    Median seconds per call over `repeat` timed batches, then the
+    tracemalloc peak of one more call. Every batch is paired with a
+    calibration batch run right before it. "normalized" is the median of
+    the per-pair ratios, and "noise" is their spread. A machine that slows
+    down mid-run (another tenant, thermal throttling) slows both halves of
+    a pair alike.
+    """
+    seconds, ratios = [], []
+    for _ in range(repeat):
+        unit = _batch(_calibration_workload, min_time / 2)
+        seconds.append(_batch(call, min_time))
+        ratios.append(seconds[-1] / unit)
+    normalized, noise = _median_and_noise(ratios)
+
+    _clear_caches()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds": round(statistics.median(seconds), 5),
+        "normalized": round(normalized, 3),
+        "noise": round(noise, 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def run(scale: float = 1.0, repeat: int = 5, only: Optional[List[str]] = None, log=print,
+        min_time: float = 0.1) -> dict:
+    calibration = calibrate(min_time=min_time)
+    results = {}
+    with tempfile.TemporaryDirectory() as report_dir:
+        # 🧪 PDFs go to a scratch directory, not app/static, and the on-disk
+        # analysis cache is detached: every run must do the work
+        saved_dir, pdf_generator.REPORT_DIR = pdf_generator.REPORT_DIR, report_dir
+        saved_backing, review_cache.backing = review_cache.backing, None
+        try:
+            for shape_name, shape in SHAPES.items():
+                code = generate(shape, scale)
+                analysis = None
+                for name, (languages, call) in ANALYZERS.items():
+                    key = f"{shape_name}/{name}"
+                    if shape.language not in languages or (only and not any(key.startswith(o) for o in only)):
+                        continue
+                    if name == "generate_review_pdf" and analysis is None:
+                        _clear_caches()
+                        analysis = analyze_code(shape.language, code)
+                    row = measure(lambda: call(code, shape.language, analysis), repeat, min_time)
+                    row["lines"] = code.count("\n")
+                    results[key] = row
+                    log(f"{key:<58} {row['seconds']:>9.4f}s ±{row['noise']:>5.0%} {row['peak_kb']:>10.1f} KB")
+        finally:
+            pdf_generator.REPORT_DIR = saved_dir
+            review_cache.backing = saved_backing
+            _clear_caches()
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": scale,
+            "repeat": repeat,
+            "min_time": min_time,
+            "calibration_seconds": round(calibration, 5),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.25) -> List[str]:
+    """
+    Regressions of `current` against `baseline`: normalized time more
+    than `threshold` (a fraction) plus twice the noisier side's spread
+    above the baseline's, or peak memory more than `threshold` above it.
+    Entries missing from either side, and ones too small to time or
+    weigh reliably, are skipped.
+    """
+    if current["meta"].get("scale") != baseline["meta"].get("scale"):
+        raise ValueError(
+            f"baseline was recorded at scale {baseline['meta'].get('scale')}, "
+            f"this run used {current['meta'].get('scale')}"
+        )
+
+    regressions = []
+    for key, old in baseline["results"].items():
+        new = current["results"].get(key)
+        if new is None:
+            continue
+        slow_enough = max(new["seconds"], old["seconds"]) >= MIN_SECONDS
+        allowed = threshold + 2 * max(new.get("noise", 0.0), old.get("noise", 0.0))
+        if slow_enough and new["normalized"] > old["normalized"] * (1 + allowed):
+            regressions.append(
+                f"{key}: time {old['normalized']:.3f} -> {new['normalized']:.3f} "
+                f"(+{new['normalized'] / old['normalized'] - 1:.0%})"
+            )
+        if max(new["peak_kb"], old["peak_kb"]) >= MIN_PEAK_KB and new["peak_kb"] > old["peak_kb"] * (1 + threshold):
+            regressions.append(
+                f"{key}: peak memory {old['peak_kb']:.0f} KB -> {new['peak_kb']:.0f} KB "
+                f"(+{new['peak_kb'] / old['peak_kb'] - 1:.0%})"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply corpus sizes (default 1.0)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed batches per analyzer (the median is kept)")
+    parser.add_argument("--min-time", type=float, default=0.1, help="seconds each timed batch runs for at least")
+    parser.add_argument("--only", action="append", help="run keys starting with this prefix (repeatable)")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, as a fraction (default 0.25)")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    current = run(args.scale, args.repeat, args.only, min_time=args.min_time)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"📌 Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline first.")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    try:
+        regressions = compare(current, baseline, args.threshold)
+    except ValueError as exc:
+        # e.g. a quick --scale 0.1 run: its timings don't line up with the baseline's
+        print(f"\n⚠️ Not compared with {args.baseline}: {exc}")
+        return 0
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) over {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\n✅ No regressions over {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
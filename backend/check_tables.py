@@ -1,7 +1,9 @@
 import sqlite3
 
-# This should match the path from app.db.session (usually same folder)
-conn = sqlite3.connect("app.db")
+from app.core import config
+
+# Same database the app uses (DATABASE_URL, sqlite only)
+conn = sqlite3.connect(config.DATABASE_URL.replace("sqlite:///", "", 1))
 cursor = conn.cursor()
 
 cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
@@ -1,16 +1,22 @@
+import os
+import tempfile
+
+# Keep the persistent analysis cache out of the source tree during tests
+os.environ.setdefault("ANALYSIS_CACHE_PATH", os.path.join(tempfile.mkdtemp(), "analysis_cache.db"))
+os.environ.setdefault("SYMBOL_INDEX_PATH", os.path.join(tempfile.mkdtemp(), "symbol_index.db"))
+# ...and rendered PDF reports out of app/static
+os.environ.setdefault("REPORT_DIR", tempfile.mkdtemp())
+# Analyze in-thread unless a test opts into the process pool
+os.environ.setdefault("ANALYSIS_WORKERS", "0")
+# Throwaway review database
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "reviews.db"))
+
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from app.models.code_review import Base
 from app.api.v1.endpoints.submit_code import get_db
+from app.core.database import SessionLocal as TestingSessionLocal, engine
 from app.main import app
 
-# Use same SQLite file as production
-SQLALCHEMY_DATABASE_URL = "sqlite:///./sql_app.db"  # ✅ update if needed
-
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
 # Recreate tables before each session
 @pytest.fixture(scope="session", autouse=True)
 def create_test_database():
@@ -0,0 +1,63 @@
+import ast
+
+from app.core.analysis_context import AnalysisContext
+from app.core.review_engine import analyze_code
+from app.utils.bug_detector import detect_bugs
+from app.utils.gpt_logic_checker import detect_logic_flaws
+from app.utils.performance_profiler import detect_performance_issues
+
+SAMPLE = (
+    "def add(a, b):\n"
+    "    return a + b\n"
+    "\n"
+    "for i in items:\n"
+    "    for j in items:\n"
+    "        for k in items:\n"
+    "            out.append(add(i, j, k))\n"
+    "sum = 0\n"
+)
+
+
+def test_single_parse_for_whole_pipeline(monkeypatch):
+    calls = []
+    real_parse = ast.parse
+
+    def counting_parse(*args, **kwargs):
+        calls.append(1)
+        return real_parse(*args, **kwargs)
+
+    monkeypatch.setattr(ast, "parse", counting_parse)
+
+    ctx = AnalysisContext(SAMPLE)
+    analyze_code("python", ctx)
+    detect_logic_flaws(ctx)
+    detect_performance_issues(ctx)
+    assert len(calls) == 1
+
+
+def test_context_results_match_plain_strings():
+    ctx = AnalysisContext(SAMPLE)
+    assert detect_bugs(ctx) == detect_bugs(SAMPLE)
+    assert detect_logic_flaws(ctx) == detect_logic_flaws(SAMPLE)
+    assert detect_performance_issues(ctx) == detect_performance_issues(SAMPLE)
+
+
+def test_rules_see_findings():
+    assert any("'sum'" in bug["message"] for bug in detect_bugs(SAMPLE))
+    assert any("called with 3 args" in flaw for flaw in detect_logic_flaws(SAMPLE))
+    issues = detect_performance_issues(SAMPLE)
+    assert issues[0].startswith("⚠️ Deeply nested loops")
+    assert sum("append" in issue for issue in issues) == 1
+
+
+def test_syntax_error_is_reported_once_per_analyzer():
+    ctx = AnalysisContext("def broken(:\n")
+    assert ctx.tree is None
+    assert ctx.syntax_error is not None
+    assert detect_bugs(ctx)[0]["severity"] == "high"
+    assert detect_logic_flaws(ctx) == ["❌ Syntax error in code; unable to analyze logic."]
+
+
+def test_deep_nesting_does_not_overflow_walk():
+    code = "x = " + "(" * 90 + "1" + ")" * 90 + "\n"
+    assert detect_bugs(code) == []
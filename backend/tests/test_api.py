@@ -11,3 +11,115 @@ def test_review_basic(client):
     assert "score" in data
     assert isinstance(data["remark"], str)
     assert isinstance(data["score"], int)
+
+
+def test_review_resubmission_is_cached(client):
+    from app.core.result_cache import review_cache
+
+    payload = {"language": "python", "code": "def f(x):\n    return x\n", "review_type": "basic"}
+    first = client.post("/api/v1/review", json=payload).json()
+    hits = review_cache.hits
+    second = client.post("/api/v1/review", json=payload).json()
+    # Every submission is its own stored review, with its own report link
+    assert second.pop("report_url") != first.pop("report_url")
+    assert second == first
+    assert review_cache.hits == hits + 1
+
+
+def test_report_is_rendered_lazily_and_supports_etag(client):
+    import os
+    from app.core.pdf_generator import REPORT_DIR, report_filename
+
+    code = "def g():\n    return 2\n"
+    data = client.post("/api/v1/review", json={
+        "language": "python",
+        "code": code,
+        "review_type": "basic"
+    }).json()
+    report_url = data["report_url"]
+    assert report_url.startswith("/api/v1/reviews/")
+
+    first = client.get(report_url)
+    assert first.status_code == 200
+    assert first.content.startswith(b"%PDF")
+    etag = first.headers["etag"]
+    assert os.path.exists(os.path.join(REPORT_DIR, report_filename(etag.strip('"'))))
+
+    # Identical review → same content-addressed file and ETag
+    again = client.post("/api/v1/review", json={"language": "python", "code": code}).json()
+    assert client.get(again["report_url"]).headers["etag"] == etag
+
+    cached = client.get(report_url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+
+def test_unknown_review_report_is_404(client):
+    assert client.get("/api/v1/reviews/nope/report.pdf").status_code == 404
+
+
+def test_review_batch_mixed_languages(client):
+    response = client.post("/api/v1/review/batch", json={"items": [
+        {"language": "python", "code": "def a(x):\n    return x\n"},
+        {"language": "javascript", "code": "var x = 1;\n"},
+        {"language": "python", "code": "def a(x):\n    return x\n"},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["index"] for r in results] == [0, 1, 2]
+    assert all(r["error"] is None for r in results)
+    assert any("'let' or 'const'" in s for s in results[1]["result"]["suggestions"])
+    # Duplicates share the analysis but are stored as separate reviews
+    assert results[0]["result"]["score"] == results[2]["result"]["score"]
+    assert results[0]["result"]["report_url"] != results[2]["result"]["report_url"]
+
+
+STREAMED = '''import json
+def f(x):
+    for i in range(10):
+        for j in range(10):
+            sum = x * 42
+            pass
+    return x
+    print(x)
+'''
+
+
+def test_review_stream_sends_each_stage_then_the_review(client):
+    import json
+    from app.core.findings import render_result
+    from app.core.review_pipeline import analyze_review
+
+    for language, code in (("python", STREAMED), ("javascript", "var a = 1;\nif (a == 2) console.log(a)\n")):
+        response = client.post("/api/v1/review/stream", json={"language": language, "code": code})
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert sorted(e["stage"] for e in events[:-1]) == ["bugs", "logic", "optimizations", "style"]
+
+        # The final event is the same review /review would return
+        review = events[-1]
+        assert review["type"] == "review" and review.pop("report_url").endswith(review.pop("review_id") + "/report.pdf")
+        review.pop("type")
+        assert review == render_result(analyze_review(code, language))
+
+    # Already reviewed: straight to the result
+    sse = client.post("/api/v1/review/stream", json={"language": "python", "code": STREAMED},
+                      headers={"Accept": "text/event-stream"})
+    assert sse.headers["content-type"].startswith("text/event-stream")
+    assert sse.text.startswith("event: review\ndata: {")
+
+
+def test_review_stream_stops_when_the_client_leaves():
+    import asyncio
+    from app.core.result_cache import cache_key, review_cache
+    from app.core.review_stream import stream_review
+
+    code = STREAMED + "y = 3\n"
+
+    async def consume():
+        async def gone():
+            return True
+        return [event async for event in stream_review(code, "python", disconnected=gone)]
+
+    events = asyncio.run(consume())
+    assert [event["type"] for event in events] == ["stage"]
+    assert review_cache.get(cache_key(code, "python", "basic")) is None
@@ -0,0 +1,76 @@
+import ast
+
+import pytest
+
+from benchmarks.bench_import_time import compare as compare_imports, eager_imports, import_profile, total_ms
+from benchmarks.corpus import SHAPES, Shape, generate, python_source
+from benchmarks.suite import compare, main, run
+
+
+def test_python_corpus_has_the_requested_shape():
+    code = python_source(functions=7, nesting=5, line_length=200, imports=4, constants=3)
+    tree = ast.parse(code)
+    assert sum(isinstance(n, ast.FunctionDef) for n in tree.body) == 7
+    assert sum(isinstance(n, (ast.Import, ast.ImportFrom)) for n in tree.body) == 4
+    assert max(len(line) for line in code.splitlines()) >= 200
+    assert code.count("LIMIT_2 = ") == 1
+
+
+def test_scale_grows_counts_only():
+    shape = Shape("javascript", functions=10, nesting=3)
+    assert generate(shape, 2).count("function ") == 20
+    assert generate(shape, 0.01).count("function ") == 1
+
+
+def _results(**rows):
+    return {"meta": {"scale": 1.0}, "results": rows}
+
+
+def test_compare_flags_time_and_memory_regressions():
+    baseline = _results(a={"seconds": 1.0, "normalized": 10.0, "peak_kb": 1000},
+                        b={"seconds": 1.0, "normalized": 10.0, "peak_kb": 1000},
+                        tiny={"seconds": 0.0001, "normalized": 0.001, "peak_kb": 4})
+    current = _results(a={"seconds": 1.5, "normalized": 15.0, "peak_kb": 1000},
+                       b={"seconds": 1.0, "normalized": 11.0, "peak_kb": 2000},
+                       tiny={"seconds": 0.0003, "normalized": 0.003, "peak_kb": 12})
+    regressions = compare(current, baseline, threshold=0.25)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("a: time")
+    assert regressions[1].startswith("b: peak memory")
+
+    with pytest.raises(ValueError):
+        compare({"meta": {"scale": 0.5}, "results": {}}, baseline)
+
+
+def test_noisy_timings_widen_the_threshold():
+    baseline = _results(a={"seconds": 1.0, "normalized": 10.0, "peak_kb": 10, "noise": 0.1})
+    assert compare(_results(a={"seconds": 1.4, "normalized": 14.0, "peak_kb": 10, "noise": 0.02}), baseline) == []
+    assert len(compare(_results(a={"seconds": 1.5, "normalized": 15.0, "peak_kb": 10, "noise": 0.02}), baseline)) == 1
+
+
+def test_suite_at_another_scale_skips_the_comparison(capsys):
+    assert main(["--scale", "0.02", "--repeat", "1", "--min-time", "0", "--only", "python/deep_nesting/detect_bugs"]) == 0
+    assert "Not compared with" in capsys.readouterr().out
+
+
+def test_suite_runs_every_analyzer_on_a_small_corpus():
+    current = run(scale=0.02, repeat=1, only=["python/deep_nesting"], log=lambda line: None, min_time=0)
+    assert set(current["results"]) == {
+        f"python/deep_nesting/{name}" for name in (
+            "analyze_code", "check_code_style", "detect_bugs", "detect_logic_flaws",
+            "detect_performance_issues", "generate_review_pdf",
+        )
+    }
+    assert all(row["peak_kb"] > 0 for row in current["results"].values())
+    assert "python/deep_nesting" in SHAPES
+
+
+def test_importing_the_app_leaves_heavy_modules_for_first_use():
+    rows = import_profile("app.main")
+    assert eager_imports(rows) == []
+    assert "fastapi" in {name for name, _, _, _ in rows}
+    assert total_ms(rows, "app.main") > 0
+
+    current = {"meta": {"module": "app.main"}, "total_ms": 900, "normalized": 20.0, "eager": ["sqlalchemy"]}
+    baseline = {"meta": {"module": "app.main"}, "total_ms": 500, "normalized": 10.0}
+    assert [p.split()[0] for p in compare_imports(current, baseline)] == ["sqlalchemy", "import"]
@@ -0,0 +1,143 @@
+import difflib
+
+import pytest
+
+from app.core.analysis_context import AnalysisContext
+from app.core.findings import Finding, aggregate, render_all
+from app.core.incremental import apply_unified_diff, review_python, split_regions
+from app.core.review_engine import analyze_code
+from app.utils.gpt_logic_checker import logic_findings
+from app.utils.style_checker import shift_lines, style_facts, style_result
+
+MODULE = (
+    "import os\n"
+    "import sys\n"
+    "LIMIT = 42\n"
+    "\n"
+    "def load(path, mode):\n"
+    "    return open(path, mode)\n"
+    "\n"
+    "#helper\n"
+    "class Cache:\n"
+    "    def get(self, key):\n"
+    "        for i in key:\n"
+    "            for j in key:\n"
+    "                pass\n"
+    "        return 7\n"
+    "\n"
+    "@staticmethod\n"
+    "def run():\n"
+    "    sum = load(sys.argv[1])\n"
+    "    return sum\n"
+    "    print('unreachable')\n"
+)
+
+
+def test_regions_cover_the_file_and_match_whole_file_analysis():
+    ctx = AnalysisContext(MODULE)
+    regions = split_regions(ctx)
+    assert "\n".join(region.text for region in regions) == MODULE
+    assert [region.text.split("\n")[0] for region in regions] == [
+        "import os", "def load(path, mode):", "", "class Cache:", "", "@staticmethod", "",
+    ]
+
+    result, _ = review_python(ctx)
+    whole = analyze_code("python", AnalysisContext(MODULE))
+    whole["warnings"].extend(aggregate(logic_findings(MODULE)))
+    assert result == whole
+
+
+def test_only_changed_regions_are_reanalyzed():
+    code = MODULE.replace("Cache", "StoreA")
+    review_python(AnalysisContext(code))
+    _, stats = review_python(AnalysisContext(code))
+    assert stats["reanalyzed"] == 0
+
+    edited = code.replace("return 7", "return 8")
+    result, stats = review_python(AnalysisContext(edited), previous_code=code)
+    assert stats["changed"] == 1
+    assert stats["reanalyzed"] == 1
+    assert stats["reused"] == stats["regions"] - 1
+
+    # a call in one region is still checked against a def in another
+    assert any("'load' called with 1 args" in w for w in render_all(result["warnings"]))
+
+
+def test_style_findings_are_remapped_to_their_new_lines():
+    facts = style_facts("x = 1\n#comment\n")
+    assert facts["suggestions"] == [Finding("style.comment-space", line=2)]
+    assert style_result("", [(10, facts)])["suggestions"][0].line == 12
+    assert shift_lines(facts["suggestions"], 10) == [Finding("style.comment-space", line=12)]
+
+
+def test_apply_unified_diff_round_trip():
+    new = MODULE.replace("LIMIT = 42\n", "").replace("return 7", "return 9") + "run()"
+    diff = "".join(difflib.unified_diff(MODULE.splitlines(True), new.splitlines(True), "a/m.py", "b/m.py"))
+    diff += "\n\\ No newline at end of file\n"
+    assert apply_unified_diff(MODULE, diff) == new
+
+
+def test_apply_unified_diff_rejects_mismatched_hunk():
+    diff = "--- a/m.py\n+++ b/m.py\n@@ -1,1 +1,1 @@\n-import json\n+import re\n"
+    with pytest.raises(ValueError):
+        apply_unified_diff(MODULE, diff)
+
+
+def test_incremental_review_endpoint(client):
+    code = MODULE.replace("Cache", "StoreB")
+    first = client.post("/api/v1/review", json={"language": "python", "code": code}).json()
+    uid = first["report_url"].split("/")[-2]
+
+    new = code.replace("return 7", "return 11")
+    diff = "".join(difflib.unified_diff(code.splitlines(True), new.splitlines(True)))
+    response = client.post("/api/v1/review/incremental", json={"previous_review_id": uid, "diff": diff})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["incremental"]["changed"] == 1
+    assert data["incremental"]["reanalyzed"] == 1
+    assert data["review_id"] != uid
+
+    # chain the next revision off the new review, sending the full code this time
+    again = client.post("/api/v1/review/incremental", json={"previous_review_id": data["review_id"], "code": new})
+    assert again.json()["incremental"]["changed"] == 0
+    assert again.json()["score"] == data["score"]
+
+    assert client.post("/api/v1/review/incremental", json={"previous_review_id": "nope", "code": new}).status_code == 404
+    assert client.post("/api/v1/review/incremental", json={"previous_review_id": uid}).status_code == 422
+
+
+def test_duplicated_function_is_analyzed_once_across_files(monkeypatch):
+    import app.core.incremental as incremental
+
+    vendored = "def crunch(rows):\n    for r in rows:\n        for c in r:\n            total.append(c * 99)\n"
+    walked = []
+    real_tree_facts = incremental.tree_facts
+
+    def counting_tree_facts(ctx):
+        walked.append(ctx.code)
+        return real_tree_facts(ctx)
+
+    monkeypatch.setattr(incremental, "tree_facts", counting_tree_facts)
+
+    original, first = review_python(AnalysisContext("import os\n\n" + vendored))
+    # same function further down, re-commented and with different blank lines
+    other = "x = os.getcwd()\n\n\n# vendored helper\n" + vendored.replace("rows):\n", "rows):\n\n") + "\ncrunch(x)\n"
+    result, second = review_python(AnalysisContext(other))
+
+    assert first["shared"] == 0
+    assert second["shared"] == 1
+    assert sum("def crunch" in code for code in walked) == 1
+    assert any("Nested loops" in o for o in render_all(result["optimizations"]))
+    assert any("Magic number `99`" in o for o in render_all(result["optimizations"]))
+    # lines only carry over with the text: the shared fragment's are dropped
+    def nested_line(review):
+        return next(f.line for f in review["optimizations"] if f.rule == "perf.nested-loops")
+    assert nested_line(original) == 5 and nested_line(result) is None
+
+
+def test_performance_issues_from_regions_match_whole_file():
+    from app.core.incremental import performance_issues
+    from app.utils.performance_profiler import find_performance_issues
+
+    code = "x = 1\n\ndef f(xs):\n    for x in xs:\n        for y in x:\n            for z in y:\n                out.append(sorted(z))\n"
+    assert performance_issues(AnalysisContext(code)) == find_performance_issues(code)
@@ -0,0 +1,61 @@
+from app.core.findings import render_all
+from app.core.review_engine import analyze_code
+from app.utils.js_analyzer import javascript_facts
+from app.utils.js_lexer import tokenize
+
+
+def _rules(findings):
+    return [(f.rule, f.line) for f in findings]
+
+
+def test_lexer_keeps_strings_comments_templates_and_regexes_whole():
+    code = "const s = 'var == x'; // var x == y\nlet t = `a ${ {k: 1}.k } b`, r = /[/]==/g;\nx = a / b / c;\n"
+    tokens = tokenize(code)
+    assert [t.value for t in tokens if t.kind in ("string", "template", "regex")] == [
+        "'var == x'", "`a ${", "} b`", "/[/]==/g",
+    ]
+    assert [t.value for t in tokens if t.value == "/"] == ["/", "/"]  # divisions, not regexes
+    assert tokens[-1].line == 3
+    # broken input never raises
+    assert tokenize("s = 'unterminated\n/* open comment")[-1].value == "'unterminated"
+
+
+def test_rules_ignore_text_inside_strings_and_comments():
+    facts = javascript_facts("// var x == y; console.log(1)\nconst s = \"var a == b\";\nif (a !== b) {}\n")
+    assert not (facts["suggestions"] or facts["warnings"] or facts["optimizations"] or facts["bugs"])
+
+
+def test_style_equality_and_console_findings_carry_lines():
+    facts = javascript_facts("var a = 1;\nif (a == 2 || a != 3) {\n\tconsole.debug(a);\n}")
+    assert _rules(facts["suggestions"]) == [("js.no-var", 1)]
+    assert [(f.args["strict"], f.line) for f in facts["warnings"]] == [("===", 2), ("!==", 2)]
+    assert _rules(facts["optimizations"]) == [("js.console-log", 3)]
+    assert _rules(facts["style"]["warnings"]) == [("style.tab-indent", 3)]
+    assert _rules(facts["style"]["suggestions"]) == [("style.final-newline", 4)]
+
+
+def test_bug_rules():
+    code = (
+        "let undefined = 1;\n"
+        "const o = {a: 1, 'b': 2, a: 3, get c() { return 1 }, set c(v) {}, [k]: 1, ...rest};\n"
+        "function f(x) {\n"
+        "  if (x) return 1;\n"
+        "  switch (x) { case 1: return 2; default: break; }\n"
+        "  return x\n"
+        "    .trim();\n"
+        "  cleanup();\n"
+        "}\n"
+        "function g() {\n"
+        "  return\n"
+        "  42;\n"
+        "}\n"
+    )
+    assert _rules(javascript_facts(code)["bugs"]) == [
+        ("js.shadowed-global", 1), ("js.duplicate-key", 2), ("js.unreachable", 8), ("js.unreachable", 12),
+    ]
+
+
+def test_javascript_reviews_report_bugs():
+    result = analyze_code("javascript", "var x = {a: 1, a: 2};\nconsole.log(x == 1);\n")
+    assert render_all(result["bugs"])[0]["message"] == "Duplicate key 'a' in object literal."
+    assert render_all(result["warnings"]) == ["⚠️ Use '===' for strict equality in JavaScript (medium impact)"]
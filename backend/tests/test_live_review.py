@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+import pytest
+
+import app.core.live_review as live_review
+from app.core import config
+from app.core.live_review import LiveSession, apply_changes, split_text
+
+
+def test_editor_changes_apply_against_the_previous_text():
+    code = "def f(x):\n    return x\n"
+    # Monaco reports every change of one edit against the text before it
+    changes = [{"offset": 0, "length": 3, "text": "async def"}, {"offset": 21, "length": 1, "text": "x + 1"}]
+    assert apply_changes(code, changes) == "async def f(x):\n    return x + 1\n"
+    with pytest.raises(ValueError):
+        apply_changes(code, [{"offset": 20, "length": 10, "text": ""}])
+    for bad in (5, None, [5], [{"offset": 1e400}], [{"offset": 0, "length": float("inf")}]):
+        with pytest.raises(ValueError):
+            apply_changes(code, bad)
+
+
+def test_deep_review_waits_for_a_pause_in_every_language(monkeypatch):
+    monkeypatch.setattr(config, "LIVE_QUICK_DEBOUNCE_MS", 10)
+    monkeypatch.setattr(config, "LIVE_DEEP_DEBOUNCE_MS", 150)
+    reviewed = []
+
+    async def fake_review(self, code, language):
+        reviewed.append(time.perf_counter())
+        return {"suggestions": [], "warnings": [], "optimizations": [], "bugs": [], "score": 100, "remark": ""}
+
+    async def noop(message):
+        pass
+
+    async def main():
+        monkeypatch.setattr(LiveSession, "_review", fake_review)
+        session = LiveSession(send=noop)
+        started = time.perf_counter()
+        session.update({"language": "javascript", "code": "var x = 1;\n"})
+        await session._job
+        return started
+
+    started = asyncio.run(main())
+    assert reviewed and reviewed[0] - started >= 0.14
+
+
+def test_split_text_keeps_decorators_with_their_function():
+    code = "import os\n\n@cache\n@trace\ndef f():\n    pass\nclass A:\n    x = 1\n"
+    assert [start for start, _ in split_text(code)] == [0, 2, 6]
+
+
+def test_quick_check_only_rechecks_changed_chunks(monkeypatch):
+    checked = []
+    real_chunk_facts = live_review.chunk_facts
+    monkeypatch.setattr(live_review, "chunk_facts", lambda text: checked.append(text) or real_chunk_facts(text))
+
+    session = LiveSession(send=None)
+    code = "def a():\n    return 1\n\ndef b():\n\treturn 2\n"
+    first = session.quick_check(code)
+    assert [f.rule for f in first["warnings"]] == ["style.tab-indent"] and first["warnings"][0].line == 5
+
+    # typing in a(): b() is reused, and a syntax error there is reported on its own line
+    second = session.quick_check(code.replace("return 1", "return (1"))
+    assert len(checked) == 3
+    assert [(f.rule, f.line) for f in second["warnings"]] == [("live.syntax-error", 2), ("style.tab-indent", 5)]
+
+
+def test_live_review_reports_only_the_latest_version(client, monkeypatch):
+    monkeypatch.setattr(config, "LIVE_QUICK_DEBOUNCE_MS", 20)
+    monkeypatch.setattr(config, "LIVE_DEEP_DEBOUNCE_MS", 60)
+
+    with client.websocket_connect("/api/v1/review/live") as ws:
+        ws.send_json({"version": 1, "language": "python", "code": "def f(x):\n    return x\n"})
+        ws.send_json({"version": 2, "changes": [{"offset": 23, "length": 0, "text": "print(f(1, 2))\n"}]})
+        quick = ws.receive_json()
+        review = ws.receive_json()
+        assert (quick["type"], quick["version"]) == ("quick", 2)
+        assert (review["type"], review["version"]) == ("review", 2)
+        assert any("called with 2 args" in w for w in review["warnings"])
+
+        ws.send_text("not json")
+        assert ws.receive_json()["type"] == "error"
+        # malformed edits get an error frame; the connection stays up
+        ws.send_json({"version": 3, "changes": 5})
+        assert ws.receive_json()["type"] == "error"
+        ws.send_json({"version": 4, "changes": [{"offset": 1e400, "length": 0, "text": ""}]})
+        assert ws.receive_json()["type"] == "error"
+        ws.send_text("[]")
+        assert ws.receive_json()["type"] == "error"
@@ -0,0 +1,70 @@
+import time
+
+from app.core import metrics
+
+
+def _stages(header):
+    return {part.split(";")[0]: float(part.split("dur=")[1]) for part in header.split(", ")}
+
+
+def test_review_reports_stage_timings(client):
+    code = "import os\n\ndef metrics_probe(a):\n    return a\n"
+    response = client.post("/api/v1/review", json={"language": "python", "code": code})
+    assert response.status_code == 200
+    stages = _stages(response.headers["Server-Timing"])
+    for stage in ("parse", "scan", "style", "bugs", "analysis", "db", "total"):
+        assert stage in stages
+    assert sum(v for k, v in stages.items() if k != "total") <= stages["total"] + 1
+
+    # resubmission is served from the review cache: no analysis stages
+    again = _stages(client.post("/api/v1/review", json={"language": "python", "code": code}).headers["Server-Timing"])
+    assert "parse" not in again and "db" in again
+
+
+def test_metrics_endpoint_exposes_prometheus_text(client):
+    client.post("/api/v1/review", json={"language": "python", "code": "x = 1\n"})
+    client.post("/api/v1/review", json={"language": "python", "code": "x = 1\n"})
+    text = client.get("/metrics").text
+
+    assert "# TYPE review_stage_seconds histogram" in text
+    assert 'review_stage_seconds_bucket{stage="parse",le="+Inf"}' in text
+    assert 'http_requests_total{method="POST",route="/api/v1/review",status="200"}' in text
+    assert 'cache_lookups_total{cache="review",result="hit"}' in text
+    assert 'review_input_lines_count{language="python"}' in text
+
+
+def test_input_language_label_is_bounded(client):
+    for language in ("Python", "COBOL-1", "cobol-2"):
+        client.post("/api/v1/review", json={"language": language, "code": "x = 1\n"})
+    text = client.get("/metrics").text
+    assert 'review_input_bytes_count{language="other"}' in text
+    assert "cobol" not in text.lower() and 'language="Python"' not in text
+
+
+def test_nested_stages_are_exclusive():
+    with metrics.collect() as timings:
+        with metrics.timed("outer"):
+            time.sleep(0.02)
+            with metrics.timed("inner"):
+                time.sleep(0.05)
+    assert timings.stages["inner"] >= 0.05
+    assert 0.02 <= timings.stages["outer"] < 0.05
+
+    # outside a collection, timing is a no-op
+    with metrics.timed("ignored"):
+        pass
+
+
+def test_worker_timings_are_merged_with_queue_time():
+    result, exported = metrics.measured(sorted, [3, 1, 2])
+    assert result == [1, 2, 3] and "analysis" in exported["stages"]
+    with metrics.collect() as timings:
+        metrics.merge({"stages": {"parse": 0.25}, "lookups": {"region:miss": 2}}, waited=1.0)
+    assert timings.stages == {"parse": 0.25, "queue": 0.75}
+    assert timings.lookups == {"region:miss": 2}
+
+
+def test_route_label_is_the_path_template(client):
+    client.get("/api/v1/reviews/does-not-exist/report.pdf")
+    text = client.get("/metrics").text
+    assert 'route="/api/v1/reviews/{review_uid}/report.pdf",status="404"' in text
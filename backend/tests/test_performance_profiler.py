@@ -0,0 +1,104 @@
+from app.core.analysis_context import AnalysisContext
+from app.core.incremental import performance_issues, performance_profile
+from app.utils.performance_profiler import complexity, find_performance_issues, performance_facts
+
+CODE = (
+    "SEEN = []\n"
+    "\n"
+    "def dedupe(items: list):\n"
+    "    out = ''\n"
+    "    for a in sorted(items):\n"
+    "        if a in SEEN:\n"
+    "            continue\n"
+    "        for b in items:\n"
+    "            out += str(b)\n"
+    "            rows.append(b)\n"
+    "            rows.append(a)\n"
+    "    return out\n"
+    "\n"
+    "class Table:\n"
+    "    def ordered(self, rows):\n"
+    "        rows.sort()\n"
+    "        return [r for r in rows if r in {1, 2}]\n"
+    "\n"
+    "    def grid(self, rows):\n"
+    "        return [[r.sort() for r in row] for row in rows]\n"
+    "\n"
+    "def lookup(key):\n"
+    "    return key\n"
+)
+
+
+def _estimates(code):
+    return {f.args["name"]: (f.args["complexity"], f.line) for f in performance_facts(code)["functions"]}
+
+
+def test_complexity_text():
+    assert [complexity(0), complexity(1), complexity(1, 1), complexity(2), complexity(3, 1), complexity(12)] == [
+        "O(1)", "O(n)", "O(n log n)", "O(n²)", "O(n³ log n)", "O(n¹²)",
+    ]
+
+
+def test_complexity_is_estimated_per_function():
+    assert _estimates(CODE) == {
+        "dedupe": ("O(n³)", 3),  # two loops, then a string copied per iteration
+        "Table.ordered": ("O(n log n)", 15),
+        "Table.grid": ("O(n³ log n)", 19),
+        "lookup": ("O(1)", 22),
+    }
+    # the loop runs inside the nested function only
+    code = "def outer(xs):\n    for x in xs:\n        def inner(ys):\n            return [y for y in ys]\n    return 1\n"
+    assert _estimates(code) == {"outer": ("O(n)", 1), "outer.inner": ("O(n)", 3)}
+
+
+def test_hot_spots_have_lines_and_no_duplicates():
+    found = [(f.rule, f.line) for f in performance_facts(CODE)["findings"]]
+    assert found == [
+        ("perf.list-membership", 6),
+        ("perf.string-concat-in-loop", 9),
+        ("perf.loop-append", 10),  # once for the loop, not once per .append()
+        ("perf.sort-in-loop", 20),
+    ]
+    # sorting what a loop iterates over happens once; a set lookup is fine
+    assert not any(line in (5, 17) for _, line in found)
+
+
+def test_regions_give_the_whole_file_report():
+    report = performance_profile(AnalysisContext(CODE))
+    assert report["complexity"] == "O(n³ log n)"
+    assert [f.rule for f in report["findings"]][:2] == ["perf.complexity", "perf.complexity"]
+    assert [(f.line, f.args["name"]) for f in report["functions"]] == [(3, "dedupe"), (15, "Table.ordered"),
+                                                                       (19, "Table.grid"), (22, "lookup")]
+
+
+def test_module_level_lists_reach_later_regions(client):
+    code = "ITEMS = [1, 2, 3]\n\ndef f(xs):\n    for x in xs:\n        if x in ITEMS:\n            return x\n"
+    whole = find_performance_issues(code)
+    assert [(f.rule, f.line) for f in whole] == [("perf.complexity", 3), ("perf.list-membership", 5)]
+    assert performance_issues(AnalysisContext(code)) == whole
+    body = client.post("/api/v1/analyze/performance", json={"code": code}).json()
+    assert body["functions"][0]["complexity"] == "O(n²)"
+    assert [(issue["rule"], issue["line"]) for issue in body["issues"]] == [("perf.complexity", 3), ("perf.list-membership", 5)]
+
+    # Same function text, but ITEMS is a set now: the cached region isn't reused
+    as_set = code.replace("[1, 2, 3]", "{1, 2, 3}")
+    assert performance_issues(AnalysisContext(as_set)) == find_performance_issues(as_set) == []
+    # ...nor when a later binding shadows it, or it's bound after the function
+    rebound = code + "\nITEMS = 'abc'\n"
+    assert performance_issues(AnalysisContext(rebound)) == whole
+    assert performance_issues(AnalysisContext(code.replace("ITEMS = [1, 2, 3]\n", "") + "\nITEMS = []\n")) == []
+
+
+def test_performance_endpoint(client):
+    response = client.post("/api/v1/analyze/performance", json={"code": CODE})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["complexity"] == "O(n³ log n)"
+    assert body["functions"][0] == {"name": "dedupe", "line": 3, "end_line": 12, "complexity": "O(n³)", "severity": "high"}
+    assert [(issue["rule"], issue["line"]) for issue in body["issues"]][-1] == ("perf.sort-in-loop", 20)
+    assert "⏱️ 'dedupe' is estimated at O(n³) — nested loops over the same data grow fast." in body["optimizations"]
+
+    broken = client.post("/api/v1/analyze/performance", json={"code": "def broken(:\n"}).json()
+    assert broken["complexity"] is None
+    assert broken["optimizations"] == ["❌ Unable to analyze performance due to syntax errors."]
+    assert client.post("/api/v1/analyze/performance", json={"code": "x", "language": "javascript"}).status_code == 400
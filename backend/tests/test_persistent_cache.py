@@ -0,0 +1,31 @@
+from app.core.persistent_cache import PersistentCache
+from app.core.result_cache import ResultCache
+
+
+def test_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.db")
+    writer = ResultCache(backing=PersistentCache(path, "v1", 10_000))
+    writer.put("k", {"score": 90})
+
+    # A fresh process/worker starts with an empty memory tier
+    reader = ResultCache(backing=PersistentCache(path, "v1", 10_000))
+    assert reader.get("k") == {"score": 90}
+    assert reader.disk_hits == 1
+    assert reader.get("k") == {"score": 90}
+    assert reader.hits == 1
+
+
+def test_rule_change_invalidates_entries(tmp_path):
+    path = str(tmp_path / "cache.db")
+    PersistentCache(path, "v1", 10_000).put("k", b"old")
+    assert PersistentCache(path, "v2", 10_000).get("k") is None
+    assert PersistentCache(path, "v1", 10_000).get("k") is None  # dropped on open
+
+
+def test_size_based_eviction(tmp_path):
+    store = PersistentCache(str(tmp_path / "cache.db"), "v1", 100)
+    for i in range(5):
+        store.put(f"k{i}", b"x" * 40)
+    store.evict()
+    assert store.get("k0") is None
+    assert store.get("k4") == b"x" * 40
@@ -0,0 +1,78 @@
+import io
+import marshal
+import re
+
+import pytest
+
+from app.core import config
+from benchmarks.corpus import python_source
+
+ADMIN = {"X-Admin-Token": "s3cret"}
+
+
+@pytest.fixture()
+def profiling_on(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "PROFILING_ENABLED", 1)
+    monkeypatch.setattr(config, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "s3cret")
+    monkeypatch.setattr(config, "PROFILE_SAMPLE_INTERVAL_MS", 1)
+
+
+def test_cprofile_dump_is_stored_and_served(client, profiling_on):
+    code = python_source(functions=5) + "# cprofile\n"
+    response = client.post("/api/v1/review?profile=cprofile", json={"language": "python", "code": code}, headers=ADMIN)
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+
+    dump = client.get(f"/api/v1/admin/profiles/{profile_id}.pstats", headers=ADMIN)
+    assert dump.status_code == 200
+    stats = marshal.load(io.BytesIO(dump.content))  # what pstats.Stats() reads
+    # analysis ran in the profiled thread, not on the worker pool or from cache
+    assert any(func[2] == "analyze_review" for func in stats)
+
+    listed = client.get("/api/v1/admin/profiles", headers=ADMIN).json()["profiles"]
+    assert listed[0]["id"] == profile_id and listed[0]["label"] == "/review"
+
+
+def test_sampled_profile_has_collapsed_stacks_only(client, profiling_on):
+    code = python_source(functions=150) + "# sampled\n"
+    response = client.post("/api/v1/review", json={"language": "python", "code": code}, headers={"X-Profile": "sample", **ADMIN})
+    profile_id = response.headers["X-Profile-Id"]
+
+    collapsed = client.get(f"/api/v1/admin/profiles/{profile_id}.collapsed", headers=ADMIN).text
+    lines = collapsed.splitlines()
+    assert lines and all(re.match(r"^\S.* \d+$", line) for line in lines)
+    assert "analyze_review" in collapsed
+    assert client.get(f"/api/v1/admin/profiles/{profile_id}.pstats", headers=ADMIN).status_code == 404
+
+
+def test_profiling_is_off_unless_enabled(client, monkeypatch):
+    monkeypatch.setattr(config, "PROFILING_ENABLED", 0)
+    response = client.post("/api/v1/review?profile=1", json={"language": "python", "code": "x = 1\n"})
+    assert "X-Profile-Id" not in response.headers
+
+
+def test_profiling_needs_the_admin_token(client, profiling_on):
+    for headers in ({}, {"X-Admin-Token": "nope"}, {"X-Admin-Token": "nöpe".encode("latin-1")}):
+        response = client.post("/api/v1/review?profile=cprofile", json={"language": "python", "code": "x = 2\n"},
+                               headers={"X-Profile": "cprofile", **headers})
+        assert response.status_code == 200 and "X-Profile-Id" not in response.headers
+
+
+def test_admin_endpoints_need_the_token(client, profiling_on, monkeypatch):
+    assert client.get("/api/v1/admin/profiles").status_code == 403
+    assert client.get("/api/v1/admin/profiles", headers={"X-Admin-Token": "nope"}).status_code == 403
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "")
+    assert client.get("/api/v1/admin/profiles", headers=ADMIN).status_code == 404
+
+
+def test_profile_store_is_bounded(client, profiling_on, monkeypatch):
+    monkeypatch.setattr(config, "PROFILE_MAX_ENTRIES", 2)
+    ids = [
+        client.post("/api/v1/review?profile=sample", json={"language": "python", "code": f"x = {i}\n"}, headers=ADMIN)
+        .headers["X-Profile-Id"]
+        for i in range(3)
+    ]
+    listed = [p["id"] for p in client.get("/api/v1/admin/profiles", headers=ADMIN).json()["profiles"]]
+    assert listed == ids[:0:-1]
+    assert client.get(f"/api/v1/admin/profiles/{ids[0]}.collapsed", headers=ADMIN).status_code == 404
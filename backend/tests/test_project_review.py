@@ -0,0 +1,91 @@
+import io
+import json
+import tarfile
+import zipfile
+
+from app.core import config
+
+FILES = {
+    "pkg/good.py": "def add(a, b):\n    return a + b\n",
+    "pkg/web/app.js": "var x = 1;\nconsole.log(x == 2);\n",
+    "README.md": "# not reviewed\n",
+    "node_modules/dep/index.js": "var skipped = true;\n",
+}
+
+
+def _zip_bytes():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, code in FILES.items():
+            archive.writestr(name, code)
+    return buffer.getvalue()
+
+
+def _tar_gz_bytes():
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, code in FILES.items():
+            data = code.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def _events(response):
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def _check_events(events):
+    files = {e["path"]: e for e in events if e["type"] == "file"}
+    assert set(files) == {"pkg/good.py", "pkg/web/app.js"}
+    assert files["pkg/web/app.js"]["language"] == "javascript"
+    project = events[-1]
+    assert project["type"] == "project"
+    assert project["files"] == 2
+    assert set(project["languages"]) == {"python", "javascript"}
+
+
+def test_zip_archive_review(client):
+    response = client.post("/api/v1/review/project/archive", content=_zip_bytes())
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    _check_events(_events(response))
+
+
+def test_tar_gz_archive_review(client):
+    response = client.post("/api/v1/review/project/archive", content=_tar_gz_bytes())
+    _check_events(_events(response))
+
+
+def test_archive_symbol_index_is_kept_under_a_server_issued_id(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SYMBOL_INDEX_PATH", str(tmp_path / "symbols.db"))
+    first = client.post("/api/v1/review/project/archive?project=new", content=_zip_bytes())
+    project = first.headers["X-Project-Id"]
+    assert len(project) == 32 and _events(first)[-1]["symbols"]["reused"] == 0
+    again = client.post(f"/api/v1/review/project/archive?project={project}", content=_zip_bytes())
+    assert _events(again)[-1]["symbols"]["reused"] == 1
+
+    # Names can't be chosen (and collide with someone else's)
+    assert client.post("/api/v1/review/project/archive?project=shared", content=_zip_bytes()).status_code == 400
+    assert "X-Project-Id" not in client.post("/api/v1/review/project/archive", content=_zip_bytes()).headers
+
+
+def test_rejects_non_archive(client):
+    response = client.post("/api/v1/review/project/archive", content=b"def f(): pass\n")
+    assert response.status_code == 400
+
+
+def test_directory_review_is_confined_to_project_root(client, tmp_path, monkeypatch):
+    project = tmp_path / "proj"
+    for name, code in FILES.items():
+        path = project / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(code)
+    monkeypatch.setattr(config, "PROJECT_ROOT", str(tmp_path))
+
+    response = client.post("/api/v1/review/project/directory", json={"path": "proj"})
+    _check_events(_events(response))
+
+    outside = client.post("/api/v1/review/project/directory", json={"path": "../.."})
+    assert outside.status_code == 403
@@ -0,0 +1,23 @@
+import os
+
+from app.core import report_store
+
+
+def test_budget_evicts_least_recently_used_renders(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_store, "REPORT_DIR", str(tmp_path))
+    names = [f"code_review_report_{str(i) * 64}.pdf" for i in range(3)]
+    for age, name in enumerate(names):
+        path = tmp_path / name
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 + age, 1000 + age))
+    (tmp_path / "favicon.ico").write_bytes(b"y" * 1000)
+
+    removed = report_store.enforce_budget(max_bytes=250)
+    assert [os.path.basename(p) for p in removed] == [names[0]]
+    assert (tmp_path / "favicon.ico").exists()
+
+
+def test_digest_changes_with_content():
+    base = {"code": "x = 1\n", "language": "python", "score": 90}
+    assert report_store.report_digest(base) == report_store.report_digest(dict(base))
+    assert report_store.report_digest(base) != report_store.report_digest({**base, "score": 80})
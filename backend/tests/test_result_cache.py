@@ -0,0 +1,41 @@
+from app.core.result_cache import ResultCache, cache_key
+
+
+def test_key_depends_on_language_and_review_type():
+    code = "print('hi')\n"
+    assert cache_key(code, "python") != cache_key(code, "javascript")
+    assert cache_key(code, "python", "basic") != cache_key(code, "python", "advanced")
+    assert cache_key(code, "Python") == cache_key(code, "python")
+    assert code not in cache_key(code, "python")
+
+
+def test_hit_returns_independent_copy():
+    cache = ResultCache(max_entries=4, max_bytes=10_000)
+    cache.put("k", {"warnings": ["a"]})
+    first = cache.get("k")
+    first["warnings"].append("b")
+    assert cache.get("k") == {"warnings": ["a"]}
+    assert cache.get("missing") is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_eviction_by_entry_count():
+    cache = ResultCache(max_entries=2, max_bytes=10_000)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.put("c", 3)
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert cache.evictions == 1
+
+
+def test_eviction_by_byte_budget():
+    cache = ResultCache(max_entries=100, max_bytes=50)
+    cache.put("a", "x" * 20)
+    cache.put("b", "y" * 20)
+    cache.put("c", "z" * 20)
+    assert cache.bytes <= 50
+    assert "a" not in cache
+    cache.put("huge", "w" * 100)  # larger than the whole budget: skipped
+    assert "huge" not in cache and "c" in cache
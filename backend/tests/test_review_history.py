@@ -0,0 +1,134 @@
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.orm import Session
+
+from app.core import review_history
+from app.core.database import engine as app_engine
+from app.core.review_pipeline import build_review_record
+from app.core.review_writer import ReviewWriter
+from app.models.code_review import Base, CodeReview, ReviewRollup
+
+START = datetime(2024, 3, 1, 12, 0, 0)
+
+
+def _engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'reviews.db'}")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def _records(n, language="python"):
+    records = []
+    for i in range(n):
+        score = (i * 7) % 101
+        result = {"suggestions": [], "warnings": [], "optimizations": [], "bugs": [], "score": score,
+                  "remark": "Excellent" if score >= 90 else "Needs Work"}
+        record = build_review_record(f"x = {i}\n", language if i % 3 else "javascript", result)
+        record.created_at = START + timedelta(hours=i // 2)  # pairs share a timestamp: id breaks the tie
+        records.append(record)
+    return records
+
+
+def _write(engine, records):
+    writer = ReviewWriter(engine, batch_size=17, flush_ms=5)
+    writer.submit(records)
+    assert writer.flush(timeout=10)
+    writer.shutdown()
+
+
+def test_keyset_pages_cover_every_match_once_newest_first(tmp_path):
+    engine = _engine(tmp_path)
+    _write(engine, _records(60))
+
+    with Session(engine) as db:
+        seen, cursor = [], None
+        while True:
+            items, cursor = review_history.list_reviews(db, language="python", min_score=20, cursor=cursor, limit=7)
+            seen.extend(items)
+            if cursor is None:
+                break
+        expected = db.execute(
+            select(CodeReview.uid).where(CodeReview.language == "python", CodeReview.score >= 20)
+            .order_by(CodeReview.created_at.desc(), CodeReview.id.desc())
+        ).scalars().all()
+
+    assert [item["review_id"] for item in seen] == expected
+    assert all(item["score"] >= 20 and item["language"] == "python" for item in seen)
+
+
+def test_created_window_and_remark_filters(tmp_path):
+    engine = _engine(tmp_path)
+    records = _records(40)
+    _write(engine, records)
+
+    after, before = START + timedelta(hours=3), START + timedelta(hours=10)
+    with Session(engine) as db:
+        items, cursor = review_history.list_reviews(db, remark="Needs Work", created_after=after, created_before=before, limit=500)
+
+    expected = {r.uid for r in records if r.remark == "Needs Work" and after <= r.created_at < before}
+    assert cursor is None
+    assert {item["review_id"] for item in items} == expected
+
+
+def test_bad_cursor_is_rejected(tmp_path):
+    engine = _engine(tmp_path)
+    with Session(engine) as db:
+        try:
+            review_history.list_reviews(db, cursor="not-a-cursor")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError")
+
+
+def test_rollup_stats_match_a_full_scan_and_rebuild(tmp_path):
+    engine = _engine(tmp_path)
+    records = _records(90)
+    _write(engine, records)
+
+    scores = [r.score for r in records]
+    with Session(engine) as db:
+        stats = review_history.review_stats(db)
+        assert stats["total"] == len(records)
+        assert stats["average_score"] == round(sum(scores) / len(scores), 2)
+        buckets = Counter(review_history.score_bucket(s) for s in scores)
+        assert [b["reviews"] for b in stats["score_distribution"]] == [buckets[i] for i in range(10)]
+        js = [r.score for r in records if r.language == "javascript"]
+        assert {l["language"]: l["reviews"] for l in stats["languages"]} == {"javascript": len(js), "python": len(records) - len(js)}
+
+        # A database from before rollups existed is backfilled to the same numbers
+        with engine.begin() as conn:
+            conn.execute(delete(ReviewRollup))
+            assert review_history.backfill_rollups(conn)
+            assert not review_history.backfill_rollups(conn)
+        assert review_history.review_stats(db) == stats
+
+        one_day = review_history.review_stats(db, since=START.date(), until=START.date())
+        assert one_day["total"] == sum(1 for r in records if r.created_at.date() == START.date())
+
+
+def test_listing_and_stats_endpoints(client):
+    language = f"lang{uuid.uuid4().hex[:8]}"
+    records = _records(12, language=language)
+    for record in records:
+        record.language = language
+    _write(app_engine, records)
+
+    first = client.get("/api/v1/reviews", params={"language": language, "limit": 5})
+    assert first.status_code == 200
+    body = first.json()
+    assert len(body["items"]) == 5 and body["next_cursor"]
+    assert body["items"][0]["report_url"].endswith("/report.pdf")
+
+    rest = client.get("/api/v1/reviews", params={"language": language, "limit": 50, "cursor": body["next_cursor"]}).json()
+    assert rest["next_cursor"] is None
+    assert len(body["items"]) + len(rest["items"]) == 12
+
+    assert client.get("/api/v1/reviews", params={"cursor": "%%%"}).status_code == 400
+
+    stats = client.get("/api/v1/reviews/stats", params={"language": language}).json()
+    assert stats["total"] == 12
+    assert stats["languages"][0]["language"] == language
@@ -0,0 +1,92 @@
+import json
+from string import Formatter
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.core import message_catalog
+from app.core.findings import Finding, aggregate, render_result
+from app.core.result_cache import ResultCache
+from app.core.review_pipeline import analyze_review, build_review_record
+from app.core.review_storage import load_review, rule_counts
+from app.core.review_writer import ReviewWriter, find_review
+from app.models.code_review import Base, CodeBlob, CodeReview
+
+CODE = '''import os
+def f(x):
+    for i in range(10):
+        for j in range(10):
+            sum = x * 42
+            pass
+    return x
+    print(x)
+'''
+
+
+def _engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'reviews.db'}")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def _write(engine, records):
+    writer = ReviewWriter(engine, batch_size=50, flush_ms=5)
+    writer.submit(records)
+    assert writer.flush(timeout=10)
+    writer.shutdown()
+
+
+def test_findings_fold_by_rule_and_survive_the_json_cache():
+    findings = [Finding("bug.unused-pass", line=3), Finding("imports.unused", {"name": "os"}), Finding("bug.unused-pass", line=9)]
+    folded = aggregate(findings)
+    assert [(f.rule, f.count, f.line) for f in folded] == [("bug.unused-pass", 2, 3), ("imports.unused", 1, None)]
+    assert folded[0].render()["message"].endswith("(possible dead code). (×2)")
+
+    cache = ResultCache(max_entries=4, max_bytes=1 << 20)
+    cache.put("k", {"warnings": folded, "score": 1})
+    assert cache.get("k")["warnings"] == folded
+
+
+def test_every_catalog_rule_renders():
+    for rule_id, rule in message_catalog.CATALOG.items():
+        args = {name: f"<{name}>" for _, name, _, _ in Formatter().parse(rule.template) if name}
+        rendered = Finding(rule_id, args).render()
+        text = rendered["message"] if rule.kind == "bug" else rendered
+        assert "{" not in text and all(value in text for value in args.values())
+
+
+def test_review_reads_back_identically_and_code_is_stored_once(tmp_path):
+    engine = _engine(tmp_path)
+    result = analyze_review(CODE, "python")
+    assert result["bugs"] and result["warnings"] and result["optimizations"]
+    records = [build_review_record(CODE, "python", result) for _ in range(3)]
+    expected = {name: getattr(records[0], name) for name in ("code", "suggestions", "warnings", "optimizations", "bugs")}
+    _write(engine, records)
+
+    with Session(engine) as db:
+        assert db.execute(select(func.count()).select_from(CodeBlob)).scalar() == 1
+        stored = db.query(CodeReview).filter(CodeReview.uid == records[1].uid).one()
+        assert stored.code == "" and stored.warnings is None  # nothing inline any more
+        loaded = load_review(db, stored)
+        assert {name: getattr(loaded, name) for name in expected} == expected
+        assert json.loads(loaded.bugs) == render_result(result)["bugs"]
+
+        counts = rule_counts(db)
+        assert counts["perf.nested-loops"] == 3
+        assert counts["bug.shadowed-sum"] == 3
+        assert counts["imports.unused"] == 3
+
+
+def test_legacy_rows_with_inline_code_still_load(client):
+    from app.core.database import SessionLocal, engine
+
+    with engine.begin() as conn:
+        conn.execute(CodeReview.__table__.insert(), [{
+            "uid": "legacy0000000000000000000000000a", "code": "x = 1\n", "language": "python",
+            "suggestions": "", "warnings": "⚠️ old warning", "optimizations": "", "bugs": "[]",
+            "score": 95, "remark": "Excellent",
+        }])
+    with SessionLocal() as db:
+        review = find_review(db, "legacy0000000000000000000000000a")
+    assert review.code == "x = 1\n" and review.warnings == "⚠️ old warning"
+    assert client.get("/api/v1/reviews/legacy0000000000000000000000000a/report.pdf").status_code == 200
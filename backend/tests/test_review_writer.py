@@ -0,0 +1,112 @@
+import time
+import uuid
+
+from sqlalchemy import create_engine, func, select, text
+
+from app.core.findings import Finding
+from app.core.review_pipeline import build_review_record
+from app.core import review_writer
+from app.core.review_writer import ReviewWriter
+from app.models.code_review import Base, CodeReview
+
+RESULT = {"suggestions": [], "warnings": [Finding("imports.unused", {"name": "w"})], "optimizations": [], "bugs": [],
+          "score": 90, "remark": "Excellent"}
+
+
+def _engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'reviews.db'}")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def _records(n):
+    return [build_review_record(f"x = {uuid.uuid4().hex!r}\n", "python", RESULT) for _ in range(n)]
+
+
+def _count(engine):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(CodeReview)).scalar()
+
+
+def test_rows_wait_in_the_queue_until_flushed(tmp_path):
+    engine = _engine(tmp_path)
+    writer = ReviewWriter(engine, batch_size=100, flush_ms=60_000)
+    records = _records(3)
+    writer.submit(records)
+
+    assert _count(engine) == 0
+    pending = writer.pending(records[1].uid)
+    assert pending.code == records[1].code and pending.warnings == "⚠️ Unused import detected: w (low impact)"
+
+    assert writer.flush(timeout=10)
+    assert _count(engine) == 3
+    assert writer.pending(records[1].uid) is None
+    writer.shutdown()
+
+
+def test_full_batch_is_written_without_waiting_for_the_timer(tmp_path):
+    engine = _engine(tmp_path)
+    writer = ReviewWriter(engine, batch_size=4, flush_ms=60_000)
+    writer.submit(_records(4))
+    deadline = time.monotonic() + 10
+    while _count(engine) < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _count(engine) == 4
+    writer.shutdown()
+
+
+def test_shutdown_drains_and_later_rows_write_through(tmp_path):
+    engine = _engine(tmp_path)
+    writer = ReviewWriter(engine, batch_size=1000, flush_ms=60_000)
+    writer.submit(_records(250))
+    writer.shutdown()
+    assert _count(engine) == 250
+
+    writer.submit(_records(1))
+    assert _count(engine) == 251
+
+
+def test_failed_batches_stay_queued_and_are_retried(tmp_path, monkeypatch):
+    engine = _engine(tmp_path)
+    real_write_reviews = review_writer.write_reviews
+    outage = {"left": 5}  # more failed attempts than one _write() makes
+
+    def flaky(conn, rows):
+        if outage["left"]:
+            outage["left"] -= 1
+            raise RuntimeError("database is locked")
+        real_write_reviews(conn, rows)
+
+    monkeypatch.setattr(review_writer, "write_reviews", flaky)
+    monkeypatch.setattr(review_writer.time, "sleep", lambda seconds: None)
+    writer = ReviewWriter(engine, batch_size=100, flush_ms=0)
+    records = _records(2)
+    writer.submit(records)
+
+    assert not writer.flush(timeout=0.3)  # first pass failed: still queued, still readable
+    assert writer.pending(records[0].uid) is not None and _count(engine) == 0
+    assert writer.flush(timeout=10)
+    assert _count(engine) == 2 and writer.pending(records[0].uid) is None
+    writer.shutdown()
+
+
+def test_app_database_runs_in_wal_mode():
+    from app.core.database import engine
+
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+
+
+def test_review_is_readable_before_it_is_written(client, monkeypatch):
+    from app.core.review_writer import review_writer
+
+    monkeypatch.setattr(review_writer, "flush_ms", 60_000)
+    response = client.post("/api/v1/review", json={"language": "python", "code": "queued = 1\n"})
+    uid = response.json()["report_url"].split("/")[-2]
+    assert review_writer.pending(uid) is not None
+    assert client.get(f"/api/v1/reviews/{uid}/report.pdf").status_code == 200
+
+    assert review_writer.flush(timeout=10)
+    assert review_writer.pending(uid) is None
+    assert client.get(f"/api/v1/reviews/{uid}/report.pdf").status_code == 200
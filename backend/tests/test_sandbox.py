@@ -0,0 +1,151 @@
+import ast
+import json
+
+import pytest
+
+from app.core import config
+from app.core.sandbox import fit_growth, plan, profile_code
+
+CODE = (
+    "import socket\n"
+    "print('module-level noise')\n"
+    "\n"
+    "def pairs(items: list):\n"
+    "    return [a for a in items for b in items if a == b]\n"
+    "\n"
+    "def call_home(n):\n"
+    "    socket.socket().connect(('127.0.0.1', 80))\n"
+    "\n"
+    "def scribble(text):\n"
+    "    open('out.txt', 'w').write(text)\n"
+    "\n"
+    "def hog(n):\n"
+    "    return bytearray(10 ** 10)\n"
+    "\n"
+    "def spin(n):\n"
+    "    while True:\n"
+    "        pass\n"
+    "\n"
+    "def configure(config):\n"
+    "    return config\n"
+)
+
+
+@pytest.fixture
+def fast_sandbox(monkeypatch):
+    monkeypatch.setattr(config, "SANDBOX_ENABLED", 1)
+    monkeypatch.setattr(config, "SANDBOX_FUNCTION_BUDGET_MS", 300)
+    monkeypatch.setattr(config, "SANDBOX_MAX_N", 4096)
+
+
+def test_plan_picks_functions_with_scalable_arguments():
+    tree = ast.parse(
+        "def a(words, n, limit=3): pass\n"
+        "def b(xs: list[str], table: dict, *, key=None): pass\n"
+        "def c(config): pass\n"
+        "def d(): pass\n"
+        "async def e(items): pass\n"
+        "def f(items, *, key): pass\n"
+    )
+    run, skipped = plan(tree)
+    assert [(fn["name"], fn["params"]) for fn in run] == [("a", ["list[str]", "int"]), ("b", ["list[str]", "dict"])]
+    assert [(fn["name"], fn["reason"]) for fn in skipped] == [
+        ("c", "can't tell what to pass for 'config' (annotate it, e.g. list[int])"),
+        ("d", "takes no input whose size could be scaled"),
+        ("e", "async functions aren't profiled"),
+        ("f", "needs keyword argument 'key'"),
+    ]
+
+
+def test_growth_curve_fit():
+    sizes = [2 ** k for k in range(4, 14)]
+    overhead = 2e-7  # per-call cost that dominates the small sizes
+    assert fit_growth([(n, overhead + 1e-8 * n) for n in sizes]) == "O(n)"
+    assert fit_growth([(n, overhead + 1e-9 * n * n) for n in sizes]) == "O(n²)"
+    assert fit_growth([(n, overhead + 1e-12 * n ** 3) for n in sizes]) == "O(n³)"
+    assert fit_growth([(n, 1e-8 * n * (n.bit_length() - 1)) for n in sizes]) == "O(n log n)"
+    assert fit_growth([(n, overhead * (1 + 0.05 * (k % 2))) for k, n in enumerate(sizes)]) == "O(1)"
+    assert fit_growth([(n, 1e-7 * 1.6 ** n) for n in (4, 8, 16)]) == "O(2ⁿ)"
+    assert fit_growth([(4, 1e-6), (8, 2e-6)]) is None  # too few sizes
+
+
+def test_functions_run_sandboxed_and_timed(fast_sandbox):
+    report = profile_code(CODE)
+    assert report["error"] is None
+    functions = {fn["name"]: fn for fn in report["functions"]}
+    assert list(functions) == ["pairs", "call_home", "scribble", "hog", "spin", "configure"]
+
+    pairs = functions["pairs"]
+    assert pairs["status"] == "measured" and pairs["estimated"] == "O(n²)"
+    assert pairs["growth"] is not None and pairs["exponent"] > 1.5
+    assert [p["n"] for p in pairs["points"]][:3] == [4, 8, 16]
+    assert all(p["seconds"] > 0 and p["peak_bytes"] > 0 for p in pairs["points"])
+
+    # No network, no file writes, bounded memory and time
+    assert functions["call_home"]["reason"] == "PermissionError"
+    assert functions["scribble"]["reason"] == "PermissionError"
+    assert functions["hog"]["reason"].startswith("MemoryError")
+    assert functions["spin"]["status"] == "timeout"
+    assert functions["configure"]["status"] == "skipped"
+
+
+def test_nothing_of_the_server_gets_out(fast_sandbox):
+    report = profile_code(
+        "import os\n"
+        "\n"
+        "def environ(n):\n"
+        "    raise Exception(open('/proc/%d/environ' % os.getppid()).read())\n"
+        "\n"
+        "def listing(n):\n"
+        "    raise Exception(os.listdir('/proc/%d/cwd' % os.getppid()))\n"
+        "\n"
+        "def chatty(n):\n"
+        "    raise KeyError('anything the submission wants to say')\n"
+        "\n"
+        "class Custom(ValueError):\n"
+        "    pass\n"
+        "\n"
+        "def custom(n):\n"
+        "    raise type('secret-in-a-name', (Custom,), {})()\n"
+        "\n"
+        "def forged(n):\n"
+        "    os.write(1, b'@@sandbox@@ {\"error\": \"forged\"}\\n')\n"
+        "\n"
+        "def who(n):\n"
+        "    assert os.geteuid() != 0 and os.getgroups() == []\n"
+        "    import heapq  # the standard library still imports\n"
+    )
+    functions = {fn["name"]: fn for fn in report["functions"]}
+    assert [functions[name]["reason"] for name in ("environ", "listing", "chatty", "custom")] == [
+        "PermissionError", "PermissionError", "KeyError", "ValueError",
+    ]
+    assert functions["forged"]["status"] == "measured"
+    assert report["error"] == "the sandbox sent an unexpected error"
+    assert functions["who"]["status"] == "measured"
+
+
+def test_module_level_failures_are_reported(fast_sandbox, monkeypatch):
+    report = profile_code("while True:\n    pass\n\ndef f(n):\n    return n\n")
+    assert report["error"] == "module-level code ran out of time"
+    assert report["functions"][0]["status"] == "not run"
+
+    monkeypatch.setattr(config, "SANDBOX_ENABLED", 0)
+    assert profile_code("def f(n):\n    return n\n")["error"] == "Profiling is disabled on this server."
+
+
+def test_profile_review_type(client, fast_sandbox):
+    code = "def total(nums):\n    out = 0\n    for x in nums:\n        out += x\n    return out\n"
+    basic = client.post("/api/v1/review", json={"code": code}).json()
+    assert basic["profile"] is None
+
+    profiled = client.post("/api/v1/review", json={"code": code, "review_type": "profile"}).json()
+    assert profiled["score"] == basic["score"]  # measurements are hints, not deductions
+    [fn] = profiled["profile"]["functions"]
+    assert (fn["name"], fn["status"], fn["params"], fn["estimated"]) == ("total", "measured", ["list"], "O(n)")
+    assert any(o.startswith("⏱️ Measured 'total': grows like") for o in profiled["optimizations"])
+
+    # Not cached yet, so streamed stage by stage
+    response = client.post("/api/v1/review/stream", json={"code": code + "\n# v2\n", "review_type": "profile"})
+    events = [json.loads(line) for line in response.text.splitlines() if line]
+    assert "profile" in [event.get("stage") for event in events]
+    assert events[-1]["profile"]["functions"][0]["name"] == "total"
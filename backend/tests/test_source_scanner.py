@@ -0,0 +1,58 @@
+import time
+
+from app.core.findings import Finding, render_all
+from app.core.review_engine import analyze_python_code
+from app.utils.source_scanner import scan_source
+
+CODE = (
+    "import os\n"
+    "import json as js\n"
+    "from typing import Dict, List\n"
+    "\n"
+    "class Store:\n"
+    "    def get(self, key):\n"
+    "        return os.path.join(key)\n"
+    "\n"
+    "    def put(self, key) -> Dict[str, int]:\n"
+    '        """Documented."""\n'
+    '        return f"{js.dumps(key)}"\n'
+    "\n"
+    "def Build(a,\n"
+    "          b='# not a comment'):\n"
+    "    text = '''\n"
+    "  import fake\n"
+    "   Odd = 1\n"
+    "'''\n"
+    "    return text\n"
+)
+
+
+def test_docstrings_are_checked_for_methods_too():
+    docstrings = scan_source(CODE)["docstrings"]
+    assert render_all(docstrings) == [
+        "✅ Add a docstring to function: `def get(self, key):` (low impact)",
+        "✅ Add a docstring to function: `def Build(a, b='# not a comment'):` (low impact)",
+    ]
+
+
+def test_strings_and_comments_are_not_code():
+    scan = scan_source(CODE)
+    assert scan["suggestions"] == []  # '#' inside a string is not a comment
+    assert scan["naming"] == [Finding("style.snake-case", {"name": "Build"})]  # 'Odd' is inside a string
+    # hanging indent (line 14) and string contents (lines 16-17) are not indentation
+    assert scan["warnings"] == []
+    assert [imp for imp, _ in scan["imports"]] == ["os", "json as js", "typing.Dict", "typing.List"]
+
+
+def test_unused_imports_use_real_name_usage():
+    _, warnings, _ = analyze_python_code(CODE)
+    # os is used via os.path, js inside an f-string, Dict in an annotation
+    assert render_all(warnings) == ["⚠️ Unused import detected: typing.List (low impact)"]
+
+
+def test_scan_is_linear_on_long_tokens():
+    # A single huge literal used to make the naming regex quadratic
+    blob = "data = '" + "A" * 400_000 + "'\nY" + "B" * 400_000 + "\n"
+    started = time.perf_counter()
+    scan_source(blob)
+    assert time.perf_counter() - started < 2
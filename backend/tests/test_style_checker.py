@@ -35,7 +35,17 @@ def test_long_lines_and_tabs():
 def test_style_cache():
     code = "def cached_func():\n    return 42\n"
     style_cache.clear()  # Clear cache before test
+    hits = style_cache.hits
     first = check_code_style(code, "python")
-    assert code in style_cache
+    assert len(style_cache) == 1
     second = check_code_style(code, "python")
     assert first == second  # Cached result matches
+    assert style_cache.hits == hits + 1
+
+def test_style_cache_is_language_aware():
+    code = "def loadRows():\n    return 1\n"
+    style_cache.clear()
+    python_result = check_code_style(code, "python")
+    js_result = check_code_style(code, "javascript")
+    assert python_result != js_result
+    assert len(style_cache) == 2
@@ -0,0 +1,130 @@
+import json
+
+from app.core import config
+from app.core.findings import render_all
+from app.core.symbol_index import SymbolIndex, module_names
+from app.utils.gpt_logic_checker import detect_logic_flaws
+
+PROJECT = {
+    "src/shop/__init__.py": "from .prices import total\n",
+    "src/shop/prices.py": (
+        "def total(items, tax=0.2, *, currency):\n"
+        "    return sum(items) * (1 + tax)\n"
+        "\n"
+        "def fail(reason):\n"
+        "    raise ValueError(reason)\n"
+        "\n"
+        "class Cart:\n"
+        "    def __init__(self, owner):\n"
+        "        self.owner = owner\n"
+        "\n"
+        "    @staticmethod\n"
+        "    def empty(owner):\n"
+        "        return Cart(owner)\n"
+    ),
+    "app/checkout.py": (
+        "import shop\n"
+        "from shop.prices import Cart, fail\n"
+        "\n"
+        "def run(items):\n"
+        "    shop.total(items, currency='EUR')\n"
+        "    shop.total(items, 0.1, 2, currency='EUR')\n"
+        "    Cart.empty('me', 'you')\n"
+        "    Cart(owner='me')\n"
+        "    fail('no stock')\n"
+        "    return None\n"
+    ),
+}
+
+
+def _messages(index):
+    return {path: render_all(findings) for path, findings in index.check().items()}
+
+
+def test_single_file_calls_respect_defaults_keywords_and_methods():
+    code = (
+        "def f(a, b=1, *args, key=None):\n"
+        "    pass\n"
+        "class A:\n"
+        "    def __init__(self, x):\n"
+        "        pass\n"
+        "    def m(self, y):\n"
+        "        self.m()\n"
+        "        A.m(self, 1)\n"
+        "f(1)\n"
+        "f(1, 2, 3, 4, key=5)\n"
+        "f(b=2)\n"
+        "f(1, colour=2)\n"
+        "A(1)\n"
+        "A()\n"
+    )
+    assert detect_logic_flaws(code) == [
+        "🤖 Logic flaw: function 'A.m' called with 0 args (expected 1).",
+        "🤖 Logic flaw: call to 'f' is missing argument 'a'.",
+        "🤖 Logic flaw: function 'f' has no parameter 'colour'.",
+        "🤖 Logic flaw: function 'A' called with 0 args (expected 1).",
+    ]
+
+
+def test_module_names_cover_every_import_root():
+    assert module_names("src/shop/prices.py") == ["src.shop.prices", "shop.prices", "prices"]
+    assert module_names("src/shop/__init__.py") == ["src.shop", "shop"]
+
+
+def test_calls_are_checked_against_other_files():
+    index = SymbolIndex()
+    for path, code in PROJECT.items():
+        index.update(path, code)
+    assert _messages(index) == {
+        "app/checkout.py": [
+            "🤖 Logic flaw: function 'shop.total' called with 3 args (expected 1-2).",
+            "🤖 Logic flaw: function 'Cart.empty' called with 2 args (expected 1).",
+            "🤖 Unreachable code detected after calling 'fail', which never returns.",
+        ],
+    }
+    assert [f.line for f in index.check()["app/checkout.py"]] == [6, 7, 10]
+
+
+def test_index_is_persisted_and_only_changed_files_are_reindexed(tmp_path):
+    store = str(tmp_path / "index.db")
+    first = SymbolIndex("demo", path=store)
+    for path, code in PROJECT.items():
+        first.update(path, code)
+    first.save()
+
+    # Next review: total() grew a parameter
+    second = SymbolIndex("demo", path=store)
+    changed = PROJECT["src/shop/prices.py"].replace("tax=0.2,", "tax=0.2, rounding=2,")
+    for path, code in {**PROJECT, "src/shop/prices.py": changed}.items():
+        second.update(path, code)
+    second.save()
+    assert (second.indexed, second.reused) == (1, 2)
+    # ...and the unchanged caller is re-checked against the new signature
+    assert not any("shop.total" in m for m in _messages(second)["app/checkout.py"])
+
+    # A file missing from a complete review was deleted
+    third = SymbolIndex("demo", path=store)
+    third.update("app/checkout.py", PROJECT["app/checkout.py"])
+    third.save()
+    assert set(SymbolIndex("demo", path=store).files) == {"app/checkout.py"}
+    assert SymbolIndex("other", path=store).files == {}
+
+
+def test_directory_reviews_reuse_the_index(client, tmp_path, monkeypatch):
+    for name, code in PROJECT.items():
+        path = tmp_path / "proj" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(code)
+    monkeypatch.setattr(config, "PROJECT_ROOT", str(tmp_path))
+
+    def review():
+        response = client.post("/api/v1/review/project/directory", json={"path": "proj"})
+        return [json.loads(line) for line in response.text.splitlines() if line]
+
+    events = review()
+    cross_file = [e for e in events if e["type"] == "cross-file"]
+    assert [e["path"] for e in cross_file] == ["app/checkout.py"]
+    assert len(cross_file[0]["warnings"]) == 3
+    assert events[-1]["symbols"] == {"files": 3, "indexed": 3, "reused": 0, "cross_file_issues": 3}
+
+    assert review()[-1]["symbols"] == {"files": 3, "indexed": 0, "reused": 3, "cross_file_issues": 3}
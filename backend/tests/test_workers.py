@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+from app.core import config, workers
+from app.core.review_pipeline import run_review
+
+
+def test_process_pool_runs_reviews_in_other_processes(monkeypatch):
+    monkeypatch.setattr(config, "ANALYSIS_WORKERS", 2)
+    try:
+        pids = {workers.submit(os.getpid).result(timeout=60) for _ in range(4)}
+        assert os.getpid() not in pids
+
+        result = workers.submit(run_review, "def f():\n    return 1\n", "python").result(timeout=60)
+        assert result == run_review("def f():\n    return 1\n", "python")
+    finally:
+        workers.shutdown()
+
+
+def test_inline_when_pool_disabled(monkeypatch):
+    monkeypatch.setattr(config, "ANALYSIS_WORKERS", 0)
+    assert workers.get_pool() is None
+    assert workers.submit(os.getpid).result() == os.getpid()
+
+
+def _spin(seconds):
+    import time
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+    return "finished"
+
+
+def _allocate(megabytes):
+    return len(bytearray(megabytes * 1024 * 1024))
+
+
+def test_time_limit_aborts_pooled_job(monkeypatch):
+    monkeypatch.setattr(config, "ANALYSIS_WORKERS", 1)
+    monkeypatch.setattr(config, "ANALYSIS_TIMEOUT_SECONDS", 1)
+    try:
+        with pytest.raises(workers.AnalysisAborted, match="time limit"):
+            workers.run(_spin, 30)
+        # The worker survives and keeps serving
+        assert workers.run(_spin, 0) == "finished"
+    finally:
+        workers.shutdown()
+
+
+def test_memory_limit_aborts_pooled_job(monkeypatch):
+    monkeypatch.setattr(config, "ANALYSIS_WORKERS", 1)
+    monkeypatch.setattr(config, "ANALYSIS_MEMORY_LIMIT_MB", 512)
+    try:
+        with pytest.raises(workers.AnalysisAborted, match="memory limit of 512 MB"):
+            workers.run(_allocate, 2048)
+        assert workers.run(_allocate, 1) == 1024 * 1024
+    finally:
+        workers.shutdown()
+
+
+def test_aborted_review_is_reported_not_cached(monkeypatch):
+    from app.core import review_pipeline
+
+    def boom(*args):
+        raise workers.AnalysisAborted("time limit of 1s exceeded")
+
+    monkeypatch.setattr(review_pipeline, "analyze_review", boom)
+    code = "def slow():\n    return 3\n"
+    result = review_pipeline.run_review(code, "python")
+    assert result["remark"] == "Analysis aborted"
+    assert "time limit" in result["warnings"][0].render()
+    monkeypatch.undo()
+    assert review_pipeline.run_review(code, "python")["remark"] != "Analysis aborted"
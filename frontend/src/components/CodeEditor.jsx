@@ -1,4 +1,4 @@
-import { useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import Editor from "@monaco-editor/react";
 import ResultView from "./ResultView"; // ✅ Import ResultView
 
@@ -7,6 +7,48 @@ export default function CodeEditor() {
   const [reviewType, setReviewType] = useState("basic");
   const [code, setCode] = useState("");
   const [reviewResult, setReviewResult] = useState(null); // ✅ Store review result
+  const [live, setLive] = useState(false); // ⌨️ Review as you type
+  const [liveResult, setLiveResult] = useState(null);
+  const socket = useRef(null);
+  const latest = useRef({ code, language, version: 0 });
+  latest.current = { ...latest.current, code, language };
+
+  // ⌨️ Live mode: one WebSocket; edits go out as they happen, the server
+  // debounces them and answers with quick checks, then the full review
+  useEffect(() => {
+    if (!live) return;
+    const ws = new WebSocket("ws://127.0.0.1:8000/api/v1/review/live");
+    const sendDocument = () => {
+      const { code, language, version } = latest.current;
+      ws.send(JSON.stringify({ version, language, code }));
+    };
+    ws.onopen = sendDocument;
+    ws.onmessage = (event) => {
+      const message = JSON.parse(event.data);
+      if (message.type === "error") {
+        sendDocument(); // out of sync: resend the whole document
+        return;
+      }
+      if (message.version !== latest.current.version) return; // stale
+      setLiveResult((previous) =>
+        message.type === "quick" ? { ...previous, ...message } : message
+      );
+    };
+    socket.current = ws;
+    return () => {
+      socket.current = null;
+      ws.close();
+    };
+  }, [live, language]);
+
+  const handleChange = (value, event) => {
+    setCode(value);
+    const ws = socket.current;
+    latest.current = { code: value, language, version: event?.versionId ?? latest.current.version + 1 };
+    if (!ws || ws.readyState !== WebSocket.OPEN) return;
+    const changes = event?.changes?.map((c) => ({ offset: c.rangeOffset, length: c.rangeLength, text: c.text }));
+    ws.send(JSON.stringify(changes ? { version: latest.current.version, changes } : { ...latest.current }));
+  };
 
   const handleSubmit = async () => {
     try {
@@ -51,14 +93,20 @@ export default function CodeEditor() {
         >
           <option value="basic">Basic</option>
           <option value="advanced">Advanced</option>
+          <option value="profile">Profile (runs the code)</option>
         </select>
+
+        <label className="flex items-center gap-2">
+          <input type="checkbox" checked={live} onChange={(e) => setLive(e.target.checked)} />
+          ⌨️ Live review
+        </label>
       </div>
 
       <Editor
         height="400px"
         language={language}
         value={code}
-        onChange={(value) => setCode(value)}
+        onChange={handleChange}
         theme="vs-dark"
       />
 
@@ -70,7 +118,8 @@ export default function CodeEditor() {
       </button>
 
       {/* ✅ UI for Review Output */}
-      {reviewResult && <ResultView reviewResult={reviewResult} />} {/* Pass reviewResult to ResultView */}
+      {live && liveResult && <ResultView reviewResult={liveResult} />}
+      {!live && reviewResult && <ResultView reviewResult={reviewResult} />} {/* Pass reviewResult to ResultView */}
     </div>
   );
 }
@@ -6,7 +6,8 @@ export default function ResultView({ reviewResult }) {
     bugs,
     score,
     remark,
-    report_url
+    report_url,
+    profile
   } = reviewResult;
 
   const renderSeverityIcon = (severity) => {
@@ -93,6 +94,41 @@ export default function ResultView({ reviewResult }) {
         </div>
       )}
 
+      {profile && (
+        <div>
+          <hr className="my-2" />
+          <strong>⏱️ Measured:</strong>
+          {profile.error && <p className="text-sm text-gray-600">{profile.error}</p>}
+          <table className="text-sm mt-1">
+            <thead>
+              <tr className="text-left text-gray-600">
+                <th className="pr-4">Function</th>
+                <th className="pr-4">Estimated</th>
+                <th className="pr-4">Measured</th>
+                <th className="pr-4">Largest n</th>
+                <th>Status</th>
+              </tr>
+            </thead>
+            <tbody>
+              {profile.functions.map((fn) => {
+                const last = fn.points[fn.points.length - 1];
+                return (
+                  <tr key={`profile-${fn.name}-${fn.line}`}>
+                    <td className="pr-4 font-mono">{fn.name}</td>
+                    <td className="pr-4">{fn.estimated ?? "–"}</td>
+                    <td className="pr-4">{fn.growth ?? "–"}</td>
+                    <td className="pr-4">
+                      {last ? `${last.n} (${(last.seconds * 1000).toPrecision(3)} ms)` : "–"}
+                    </td>
+                    <td>{fn.reason ? `${fn.status}: ${fn.reason}` : fn.status}</td>
+                  </tr>
+                );
+              })}
+            </tbody>
+          </table>
+        </div>
+      )}
+
       {suggestions?.length === 0 &&
         warnings?.length === 0 &&
         optimizations?.length === 0 &&